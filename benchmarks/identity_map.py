@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Обход ленты с повторяющимися авторами: время разбора и память с `IdentityMap` и без
+
+    python benchmarks/identity_map.py --pages 50 --authors 20 200
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from payloads import posts_page  # noqa: E402
+from itd.identity import IdentityMap  # noqa: E402
+from itd.models.envelope import POSTS  # noqa: E402
+
+
+def crawl(bodies: list[bytes], identity: IdentityMap | None) -> list:
+    if identity is None:
+        return [POSTS.adapter.validate_json(body) for body in bodies]
+    return [POSTS.interning.validate_json(body, context={'identity': identity}) for body in bodies]
+
+
+def measure(bodies: list[bytes], identity: IdentityMap | None) -> tuple[float, int]:
+    """Время разбора в секундах и память, которую держат разобранные страницы"""
+    started = time.perf_counter()
+    crawl(bodies, identity)
+    elapsed = time.perf_counter() - started
+    if identity is not None:
+        identity.clear()
+    tracemalloc.start()
+    pages = crawl(bodies, identity)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del pages
+    return elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare feed parsing with and without an identity map')
+    parser.add_argument('--pages', type=int, default=50, help='Pages of 20 posts (default: 50)')
+    parser.add_argument('--authors', type=int, nargs='+', default=[20, 200], help='Distinct authors in the feed (default: 20 200)')
+    args = parser.parse_args()
+
+    POSTS.interning  # собрать схемы заранее (defer_build)
+    for authors in args.authors:
+        bodies = [posts_page(20, seed, authors) for seed in range(args.pages)]
+        plain_time, plain_memory = measure(bodies, None)
+        identity = IdentityMap()
+        shared_time, shared_memory = measure(bodies, identity)
+        print(
+            f'{authors:>4} authors  plain {plain_time * 1000:7.1f} ms {plain_memory / 2**20:6.1f} MiB  '
+            f'identity map {shared_time * 1000:7.1f} ms {shared_memory / 2**20:6.1f} MiB  hits {identity.hits} misses {identity.misses}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Время холодного `import itd` и создания первого `ITDClient(token=...)`
+
+Каждый замер - отдельный процесс python, выводится медиана. С `--check` скрипт
+завершается с кодом 1, если медиана вышла за бюджет.
+
+    python benchmarks/import_time.py --runs 20 --check
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = f'''
+import sys, time
+sys.path.insert(0, {str(ROOT)!r})
+start = time.perf_counter()
+import itd
+imported = time.perf_counter()
+itd.ITDClient(token='x')
+created = time.perf_counter()
+print(imported - start, created - imported)
+'''
+
+
+def measure(runs: int) -> tuple[list[float], list[float]]:
+    imports, clients = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', CHILD], capture_output=True, text=True, check=True).stdout
+        import_time, client_time = map(float, out.split())
+        imports.append(import_time * 1000)
+        clients.append(client_time * 1000)
+    return imports, clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold import time of itd')
+    parser.add_argument('--runs', type=int, default=10, help='Number of fresh interpreters (default: 10)')
+    parser.add_argument('--import-budget', type=float, default=20, help='Budget for `import itd`, ms (default: 20)')
+    parser.add_argument('--client-budget', type=float, default=400, help='Budget for the first ITDClient(token=...), ms (default: 400)')
+    parser.add_argument('--check', action='store_true', help='Exit with code 1 if a budget is exceeded')
+    args = parser.parse_args()
+
+    imports, clients = measure(args.runs)
+    ok = True
+    for name, values, budget in (('import itd', imports, args.import_budget), ('ITDClient(token=...)', clients, args.client_budget)):
+        median = statistics.median(values)
+        ok &= median <= budget
+        print(f'{name:<22} median {median:7.1f} ms  min {min(values):7.1f} ms  max {max(values):7.1f} ms  budget {budget:g} ms  {"ok" if median <= budget else "OVER"}')
+
+    if args.check and not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
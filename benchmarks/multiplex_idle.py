@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Стоимость простаивающих SSE соединений в `NotificationMultiplexer`: память и CPU на аккаунт
+
+Локальный сервер держит поток каждого аккаунта открытым и раз в `--heartbeat` секунд шлёт комментарий,
+изредка - уведомление. Сравниваются клиенты с общим пулом соединений и каждый со своим `httpx.AsyncClient`.
+
+    python benchmarks/multiplex_idle.py --accounts 300 --seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from payloads import stream_notification  # noqa: E402
+import itd.async_request  # noqa: E402
+from itd.async_client import AsyncClient  # noqa: E402
+from itd.async_request import AsyncTransport  # noqa: E402
+from itd.multiplex import NotificationMultiplexer  # noqa: E402
+
+
+def serve(heartbeat: float, ports: multiprocessing.Queue) -> None:
+    """Сервер в отдельном процессе, чтобы его потоки не попадали в замеры памяти и CPU"""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            rnd = random.Random()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            connect = {'userId': '9096a85b-c319-483e-8940-6921be427ad0', 'timestamp': int(time.time() * 1000)}
+            try:
+                self.wfile.write(b'data: ' + json.dumps(connect).encode() + b'\n\n')
+                while True:
+                    time.sleep(heartbeat)
+                    if rnd.random() < 0.1:
+                        self.wfile.write(b'data: ' + json.dumps(stream_notification(rnd)).encode() + b'\n\n')
+                    else:
+                        self.wfile.write(b': heartbeat\n\n')
+                    self.wfile.flush()
+            except OSError:
+                pass
+
+    ThreadingHTTPServer.request_queue_size = 1024
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+async def measure(accounts: int, seconds: float, shared: bool) -> tuple[int, float, int]:
+    """Память на аккаунт (байты), CPU на аккаунт в секунду простоя (мс) и число уведомлений"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    http = httpx.AsyncClient(limits=httpx.Limits(max_connections=accounts + 20)) if shared else None
+    clients = {
+        account: AsyncClient(token='t', transport=AsyncTransport(http=http) if shared else None)
+        for account in range(accounts)
+    }
+    mux = NotificationMultiplexer(clients)
+    received = 0
+
+    async def consume():
+        nonlocal received
+        async for _ in mux:
+            received += 1
+
+    consumer = asyncio.create_task(consume())
+    while sum(1 for client in clients.values() if client._stream_active) < accounts:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(1)  # все потоки открыты
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    cpu = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu = time.process_time() - cpu
+
+    await mux.aclose()
+    await consumer
+    await asyncio.gather(*(client.aclose() for client in clients.values()))
+    if http is not None:
+        await http.aclose()
+    return memory // accounts, cpu / seconds / accounts * 1000, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-account cost of idle SSE streams in NotificationMultiplexer')
+    parser.add_argument('--accounts', type=int, default=300, help='Accounts (default: 300)')
+    parser.add_argument('--seconds', type=float, default=5, help='Idle period to sample CPU (default: 5)')
+    parser.add_argument('--heartbeat', type=float, default=1, help='Heartbeat interval in seconds (default: 1)')
+    args = parser.parse_args()
+
+    ports: multiprocessing.Queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.heartbeat, ports), daemon=True)
+    server.start()
+    itd.async_request.BASE_URL = f'http://127.0.0.1:{ports.get()}/api/'
+
+    print(f'{args.accounts} accounts, heartbeat every {args.heartbeat}s')
+    for shared in (False, True):
+        memory, cpu, received = asyncio.run(measure(args.accounts, args.seconds, shared))
+        name = 'shared pool' if shared else 'own pools'
+        print(f'{name:>12}  {memory / 1024:7.1f} KiB/account  {cpu:6.3f} ms CPU/account/s  {received} notifications')
+    server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Разбор страниц постов: `json.loads` + `model_validate` по одному посту против `TypeAdapter.validate_json`
+
+    python benchmarks/parse_pages.py --sizes 20 100 500
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from payloads import posts_page  # noqa: E402
+from itd.models.envelope import POSTS  # noqa: E402
+from itd.models.pagination import PostsPagintaion  # noqa: E402
+from itd.models.post import Post  # noqa: E402
+
+
+def per_item(body: bytes) -> tuple:
+    data = json.loads(body)['data']
+    return [Post.model_validate(post) for post in data['posts']], PostsPagintaion.model_validate(data['pagination'])
+
+
+def envelope(body: bytes) -> tuple:
+    data = POSTS.adapter.validate_json(body)['data']
+    return data['posts'], data['pagination']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-item validation with envelope TypeAdapters')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 500], help='Posts per page (default: 20 100 500)')
+    parser.add_argument('--repeat', type=int, default=5, help='Best of N (default: 5)')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        body = posts_page(size)
+        assert per_item(body) == envelope(body)
+        number = max(1, 2000 // size)
+        old, new = (min(timeit.repeat(lambda: parse(body), number=number, repeat=args.repeat)) / number for parse in (per_item, envelope))
+        print(f'{size:>4} posts ({len(body) / 1024:7.1f} KiB)  per-item {old * 1000:8.2f} ms  envelope {new * 1000:8.2f} ms  x{old / new:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Разбор времени в ответах API: прежний strptime с запасным форматом против `parse_datetime`
+
+Сначала сравниваются сами парсеры на всех временных метках страницы ленты, затем -
+разбор страниц постов и уведомлений целиком.
+
+    python benchmarks/parse_timestamps.py --size 100
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from payloads import notifications_page, posts_page  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from itd.models._datetime import Timestamp  # noqa: E402
+from itd.models.envelope import NOTIFICATIONS, POSTS  # noqa: E402
+
+
+def strptime(value: str) -> datetime:
+    """Прежний валидатор TextObject.created_at"""
+    try:
+        return datetime.strptime(value + '00', '%Y-%m-%d %H:%M:%S.%f%z')
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def timestamps(node, found: list[str]) -> list[str]:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == 'createdAt' and isinstance(value, str):
+                found.append(value)
+            else:
+                timestamps(value, found)
+    elif isinstance(node, list):
+        for item in node:
+            timestamps(item, found)
+    return found
+
+
+def best(call, number: int, repeat: int) -> float:
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare timestamp parsing on feed payloads')
+    parser.add_argument('--size', type=int, default=100, help='Items per page (default: 100)')
+    parser.add_argument('--repeat', type=int, default=5, help='Best of N (default: 5)')
+    args = parser.parse_args()
+
+    posts, notifications = posts_page(args.size), notifications_page(args.size)
+    values = timestamps(json.loads(posts), [])
+    adapter = TypeAdapter(list[Timestamp])
+    assert [v.replace(tzinfo=None) for v in adapter.validate_python(values)] == [strptime(v).replace(tzinfo=None) for v in values]
+
+    old = best(lambda: [strptime(v) for v in values], 20, args.repeat)
+    new = best(lambda: adapter.validate_python(values), 20, args.repeat)
+    print(f'{len(values)} timestamps   strptime {old * 1000:7.2f} ms  Timestamp {new * 1000:7.2f} ms  x{old / new:.1f}')
+
+    for name, body, envelope in (('posts', posts, POSTS), ('notifications', notifications, NOTIFICATIONS)):
+        took = best(lambda: envelope.adapter.validate_json(body), max(1, 1000 // args.size), args.repeat)
+        print(f'{args.size} {name:<14} page  {took * 1000:7.2f} ms  ({len(body) / 1024:.0f} KiB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Синтетические, но похожие на настоящие ответы API для бенчмарков"""
+
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+_START = datetime(2026, 1, 30, 12, 0, tzinfo=timezone.utc)
+
+
+def _id(rnd: random.Random) -> str:
+    return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+
+def _time(rnd: random.Random, iso: bool) -> str:
+    moment = _START - timedelta(seconds=rnd.randrange(10_000_000), microseconds=rnd.randrange(1000) * 1000)
+    if iso:
+        return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{moment.microsecond // 1000:03d}Z'
+    return moment.strftime('%Y-%m-%d %H:%M:%S.') + f'{moment.microsecond // 1000:03d}+00'
+
+
+def user(rnd: random.Random) -> dict:
+    name = f'user{rnd.randrange(100_000)}'
+    return {
+        'id': _id(rnd), 'username': name, 'displayName': name.title(), 'avatar': '🐱', 'verified': rnd.random() < 0.1,
+        'pin': {'slug': 'early', 'name': 'Ранний', 'description': 'Один из первых пользователей'} if rnd.random() < 0.3 else None,
+    }
+
+
+def attach(rnd: random.Random) -> dict:
+    return {
+        'id': _id(rnd), 'type': 'image', 'url': f'https://cdn.example/{_id(rnd)}.webp', 'thumbnailUrl': None,
+        'width': 1280, 'height': 720, 'filename': 'image.webp', 'mimeType': 'image/webp', 'size': rnd.randrange(10_000, 900_000),
+    }
+
+
+def _author(rnd: random.Random, authors: list[dict] | None) -> dict:
+    return rnd.choice(authors) if authors else user(rnd)
+
+
+def comment(rnd: random.Random, replies: int = 1, authors: list[dict] | None = None) -> dict:
+    return {
+        'id': _id(rnd), 'content': 'Комментарий ' * rnd.randrange(1, 8), 'createdAt': _time(rnd, rnd.random() < 0.5),
+        'author': _author(rnd, authors), 'likesCount': rnd.randrange(50), 'repliesCount': replies, 'isLiked': False,
+        'attachments': [attach(rnd)] if rnd.random() < 0.1 else [],
+        'replies': [comment(rnd, 0, authors) for _ in range(replies)],
+    }
+
+
+def post(rnd: random.Random, nested: bool = True, authors: list[dict] | None = None) -> dict:
+    data = {
+        'id': _id(rnd), 'content': 'Текст поста #итд ' * rnd.randrange(1, 20), 'createdAt': _time(rnd, rnd.random() < 0.5),
+        'author': _author(rnd, authors), 'likesCount': rnd.randrange(1000), 'commentsCount': 3, 'repostsCount': rnd.randrange(20),
+        'viewsCount': rnd.randrange(10_000), 'isLiked': False, 'isReposted': False, 'isViewed': True, 'isOwner': False,
+        'attachments': [attach(rnd) for _ in range(rnd.randrange(3))],
+        'comments': [comment(rnd, authors=authors) for _ in range(3)] if nested else [],
+        'originalPost': None, 'wallRecipientId': None, 'wallRecipient': None,
+    }
+    if nested and rnd.random() < 0.25:
+        data['originalPost'] = dict(post(rnd, nested=False, authors=authors), isDeleted=False)
+    return data
+
+
+def posts_page(size: int, seed: int = 0, authors: int | None = None) -> bytes:
+    """Тело ответа `GET posts` с `size` постами. `authors` - сколько разных авторов на странице (по умолчанию все разные)"""
+    rnd = random.Random(seed)
+    people = [user(random.Random(i)) for i in range(authors)] if authors else None
+    return json.dumps({
+        'data': {'posts': [post(rnd, authors=people) for _ in range(size)], 'pagination': {'limit': size, 'nextCursor': 2, 'hasMore': True}}
+    }, ensure_ascii=False).encode()
+
+
+def followers_page(size: int, seed: int = 0) -> bytes:
+    """Тело ответа `GET users/:username/followers` с `size` подписчиками"""
+    rnd = random.Random(seed)
+    return json.dumps({'data': {
+        'users': [dict(user(rnd), isFollowing=rnd.random() < 0.5) for _ in range(size)],
+        'pagination': {'page': 1, 'limit': size, 'total': size * 10, 'hasMore': True},
+    }}, ensure_ascii=False).encode()
+
+
+def notifications_page(size: int, seed: int = 0) -> bytes:
+    """Тело ответа `GET notifications` с `size` уведомлениями"""
+    rnd = random.Random(seed)
+    return json.dumps({'notifications': [{
+        'id': _id(rnd), 'type': 'like', 'targetType': 'post', 'targetId': _id(rnd), 'preview': 'Текст поста',
+        'read': False, 'readAt': None, 'createdAt': _time(rnd, True), 'actor': user(rnd),
+    } for _ in range(size)], 'hasMore': True}, ensure_ascii=False).encode()
+
+
+def stream_notification(rnd: random.Random) -> dict:
+    """Уведомление из SSE потока `notifications/stream`"""
+    return {
+        'id': _id(rnd), 'type': rnd.choice(['like', 'follow', 'comment', 'reply']), 'targetType': 'post', 'targetId': _id(rnd),
+        'preview': 'Текст поста', 'readAt': None, 'createdAt': _time(rnd, True), 'userId': _id(rnd), 'actor': user(rnd),
+        'read': False, 'sound': True,
+    }
+
+
+def sse_stream(count: int, seed: int = 0, heartbeat: int = 100) -> bytes:
+    """Тело SSE потока: событие подключения, `count` уведомлений и комментарий-heartbeat через каждые `heartbeat` событий"""
+    rnd = random.Random(seed)
+    parts = [b'data: ' + json.dumps({'userId': _id(rnd), 'timestamp': 1769777894228}).encode() + b'\n\n']
+    for index in range(count):
+        if heartbeat and index % heartbeat == 0:
+            parts.append(b': heartbeat\n\n')
+        parts.append(b'id: %d\ndata: ' % index + json.dumps(stream_notification(rnd), ensure_ascii=False).encode() + b'\n\n')
+    return b''.join(parts)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Память на миллион записей: модели pydantic против `itd.records` (записи со слотами и таблицы по столбцам)
+
+    python benchmarks/records_memory.py --count 200000
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from payloads import post, user  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from itd.models.hashtag import Hashtag  # noqa: E402
+from itd.models.post import PostShort  # noqa: E402
+from itd.models.user import UserFollower  # noqa: E402
+from itd.records import (  # noqa: E402
+    FollowerRecord, FollowerTable, HashtagRecord, HashtagTable, PostRecord, PostTable, Record, Table
+)
+
+
+def followers(count: int) -> bytes:
+    rnd = random.Random(0)
+    return json.dumps([dict(user(rnd), isFollowing=rnd.random() < 0.5) for _ in range(count)], ensure_ascii=False).encode()
+
+
+def posts(count: int) -> bytes:
+    rnd = random.Random(0)
+    return json.dumps([post(rnd, nested=False) for _ in range(count)], ensure_ascii=False).encode()
+
+
+def hashtags(count: int) -> bytes:
+    rnd = random.Random(0)
+    return json.dumps([
+        {'id': str(uuid.UUID(int=rnd.getrandbits(128), version=4)), 'name': f'тег{i}', 'postsCount': rnd.randrange(100_000)}
+        for i in range(count)
+    ], ensure_ascii=False).encode()
+
+
+def retained(build: Callable[[], object]) -> tuple[int, float]:
+    """Сколько байт держит результат `build` и сколько секунд он строился"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare memory of pydantic models and compact records')
+    parser.add_argument('--count', type=int, default=200_000, help='Records per type (default: 200000)')
+    args = parser.parse_args()
+
+    cases: list[tuple[str, type, Callable[[int], bytes], type[Record], type[Table]]] = [
+        ('UserFollower', UserFollower, followers, FollowerRecord, FollowerTable),
+        ('PostShort', PostShort, posts, PostRecord, PostTable),
+        ('Hashtag', Hashtag, hashtags, HashtagRecord, HashtagTable),
+    ]
+    scale = 1_000_000 / args.count
+    for name, model, payload, record, table in cases:
+        adapter = TypeAdapter(list[model])
+        body = payload(args.count)
+        adapter.validate_json(b'[]')  # собрать схему до замеров
+        results = {
+            'models': retained(lambda: adapter.validate_json(body)),
+            'records': retained(lambda: [record.from_model(item) for item in adapter.validate_json(body)]),
+            'table': retained(lambda: table(adapter.validate_json(body))),
+        }
+        print(f'{name}: ' + '  '.join(
+            f'{kind} {size * scale / 2**20:7.1f} MiB/M ({size / args.count:5.0f} B each, {elapsed:5.2f} s)'
+            for kind, (size, elapsed) in results.items()
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Пропускная способность разбора SSE уведомлений: `sseclient` + `json.loads` + `model_validate` против `itd.sse`
+
+Поток отдаёт локальный сервер, так что замер включает чтение сокета через requests.
+
+    python benchmarks/sse_throughput.py --events 20000
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests  # noqa: E402
+from payloads import sse_stream  # noqa: E402
+from itd.models.envelope import STREAM_CONNECT, STREAM_NOTIFICATION  # noqa: E402
+from itd.models.event import StreamConnect, StreamNotification  # noqa: E402
+from itd.sse import SSEParser  # noqa: E402
+from itd.views import load_json  # noqa: E402
+
+
+def serve(body: bytes) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            for start in range(0, len(body), 16384):
+                self.wfile.write(body[start:start + 16384])
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy(response: requests.Response) -> Iterator[object]:
+    from sseclient import SSEClient
+
+    for event in SSEClient(response).events():
+        if not event.data or event.data.strip() == '':
+            continue
+        data = json.loads(event.data)
+        if 'userId' in data and 'timestamp' in data and 'type' not in data:
+            yield StreamConnect.model_validate(data)
+        else:
+            yield StreamNotification.model_validate(data)
+
+
+def builtin(response: requests.Response) -> Iterator[object]:
+    parser = SSEParser()
+    for chunk in response.iter_content(chunk_size=None):
+        for event in parser.feed(chunk):
+            data = event.data
+            envelope = STREAM_NOTIFICATION if b'"type"' in data or b'"timestamp"' not in data else STREAM_CONNECT
+            yield load_json(envelope, data)
+
+
+def measure(url: str, read: Callable[[requests.Response], Iterator[object]]) -> tuple[int, float]:
+    started = time.perf_counter()
+    with requests.get(url, stream=True) as response:
+        count = sum(1 for _ in read(response))
+    return count, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare SSE parsing throughput of sseclient and itd.sse')
+    parser.add_argument('--events', type=int, default=20000, help='Notifications in the stream (default: 20000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N (default: 3)')
+    args = parser.parse_args()
+
+    body = sse_stream(args.events)
+    server = serve(body)
+    url = f'http://127.0.0.1:{server.server_address[1]}/api/notifications/stream'
+
+    readers: dict[str, Callable] = {'itd.sse': builtin}
+    try:
+        import sseclient  # noqa: F401
+        readers = {'sseclient': legacy, **readers}
+    except ImportError:
+        print('sseclient is not installed, only itd.sse is measured')
+
+    print(f'{args.events} events, {len(body) / 2**20:.1f} MiB')
+    for name, read in readers.items():
+        count, elapsed = min((measure(url, read) for _ in range(args.repeat)), key=lambda result: result[1])
+        print(f'{name:>10}  {elapsed * 1000:8.1f} ms  {count / elapsed:9.0f} events/s  {len(body) / elapsed / 2**20:6.1f} MiB/s')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Пиковая память при разборе большой страницы подписчиков: весь ответ сразу против `ItemStream`
+
+    python benchmarks/stream_pages.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from payloads import followers_page  # noqa: E402
+from itd.jsonstream import ItemStream  # noqa: E402
+from itd.models.envelope import FOLLOWER_ITEMS, FOLLOWERS  # noqa: E402
+from itd.views import load_json_items  # noqa: E402
+
+CHUNK = 65536
+
+
+def chunks(body: bytes) -> Iterator[bytes]:
+    view = memoryview(body)
+    for start in range(0, len(body), CHUNK):
+        yield bytes(view[start:start + CHUNK])
+
+
+def buffered(body: bytes) -> int:
+    users = FOLLOWERS.adapter.validate_json(b''.join(chunks(body)))['data']['users']
+    return sum(user.is_following for user in users)
+
+
+def streamed(body: bytes) -> int:
+    users = ItemStream(chunks(body), ('data', 'users'), lambda items: load_json_items(FOLLOWER_ITEMS, items))
+    return sum(user.is_following for user in users)
+
+
+def measure(parse, body: bytes) -> tuple[float, int]:
+    """Время в секундах (без tracemalloc) и пиковая память в байтах"""
+    started = time.perf_counter()
+    result = parse(body)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    assert parse(body) == result
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare peak memory of buffered and streamed page parsing')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Followers per page (default: 1000 10000 100000)')
+    args = parser.parse_args()
+
+    FOLLOWERS.adapter.validate_json(followers_page(1))
+    FOLLOWER_ITEMS.adapter.validate_json(b'[]')
+    for size in args.sizes:
+        body = followers_page(size)
+        (old_time, old_peak), (new_time, new_peak) = measure(buffered, body), measure(streamed, body)
+        print(
+            f'{size:>7} followers ({len(body) / 2**20:6.1f} MiB)  buffered {old_time * 1000:8.1f} ms peak {old_peak / 2**20:7.1f} MiB  '
+            f'stream {new_time * 1000:8.1f} ms peak {new_peak / 2**20:5.2f} MiB'
+        )
+
+
+if __name__ == '__main__':
+    main()
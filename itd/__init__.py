@@ -1,4 +1,32 @@
-from itd.client import Client as ITDClient
-from itd.models.event import StreamConnect, StreamNotification
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = ['ITDClient', 'StreamConnect', 'StreamNotification']
\ No newline at end of file
+if TYPE_CHECKING:
+    from itd.client import Client as ITDClient
+    from itd.async_client import AsyncClient as AsyncITDClient
+    from itd.models.event import StreamConnect, StreamNotification
+    from itd.cursor import Cursor
+
+# клиенты и модели импортируются при первом обращении: `import itd` не тянет requests, httpx и pydantic
+_LAZY = {
+    'ITDClient': ('itd.client', 'Client'),
+    'AsyncITDClient': ('itd.async_client', 'AsyncClient'),
+    'StreamConnect': ('itd.models.event', 'StreamConnect'),
+    'StreamNotification': ('itd.models.event', 'StreamNotification'),
+    'Cursor': ('itd.cursor', 'Cursor'),
+}
+
+__all__ = ['ITDClient', 'AsyncITDClient', 'StreamConnect', 'StreamNotification', 'Cursor']
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module, attr = _LAZY[name]
+    value = getattr(import_module(module), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,31 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable
+
+from itd.batch import BatchResult, K, T
+
+
+async def arun_batch(
+    keys: Iterable[K], call: Callable[[K], Awaitable[T]], max_concurrency: int = 16, already: Callable[[Exception], bool] | None = None
+) -> BatchResult[K, T]:
+    """Асинхронный `run_batch`: не больше `max_concurrency` вызовов одновременно"""
+    unique = list(dict.fromkeys(keys))
+    results: dict[K, T] = {}
+    errors: dict[K, Exception] = {}
+    done: set[K] = set()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(key: K) -> None:
+        async with semaphore:
+            try:
+                results[key] = await call(key)
+            except Exception as e:
+                if already is not None and already(e):
+                    results[key] = None
+                    done.add(key)
+                else:
+                    errors[key] = e
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(key) for key in unique))
+    return BatchResult(unique, results, errors, time.perf_counter() - start, done)
@@ -0,0 +1,386 @@
+from uuid import UUID
+from typing import Any, AsyncIterator, Callable, Iterable
+from functools import partial, wraps
+import asyncio
+import logging
+
+from itd.routes.notifications import stream_notifications
+from itd.routes.auth import refresh_token
+
+from itd.models.event import StreamConnect, StreamNotification
+from itd.models.user import User
+
+from itd.client import BaseClient, Operation, StreamState, T
+from itd.async_request import AsyncTransport
+from itd.retry import RetryPolicy
+from itd.async_paginate import apaginate, AsyncPaginator
+from itd.cursor import Cursor
+from itd.async_jsonstream import AsyncItemStream
+from itd.views import Envelope, Validation, load_json_items
+from itd.identity import IdentityMap
+from itd.response import Response
+from itd.batch import BatchResult, already_done
+from itd.async_batch import arun_batch
+from itd.cache import ResponseCache
+from itd.token import REFRESH_RETRY, token_expired, refresh_delay
+from itd.credentials import CredentialCache, FileLock
+from itd.exceptions import NoCookie, Unauthorized
+
+log = logging.getLogger(__name__)
+
+
+def refresh_on_error(func):
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        if self.cookies:
+            token = await self._ensure_token()
+            try:
+                return await func(self, *args, **kwargs)
+            except Unauthorized:
+                await self._refresh_token(token)
+                return await func(self, *args, **kwargs)
+        else:
+            return await func(self, *args, **kwargs)
+    return wrapper
+
+
+async def _acquire(lock: FileLock) -> None:
+    """Взять блокировку файла, не останавливая event loop (её может держать другой процесс)
+
+    `lock.acquire` ждёт в отдельном потоке, и отмена задачи его не прерывает. Если задачу отменили,
+    блокировка, которую поток возьмёт позже, сразу отпускается, иначе она осталась бы занятой до конца процесса.
+    """
+    acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        acquiring.add_done_callback(lambda done: done.cancelled() or done.exception() is not None or lock.release())
+        raise
+
+
+class AsyncClient(BaseClient):
+    """Асинхронный клиент ITD с тем же набором методов, что и `Client`
+
+    Все запросы идут через один `httpx.AsyncClient` (общий пул соединений),
+    число одновременных запросов ограничено `max_concurrency`.
+
+    Example:
+        ```python
+        import asyncio
+        from itd import AsyncITDClient
+
+        async def main():
+            async with AsyncITDClient(cookies='refresh_token=...') as client:
+                users = await asyncio.gather(*(client.get_user(name) for name in names))
+
+        asyncio.run(main())
+        ```
+    """
+    def __init__(
+        self, token: str | None = None, cookies: str | None = None, max_concurrency: int = 100, max_connections: int = 100,
+        transport: AsyncTransport | None = None, cache: ResponseCache | None = None, refresh_ahead: float | None = 60,
+        credentials: CredentialCache | None = None, validation: Validation = 'strict', identity_map: IdentityMap | None = None
+    ):
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        self._stream_stopped: asyncio.Event | None = None  # будит ожидание перед переподключением
+        transport = transport or AsyncTransport(max_concurrency=max_concurrency, max_connections=max_connections)
+        super().__init__(token, cookies, transport, cache, refresh_ahead, credentials, validation, identity_map)
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Закрыть пул соединений и остановить фоновое обновление токена"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        await self._transport.aclose()
+
+    @staticmethod
+    def _operation(func: Callable[..., Operation]) -> Callable:
+        async def run(self, *args, **kwargs):
+            return await self._run(func(self, *args, **kwargs))
+        return wraps(func)(refresh_on_error(run))
+
+    @staticmethod
+    async def _run(operation: Operation[T]) -> T:
+        """Выполнить операцию: отданные вызовы роутов и методов - корутины, их результат (или ошибка) возвращается в генератор"""
+        result: Any = None
+        error: Exception | None = None
+        while True:
+            try:
+                call = operation.send(result) if error is None else operation.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                result, error = await call, None
+            except Exception as e:
+                result, error = None, e
+
+    def _paginate(self, page: Callable[[Any], Operation[tuple[list, Any]]], start: Any, prefetch: int, max_items: int | None, cursor: Cursor | str | None) -> AsyncPaginator:
+        return apaginate(lambda value: self._run(page(value)), start, prefetch, max_items, cursor)
+
+    def _stream(self, res: Response, path: tuple[str, ...], envelope: Envelope) -> AsyncItemStream:
+        return AsyncItemStream(res.aiter_bytes(), path, partial(load_json_items, envelope, validation=self.validation, identity=self.identity_map), res.aclose)
+
+    def _schedule_refresh(self, min_delay: float = 0) -> None:
+        """Запланировать обновление токена незадолго до истечения, но не раньше чем через `min_delay` секунд (если event loop уже запущен)"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if not self.cookies or self.refresh_ahead is None:
+            return
+        token = self._transport.token
+        delay = refresh_delay(token, self.refresh_ahead)
+        if delay is None:
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_later(token, max(delay, min_delay)))
+        except RuntimeError:
+            pass  # клиент создан вне event loop, запланируем при первом запросе
+
+    async def _refresh_later(self, token: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._refresh_task = None  # чтобы установка нового токена не отменила эту задачу посреди обновления
+        try:
+            await self._refresh_token(token)
+        except Exception as e:
+            # повторим позже; если токен успеет истечь, он обновится перед следующим запросом
+            log.warning('Не удалось заранее обновить токен, повтор через %.0f с: %r', REFRESH_RETRY, e)
+            if self._transport.token == token:
+                self._schedule_refresh(REFRESH_RETRY)
+
+    async def _refresh_token(self, expired: str | None) -> str:
+        """Обновить токен, если он всё ещё `expired`. Одновременно идёт только одно обновление, остальные ждут его результат"""
+        async with self._refresh_lock:
+            if self._transport.token != expired:  # токен уже обновил другой запрос, пока мы ждали
+                return self.token
+            if self._credentials is None:
+                res = await refresh_token(self._transport)
+
+                self.token = res.json()['accessToken']
+                return self.token
+
+            lock = self._credentials.lock()
+            await _acquire(lock)
+            try:
+                cached = self._credentials.get(self.cookies)
+                if cached and cached != self._transport.token:  # токен уже обновил другой процесс
+                    self.token = cached
+                    return self.token
+
+                res = await refresh_token(self._transport)
+
+                self.token = res.json()['accessToken']
+                self._credentials.put(self.cookies, self.token)
+                return self.token
+            finally:
+                lock.release()
+
+    async def _ensure_token(self) -> str | None:
+        """Токен для запроса: если его нет или он уже истёк, обновить сразу"""
+        token = self._transport.token
+        if not token or token_expired(token):
+            return await self._refresh_token(token)
+        if self._refresh_task is None:
+            self._schedule_refresh()
+        return token
+
+    async def _forget_credentials(self) -> None:
+        lock = self._credentials.lock()
+        await _acquire(lock)
+        try:
+            self._credentials.remove(self.cookies)
+        finally:
+            lock.release()
+
+    async def refresh_auth(self) -> str:
+        """Обновить access token
+
+        Raises:
+            NoCookie: Нет cookie
+
+        Returns:
+            str: Токен
+        """
+        if not self.cookies:
+            raise NoCookie()
+
+        return await self._refresh_token(self._transport.token)
+
+    async def get_users(self, usernames: Iterable[str], max_concurrency: int = 16) -> BatchResult[str, User]:
+        """Получить нескольких пользователей, не больше `max_concurrency` запросов одновременно
+
+        Повторы загружаются один раз, при включённом `cache` ответы берутся из кеша.
+        Ошибка одного пользователя не прерывает остальных.
+
+        Args:
+            usernames (Iterable[str]): username'ы
+            max_concurrency (int, optional): Сколько запросов выполнять одновременно. Defaults to 16.
+
+        Returns:
+            BatchResult[str, User]: Пользователи и ошибки (NotFound, UserBanned) по username, время и скорость
+        """
+        return await arun_batch(usernames, self.get_user, max_concurrency)
+
+    async def follow_users(self, usernames: Iterable[str], max_concurrency: int = 16) -> BatchResult[str, int]:
+        """Подписаться на нескольких пользователей, не больше `max_concurrency` запросов одновременно
+
+        Ошибка одного пользователя не прерывает остальных, уже оформленная подписка (AlreadyFollowing) считается успехом.
+
+        Args:
+            usernames (Iterable[str]): username'ы
+            max_concurrency (int, optional): Сколько запросов выполнять одновременно. Defaults to 16.
+
+        Returns:
+            BatchResult[str, int]: Число подписчиков или ошибка (NotFound, CantFollowYourself) по username; уже оформленные подписки - в `already`
+        """
+        return await arun_batch(usernames, self.follow, max_concurrency, already_done)
+
+    async def unfollow_users(self, usernames: Iterable[str], max_concurrency: int = 16) -> BatchResult[str, int]:
+        """Отписаться от нескольких пользователей, не больше `max_concurrency` запросов одновременно
+
+        Ошибка одного пользователя не прерывает остальных.
+
+        Args:
+            usernames (Iterable[str]): username'ы
+            max_concurrency (int, optional): Сколько запросов выполнять одновременно. Defaults to 16.
+
+        Returns:
+            BatchResult[str, int]: Число подписчиков или ошибка (NotFound) по username
+        """
+        return await arun_batch(usernames, self.unfollow, max_concurrency)
+
+    async def like_comments(self, ids: Iterable[UUID], max_concurrency: int = 16) -> BatchResult[UUID, int]:
+        """Лайкнуть несколько комментариев, не больше `max_concurrency` запросов одновременно
+
+        Ошибка одного комментария не прерывает остальные, повторный лайк (AlreadyLiked) считается успехом.
+
+        Args:
+            ids (Iterable[UUID]): UUID комментариев
+            max_concurrency (int, optional): Сколько запросов выполнять одновременно. Defaults to 16.
+
+        Returns:
+            BatchResult[UUID, int]: Количество лайков или ошибка (NotFound) по UUID; уже лайкнутые - в `already`
+        """
+        return await arun_batch(ids, self.like_comment, max_concurrency, already_done)
+
+    async def view_posts(self, ids: Iterable[UUID], max_concurrency: int = 16) -> BatchResult[UUID, None]:
+        """Просмотреть несколько постов, не больше `max_concurrency` запросов одновременно
+
+        Ошибка одного поста не прерывает остальные.
+
+        Args:
+            ids (Iterable[UUID]): UUID постов
+            max_concurrency (int, optional): Сколько запросов выполнять одновременно. Defaults to 16.
+
+        Returns:
+            BatchResult[UUID, None]: Ошибки (NotFound) по UUID
+        """
+        return await arun_batch(ids, self.view_post, max_concurrency)
+
+    async def like_posts(self, post_ids: Iterable[UUID], max_concurrency: int = 16) -> BatchResult[UUID, int]:
+        """Лайкнуть несколько постов, не больше `max_concurrency` запросов одновременно
+
+        Ошибка одного поста не прерывает остальные, повторный лайк (AlreadyLiked) считается успехом.
+
+        Args:
+            post_ids (Iterable[UUID]): UUID постов
+            max_concurrency (int, optional): Сколько запросов выполнять одновременно. Defaults to 16.
+
+        Returns:
+            BatchResult[UUID, int]: Количество лайков или ошибка (NotFound) по UUID; уже лайкнутые - в `already`
+        """
+        return await arun_batch(post_ids, self.like_post, max_concurrency, already_done)
+
+    async def unlike_posts(self, post_ids: Iterable[UUID], max_concurrency: int = 16) -> BatchResult[UUID, int]:
+        """Убрать лайки с нескольких постов, не больше `max_concurrency` запросов одновременно
+
+        Ошибка одного поста не прерывает остальные.
+
+        Args:
+            post_ids (Iterable[UUID]): UUID постов
+            max_concurrency (int, optional): Сколько запросов выполнять одновременно. Defaults to 16.
+
+        Returns:
+            BatchResult[UUID, int]: Количество лайков или ошибка (NotFound) по UUID
+        """
+        return await arun_batch(post_ids, self.unlike_post, max_concurrency)
+
+    async def stream_notifications(self, backfill: int = 100, reconnect: RetryPolicy | None = None, stall_timeout: float | None = 90) -> AsyncIterator[StreamConnect | StreamNotification]:
+        """Слушать SSE поток уведомлений
+
+        При обрыве поток переподключается с экспоненциальной задержкой и jitter (не меньше `retry:` от сервера)
+        и передаёт `Last-Event-ID`. Уведомления, пришедшие пока соединения не было, догружаются через
+        `get_notifications` до последнего полученного; повторы отсеиваются по id. Соединение, по которому
+        `stall_timeout` секунд не приходит ни событий, ни heartbeat, считается мёртвым и переоткрывается.
+
+        Args:
+            backfill (int, optional): Максимум уведомлений, догружаемых после переподключения (0 - не догружать). Defaults to 100.
+            reconnect (RetryPolicy | None, optional): Задержки переподключения (`backoff`, `max_backoff`). Defaults to RetryPolicy(backoff=1, max_backoff=60).
+            stall_timeout (float | None, optional): Секунд тишины до переподключения (None - ждать сколько угодно). Defaults to 90.
+
+        Yields:
+            StreamConnect | StreamNotification: События подключения или уведомления
+
+        Example:
+            ```python
+            async for event in client.stream_notifications():
+                if isinstance(event, StreamNotification):
+                    print(f'Уведомление: {event.type} от {event.actor.username}')
+            ```
+        """
+        self._stream_active = True
+        self._stream_stopped = asyncio.Event()
+        reconnect = reconnect or RetryPolicy(backoff=1, max_backoff=60)
+        state = StreamState(self, backfill)
+
+        while self._stream_active:
+            token = await self._ensure_token() if self.cookies else self.token
+            try:
+                async with stream_notifications(self._transport, state.parser.last_event_id, stall_timeout) as response:
+                    if response.status_code == 401:
+                        raise Unauthorized()
+                    response.raise_for_status()
+                    if state.connect():
+                        # соединение есть: догружаем то, что пришло пока его не было
+                        for item in state.missed(await self._backfill(state.last_id, state.user_id, backfill)):
+                            yield item
+
+                    async for chunk in response.aiter_bytes():
+                        for item in state.feed(chunk):
+                            if not self._stream_active:
+                                return
+                            yield item
+
+            except Unauthorized:
+                if self.cookies and self._stream_active:
+                    log.info('Токен истек, обновляем...')
+                    await self._refresh_token(token)
+                    continue
+                else:
+                    raise
+            except Exception as e:
+                reason = f'Ошибка соединения: {e}'
+            else:
+                reason = 'Сервер закрыл поток'
+            if not self._stream_active:
+                return
+
+            delay = state.delay(reconnect)
+            log.warning('%s, переподключение через %.1f с...', reason, delay)
+            try:
+                await asyncio.wait_for(self._stream_stopped.wait(), delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+    def stop_stream(self):
+        """Остановить прослушивание SSE потока: ожидание данных в сокете и пауза перед переподключением прерываются сразу"""
+        self._stream_active = False
+        if self._stream_stopped is not None:
+            self._stream_stopped.set()
+        self._transport.close_streams()
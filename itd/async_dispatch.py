@@ -0,0 +1,121 @@
+import asyncio
+import inspect
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from itd.dispatch import BaseDispatcher, Overflow, Spill
+
+if TYPE_CHECKING:
+    from itd.async_client import AsyncClient
+
+log = logging.getLogger(__name__)
+
+
+class AsyncDispatcher(BaseDispatcher):
+    """`Dispatcher` для `AsyncClient`: обработчики работают в `workers` задачах asyncio
+
+    Обработчики могут быть корутинами или обычными функциями (обычные вызываются в цикле событий,
+    поэтому блокирующую работу стоит выносить в `asyncio.to_thread`). Файл для 'spill' пишется синхронно.
+
+    Args:
+        client (AsyncClient): Клиент
+        workers (int, optional): Задач обработки. Defaults to 4.
+        max_queue (int, optional): Размер очереди. Defaults to 1000.
+        overflow (Overflow, optional): Политика переполнения ('block', 'drop_oldest', 'spill'). Defaults to 'block'.
+        spill_path (str | Path | None, optional): Файл для 'spill'. Defaults to None (временный файл).
+        **stream: Аргументы `stream_notifications` (`backfill`, `reconnect`)
+
+    Example:
+        ```python
+        dispatcher = AsyncDispatcher(client, overflow='spill')
+
+        @dispatcher.on(NotificationType.COMMENT, NotificationType.REPLY)
+        async def on_comment(notification):
+            await notify_chat(notification.preview)
+
+        await dispatcher.run()
+        ```
+    """
+    def __init__(
+        self, client: 'AsyncClient', workers: int = 4, max_queue: int = 1000, overflow: Overflow = 'block',
+        spill_path: str | Path | None = None, **stream: Any
+    ):
+        super().__init__(client, workers, max_queue, overflow, spill_path, stream)
+        self._queue: asyncio.Queue | None = None
+        self._spill: Spill | None = None
+
+    async def run(self) -> None:
+        """Читать поток и обрабатывать уведомления до `stop()`; оставшиеся в очереди обрабатываются перед выходом"""
+        self._queue = asyncio.Queue(self.max_queue)
+        if self.overflow == 'spill':
+            self._spill = Spill(self.spill_path)
+        tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        try:
+            async for event in self.client.stream_notifications(**self.stream):
+                if getattr(event, 'id', None) is None:  # StreamConnect
+                    continue
+                self.metrics.received += 1
+                await self._put(event)
+            while True:
+                self._refill()
+                await self._queue.join()
+                if not self._spill:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def stop(self) -> None:
+        """Остановить чтение потока"""
+        self.client.stop_stream()
+
+    async def _put(self, notification: Any) -> None:
+        if self.overflow == 'block':
+            await self._queue.put(notification)
+        elif self.overflow == 'drop_oldest':
+            if self._queue.full():
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.metrics.dropped += 1
+            self._queue.put_nowait(notification)
+        elif self._spill or self._queue.full():
+            # пока на диске что-то есть, новые уведомления идут за ними
+            self._spill.push(self._dump(notification))
+            self.metrics.spilled += 1
+        else:
+            self._queue.put_nowait(notification)
+        self._observe_depth()
+
+    def _refill(self) -> None:
+        """Вернуть уведомления с диска в освободившуюся очередь"""
+        while self._spill and not self._queue.full():
+            self._queue.put_nowait(self._load(self._spill.pop()))
+
+    def _observe_depth(self) -> None:
+        self.metrics.observe_depth(self._queue.qsize() + (len(self._spill) if self._spill else 0))
+
+    async def _work(self) -> None:
+        while True:
+            self._refill()
+            notification = await self._queue.get()
+            try:
+                self._observe_depth()
+                for handler in self.handlers_for(notification):
+                    started = time.perf_counter()
+                    try:
+                        result = handler(notification)
+                        if inspect.isawaitable(result):
+                            await result
+                        ok = True
+                    except Exception:
+                        log.exception('Ошибка обработчика %s', getattr(handler, '__qualname__', handler))
+                        ok = False
+                    self.metrics.observe_latency(handler, time.perf_counter() - started, ok)
+            finally:
+                self._queue.task_done()
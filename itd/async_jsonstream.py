@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Any, AsyncIterable, Awaitable, Callable, Generic, TypeVar
+
+from itd.jsonstream import ItemScanner
+
+T = TypeVar('T')
+
+
+class AsyncItemStream(Generic[T]):
+    """`ItemStream` для `async for`: элементы массива валидируются по мере загрузки тела
+
+    Args:
+        chunks (AsyncIterable[bytes]): Куски тела ответа
+        path (tuple[str, ...]): Путь к массиву
+        load (Callable[[list[bytes]], list[T]]): Валидация элементов из байтов
+        close (Callable[[], Awaitable[None]] | None, optional): Закрыть ответ. Defaults to None.
+    """
+    def __init__(self, chunks: AsyncIterable[bytes], path: tuple[str, ...], load: Callable[[list[bytes]], list[T]], close: Callable[[], Awaitable[None]] | None = None):
+        self._chunks = aiter(chunks)
+        self._scanner = ItemScanner(path)
+        self._load = load
+        self._close = close
+        self._items: deque[T] = deque()
+        self._finished = False
+
+    def __aiter__(self) -> 'AsyncItemStream[T]':
+        return self
+
+    async def __anext__(self) -> T:
+        try:
+            while not self._items:
+                if self._finished:
+                    raise StopAsyncIteration
+                chunk = await anext(self._chunks, None)
+                if chunk is None:
+                    self._finished = True
+                    await self.aclose()
+                    self._scanner.close()
+                elif items := self._scanner.feed(chunk):
+                    self._items.extend(self._load(items))
+            return self._items.popleft()
+        except StopAsyncIteration:
+            raise
+        except BaseException:
+            await self.aclose()
+            raise
+
+    @property
+    def rest(self) -> Any:
+        """Остальное тело ответа (с пустым массивом), доступно после перебора"""
+        return self._scanner.rest
+
+    async def aclose(self) -> None:
+        self._finished = True
+        self._items.clear()
+        if self._close is not None:
+            close, self._close = self._close, None
+            await close()
+
+    async def __aenter__(self) -> 'AsyncItemStream[T]':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
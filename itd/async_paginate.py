@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, AsyncIterator, Generic
+
+from itd.cursor import Cursor
+from itd.paginate import AsyncPageFetcher, C, RawPage, T, _take
+
+_DONE = object()
+
+
+async def _apages(fetch_page: AsyncPageFetcher, cursor: Cursor, max_items: int | None) -> AsyncIterator[RawPage]:
+    value, skip = cursor.value, cursor.skip
+    fetched = 0
+    while True:
+        items, next_value = await fetch_page(value)
+        yield value, skip, items, next_value
+        fetched += max(len(items) - skip, 0)
+        if not items or next_value is None or (max_items is not None and fetched >= max_items):
+            return
+        value, skip = next_value, 0
+
+
+async def _aprefetched(pages: AsyncIterator[RawPage], depth: int) -> AsyncIterator[RawPage]:
+    """Загружать страницы в фоновой задаче, держа готовыми до `depth` страниц"""
+    queue: asyncio.Queue = asyncio.Queue(depth)
+
+    async def produce() -> None:
+        try:
+            async for page in pages:
+                await queue.put((page, None))
+            await queue.put((_DONE, None))
+        except Exception as e:
+            await queue.put((_DONE, e))
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            page, error = await queue.get()
+            if error is not None:
+                raise error
+            if page is _DONE:
+                return
+            yield page
+    finally:
+        task.cancel()
+
+
+class AsyncPaginator(Generic[T]):
+    """Асинхронный `Paginator`: следующие страницы загружаются фоновой задачей"""
+    def __init__(self, fetch_page: AsyncPageFetcher, start: C | None, prefetch: int = 1, max_items: int | None = None, cursor: Cursor | str | None = None):
+        self.cursor: Cursor | None = Cursor.parse(cursor) if cursor is not None else Cursor(start)
+        self._fetch_page = fetch_page
+        self._prefetch = prefetch
+        self._max_items = max_items
+        self._items: AsyncIterator[T] | None = None
+
+    async def _chunks(self) -> AsyncIterator[tuple[list[T], Cursor | None, Any, int]]:
+        if self.cursor is None:
+            return
+        pages = _apages(self._fetch_page, self.cursor, self._max_items)
+        if self._prefetch > 0:
+            pages = _aprefetched(pages, self._prefetch)
+
+        count = 0
+        try:
+            async for page in pages:
+                left = None if self._max_items is None else self._max_items - count
+                taken, after = _take(page, left)
+                count += len(taken)
+                yield taken, after, page[0], page[1]
+                if left is not None and len(taken) >= left:
+                    return
+        finally:
+            await pages.aclose()
+
+    async def pages(self) -> AsyncIterator[tuple[list[T], Cursor | None]]:
+        """Перебрать страницы
+
+        Yields:
+            tuple[list[T], Cursor | None]: Элементы страницы и позиция после неё (None - список закончился)
+        """
+        async for taken, after, _, _ in self._chunks():
+            self.cursor = after
+            yield taken, after
+
+    async def _each(self) -> AsyncIterator[T]:
+        async for taken, after, value, skip in self._chunks():
+            end = skip + len(taken)
+            for position, item in enumerate(taken, skip + 1):
+                self.cursor = after if position == end else Cursor(value, position)
+                yield item
+            if not taken:
+                self.cursor = after
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        if self._items is None:
+            self._items = self._each()
+        return await self._items.__anext__()
+
+    async def aclose(self) -> None:
+        """Остановить фоновую загрузку страниц"""
+        if self._items is not None:
+            await self._items.aclose()
+
+
+def apaginate(fetch_page: AsyncPageFetcher, start: C | None, prefetch: int = 1, max_items: int | None = None, cursor: Cursor | str | None = None) -> AsyncPaginator:
+    """Асинхронный `paginate`: следующие страницы загружаются фоновой задачей"""
+    return AsyncPaginator(fetch_page, start, prefetch, max_items, cursor)
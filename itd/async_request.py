@@ -0,0 +1,277 @@
+import asyncio
+from contextlib import asynccontextmanager
+from _io import BufferedReader
+from typing import AsyncIterator, Awaitable, Callable, Hashable, TypeVar
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from itd.request import BASE_URL, api_headers, auth_headers, stream_headers, shutdown
+from itd.response import Response, ErrorTable
+from itd.ratelimit import RateLimiter, endpoint_key
+from itd.retry import RetryPolicy
+from itd.cache import ResponseCache, CacheEntry
+from itd.singleflight import request_key
+from itd.exceptions import RateLimitExceeded
+
+
+T = TypeVar('T')
+
+
+def _query(params: dict) -> dict:
+    # requests пропускает None и приводит значения через str(), httpx так не умеет
+    return {key: value if isinstance(value, (str, int, float)) else str(value) for key, value in params.items() if value is not None}
+
+
+class AsyncSingleFlight:
+    """`SingleFlight` для корутин одного event loop"""
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        while (future := self._calls.get(key)) is not None:
+            try:
+                # отмена одного из ожидающих не должна отменять общий запрос
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # отменили ведущий вызов, а не нас - повторяем запрос сами
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # иначе asyncio пожалуется на неполученное исключение, если никто не ждал
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class AsyncTransport:
+    """Асинхронный транспорт на httpx с общим пулом соединений
+
+    Количество одновременных запросов ограничивается семафором `max_concurrency`,
+    так что один event loop может безопасно запускать сотни запросов через `asyncio.gather`.
+    `http` - общий `httpx.AsyncClient` нескольких транспортов (например, аккаунтов в `NotificationMultiplexer`),
+    такой транспорт его не закрывает. Остальные параметры такие же, как у `Transport`.
+    """
+    def __init__(
+        self, token: str | None = None, cookies: str | None = None,
+        max_concurrency: int = 100, max_connections: int = 100, keep_alive: bool = True,
+        connect_timeout: float = 20, read_timeout: float = 20, upload_timeout: float = 120, rate_limit: bool = True,
+        retry: RetryPolicy | None = None, cache: ResponseCache | None = None, coalesce: bool = True,
+        http: 'httpx.AsyncClient | None' = None
+    ):
+        if httpx is None:
+            raise ImportError('AsyncITDClient requires httpx: pip install itd-sdk[async]')
+
+        self.token = token
+        self.cookies = cookies
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.upload_timeout = upload_timeout
+        self.rate_limiter = RateLimiter() if rate_limit else None
+        self.retry = retry or RetryPolicy()
+        self.cache = cache
+        self._flights = AsyncSingleFlight() if coalesce else None
+        self._revalidations: set[asyncio.Task] = set()
+        self._streams: set['httpx.Response'] = set()  # открытые SSE потоки для close_streams
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._owns_client = http is None
+        self._client = http or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections if keep_alive else 0),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+
+    async def _paced(self, method: str, url: str, send: Callable[[], Awaitable[Response]], retry: bool = True) -> Response:
+        """Отправить запрос в темпе лимитов эндпоинта, повторяя его после RateLimitExceeded"""
+        if self.rate_limiter is None:
+            return await send()
+
+        key = endpoint_key(method, url)
+        attempt = 0
+        while True:
+            wait = self.rate_limiter.acquire(key)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await send()
+            except RateLimitExceeded as e:
+                self.rate_limiter.limited(key, e.retry_after)
+                if not retry or attempt >= self.rate_limiter.max_retries:
+                    raise
+                attempt += 1
+
+    async def _send(self, method: str, url: str, send: Callable[[], Awaitable[Response]], idempotent: bool | None = None, retry: bool = True) -> Response:
+        """Отправить запрос, повторяя его по политике `self.retry`"""
+        if not retry:
+            return await self._paced(method, url, send, retry)
+
+        # превышение лимита повторяет сам RateLimiter, если он включён
+        errors = (httpx.TransportError,) if self.rate_limiter is not None else (httpx.TransportError, RateLimitExceeded)
+        attempt = 0
+        while True:
+            try:
+                res = await self._paced(method, url, send)
+            except errors as e:
+                delay = self.retry.next_delay(attempt, method, idempotent, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry.next_delay(attempt, method, idempotent, response=res)
+                if delay is None:
+                    return res
+                await res.aclose()  # ответ с `stream=True` иначе держит соединение до сборки мусора
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def request(
+        self, method: str, url: str, params: dict = {}, files: dict[str, tuple[str, BufferedReader]] = {},
+        errors: ErrorTable = {}, idempotent: bool | None = None, headers: dict[str, str] = {}, stream: bool = False
+    ) -> Response:
+        """Запрос к API. Выбрасывает ошибки API, но не проверяет HTTP статус
+
+        С `stream=True` тело успешного ответа не читается, его отдаёт `Response.aiter_bytes`.
+        """
+        method = method.upper()
+        timeout = httpx.Timeout(self.upload_timeout if files else self.read_timeout, connect=self.connect_timeout)
+
+        async def send() -> Response:
+            request_headers = api_headers(self.token or '') | headers
+            async with self._semaphore:
+                if method == 'GET' and stream:
+                    raw = await self._client.send(self._client.build_request('GET', BASE_URL + url, params=_query(params), headers=request_headers, timeout=timeout), stream=True)
+                    if raw.is_error:
+                        await raw.aread()
+                    res = Response(raw)
+                elif method == 'GET':
+                    res = Response(await self._client.get(BASE_URL + url, params=_query(params), headers=request_headers, timeout=timeout))
+                elif files:
+                    res = Response(await self._client.request(method, BASE_URL + url, files=files, headers=request_headers, timeout=timeout))
+                else:
+                    res = Response(await self._client.request(method, BASE_URL + url, json=params, headers=request_headers, timeout=timeout))
+            if not stream or not res.ok:
+                res.raise_for_error(errors)
+            return res
+
+        return await self._send(method, url, send, idempotent, retry=not files)
+
+    async def _revalidate(self, key: tuple, entry: CacheEntry | None, url: str, params: dict, errors: ErrorTable, ttl: float) -> Response:
+        """Запросить ответ для кеша, условным запросом, если у записи есть ETag / Last-Modified"""
+        generation = self.cache.generation
+        res = await self.request('get', url, params, errors=errors, headers=entry.validators() if entry else {})
+        if res.status_code == 304 and entry is not None:
+            self.cache.refresh(key, ttl)
+            return entry.response
+        res.raise_for_status()
+        self.cache.store(key, url, res, ttl, generation)
+        return res
+
+    def _revalidate_later(self, key: tuple, entry: CacheEntry, url: str, params: dict, errors: ErrorTable, ttl: float) -> None:
+        if not self.cache.begin_revalidation(key):
+            return
+
+        async def run() -> None:
+            try:
+                await self._revalidate(key, entry, url, params, errors, ttl)
+            except Exception:
+                pass  # устаревшая запись уже отдана, ошибка всплывёт при следующем запросе
+            finally:
+                self.cache.end_revalidation(key)
+
+        task = asyncio.create_task(run())
+        self._revalidations.add(task)  # держим ссылку, иначе задачу может собрать GC
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _cached(self, url: str, params: dict, errors: ErrorTable) -> Response | None:
+        ttl = self.cache.ttl_for(url)
+        if not ttl:
+            return None
+        key = self.cache.key(self.token, url, params)
+        entry, fresh, stale = self.cache.lookup(key)
+        if fresh:
+            return entry.response
+        if stale:
+            self._revalidate_later(key, entry, url, params, errors, ttl)
+            return entry.response
+        return await self._revalidate(key, entry, url, params, errors, ttl)
+
+    async def fetch(
+        self, method: str, url: str, params: dict = {}, files: dict[str, tuple[str, BufferedReader]] = {},
+        errors: ErrorTable = {}, idempotent: bool | None = None, invalidates: tuple[str, ...] = (), stream: bool = False
+    ) -> Response:
+        if self._flights is not None and method.lower() == 'get' and not stream:
+            key = request_key(method, self.token, url, params)
+            return await self._flights.do(key, lambda: self._fetch(method, url, params, files, errors, idempotent, invalidates))
+        return await self._fetch(method, url, params, files, errors, idempotent, invalidates, stream)
+
+    async def _fetch(
+        self, method: str, url: str, params: dict, files: dict[str, tuple[str, BufferedReader]],
+        errors: ErrorTable, idempotent: bool | None, invalidates: tuple[str, ...], stream: bool = False
+    ) -> Response:
+        if self.cache is not None and method.lower() == 'get' and not stream:
+            res = await self._cached(url, params, errors)
+            if res is not None:
+                return res
+
+        res = await self.request(method, url, params, files, errors, idempotent, stream=stream)
+        res.raise_for_status()
+        if self.cache is not None and invalidates:
+            self.cache.invalidate(*invalidates)
+        return res
+
+    async def auth_fetch(self, method: str, url: str, params: dict = {}, with_token: bool = False, errors: ErrorTable = {}) -> Response:
+        headers = auth_headers(self.cookies or '', self.token if with_token else None)
+        del headers['Content-Length'], headers['Host']  # httpx выставляет их сам
+
+        async def send() -> Response:
+            async with self._semaphore:
+                if method.lower() == 'get':
+                    res = Response(await self._client.get(BASE_URL + url, params=_query(params), headers=headers))
+                else:
+                    res = Response(await self._client.request(method.upper(), BASE_URL + url, json=params, headers=headers))
+            res.raise_for_error(errors, auth=True)
+            return res
+
+        res = await self._send(method, url, send)
+        res.raise_for_status()
+        return res
+
+    @asynccontextmanager
+    async def fetch_stream(self, url: str, headers: dict[str, str] | None = None, read_timeout: float | None = None) -> AsyncIterator['httpx.Response']:
+        """Открыть SSE поток: ответ отдаётся до чтения тела (`aiter_bytes`), соединение закрывается на выходе из `async with`
+
+        `read_timeout` - сколько ждать следующих байт потока (None - без ограничения)
+        """
+        timeout = httpx.Timeout(None, connect=self.connect_timeout, read=read_timeout)
+        async with self._client.stream('GET', BASE_URL + url, headers=stream_headers(self.token or '') | (headers or {}), timeout=timeout) as res:
+            self._streams.add(res)
+            try:
+                yield res
+            finally:
+                self._streams.discard(res)
+
+    def close_streams(self) -> None:
+        """Сразу оборвать открытые SSE потоки: ожидающее чтение получает конец потока, не дожидаясь данных"""
+        for res in list(self._streams):
+            stream = res.extensions.get('network_stream')
+            shutdown(stream.get_extra_info('socket') if stream is not None else None)
+
+    async def aclose(self) -> None:
+        for task in list(self._revalidations):
+            task.cancel()
+        if self._owns_client:
+            await self._client.aclose()
@@ -0,0 +1,90 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generic, Hashable, Iterable, Iterator, TypeVar
+
+from itd.exceptions import AlreadyFollowing, AlreadyLiked
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+class BatchResult(Generic[K, T]):
+    """Результат пакетной операции: значение или ошибка для каждого элемента
+
+    Args:
+        keys (list[K]): Элементы без повторов, в исходном порядке
+        results (dict[K, T]): Успешные результаты
+        errors (dict[K, Exception]): Ошибки
+        elapsed (float): Время выполнения в секундах
+        already (set[K] | None, optional): Элементы, для которых действие уже было выполнено раньше (в `results` со значением None). Defaults to None.
+    """
+    def __init__(self, keys: list[K], results: dict[K, T], errors: dict[K, Exception], elapsed: float, already: set[K] | None = None):
+        self.keys = keys
+        self.results = results
+        self.errors = errors
+        self.elapsed = elapsed
+        self.already = already if already is not None else set()
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def throughput(self) -> float:
+        """Элементов в секунду"""
+        return len(self.keys) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __getitem__(self, key: K) -> T:
+        """Результат элемента; если он завершился ошибкой, она выбрасывается"""
+        if key in self.errors:
+            raise self.errors[key]
+        return self.results[key]
+
+    def status(self, key: K) -> str:
+        """Итог для элемента: 'ok', 'already' или 'failed'"""
+        if key in self.errors:
+            return 'failed'
+        return 'already' if key in self.already else 'ok'
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return f'<BatchResult ok={len(self.results) - len(self.already)} already={len(self.already)} failed={len(self.errors)} elapsed={self.elapsed:.2f}s throughput={self.throughput:.1f}/s>'
+
+
+def already_done(e: Exception) -> bool:
+    """Действие уже выполнено раньше: подписка (AlreadyFollowing) или лайк (AlreadyLiked)"""
+    return isinstance(e, (AlreadyFollowing, AlreadyLiked))
+
+
+def run_batch(keys: Iterable[K], call: Callable[[K], T], max_workers: int = 8, already: Callable[[Exception], bool] | None = None) -> BatchResult[K, T]:
+    """Вызвать `call` для каждого элемента без повторов в пуле из `max_workers` потоков
+
+    Ошибка одного элемента не прерывает остальные - она попадает в `errors`.
+    Ошибки, для которых `already` вернул True, считаются успехом (элемент попадает в `already`).
+    """
+    unique = list(dict.fromkeys(keys))
+    results: dict[K, T] = {}
+    errors: dict[K, Exception] = {}
+    done: set[K] = set()
+
+    def run(key: K) -> None:
+        try:
+            results[key] = call(key)
+        except Exception as e:
+            if already is not None and already(e):
+                results[key] = None
+                done.add(key)
+            else:
+                errors[key] = e
+
+    start = time.perf_counter()
+    if unique:
+        with ThreadPoolExecutor(min(max_workers, len(unique)), thread_name_prefix='itd-batch') as pool:
+            for _ in pool.map(run, unique):
+                pass
+    return BatchResult(unique, results, errors, time.perf_counter() - start, done)
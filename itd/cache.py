@@ -0,0 +1,137 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from itd.ratelimit import endpoint_key
+from itd.response import Response
+from itd.singleflight import request_key
+
+# TTL в секундах для GET эндпоинтов, которые имеет смысл кешировать. Остальные не кешируются
+DEFAULT_TTL: dict[str, float] = {
+    'GET users/:id': 60,
+    'GET users/me': 60,
+    'GET posts/:id': 30,
+    'GET hashtags/trending': 300,
+    'GET users/stats/top-clans': 300,
+    'GET users/suggestions/who-to-follow': 300,
+    'GET platform/status': 60,
+}
+
+
+class CacheEntry:
+    __slots__ = ('response', 'path', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, response: Response, path: str, expires: float):
+        self.response = response
+        self.path = path
+        self.expires = expires
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+
+    def validators(self) -> dict[str, str]:
+        """Заголовки условного запроса (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """LRU кеш ответов GET запросов с TTL по эндпоинтам
+
+    Просроченная запись ещё `stale_while_revalidate` секунд отдаётся сразу, а в фоне обновляется.
+    Если сервер прислал ETag / Last-Modified, обновление идёт условным запросом и 304 продлевает запись.
+    Изменяющие запросы (редактирование поста, подписка, профиль) сбрасывают затронутые записи.
+
+    Args:
+        max_entries (int, optional): Максимум записей, лишние вытесняются по LRU. Defaults to 1024.
+        ttl (dict[str, float] | None, optional): TTL по ключам эндпоинтов (`GET users/:id`). Defaults to DEFAULT_TTL.
+        stale_while_revalidate (float, optional): Сколько секунд после TTL отдавать устаревшую запись. Defaults to 30.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: dict[str, float] | None = None, stale_while_revalidate: float = 30):
+        self.max_entries = max_entries
+        self.ttl = DEFAULT_TTL if ttl is None else ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0  # растёт при каждой инвалидации
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._revalidating: set[tuple] = set()
+        self._lock = Lock()
+
+    @staticmethod
+    def key(token: str | None, url: str, params: dict) -> tuple:
+        return request_key('get', token, url, params)
+
+    def ttl_for(self, url: str) -> float:
+        return self.ttl.get(endpoint_key('get', url), 0)
+
+    def lookup(self, key: tuple) -> tuple[CacheEntry | None, bool, bool]:
+        """Найти запись
+
+        Returns:
+            CacheEntry | None: Запись (может быть просроченной, тогда пригодится для условного запроса)
+            bool: Запись свежая
+            bool: Запись устарела, но её можно отдать, обновив в фоне
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False, False
+            self._entries.move_to_end(key)
+            now = time.monotonic()
+            if now < entry.expires:
+                self.hits += 1
+                return entry, True, False
+            if now < entry.expires + self.stale_while_revalidate:
+                self.hits += 1
+                return entry, False, True
+            self.misses += 1
+            return entry, False, False
+
+    def store(self, key: tuple, url: str, response: Response, ttl: float, generation: int) -> None:
+        """Сохранить ответ. Ответ, запрошенный до инвалидации (`generation` устарел), не сохраняется"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = CacheEntry(response, url, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key: tuple, ttl: float) -> None:
+        """Продлить запись после ответа 304 Not Modified"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = time.monotonic() + ttl
+
+    def begin_revalidation(self, key: tuple) -> bool:
+        """Занять фоновое обновление записи. False - обновление уже идёт"""
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def end_revalidation(self, key: tuple) -> None:
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def invalidate(self, *paths: str) -> None:
+        """Удалить записи по путям и всем вложенным путям (`users/bob` удалит и `users/bob/followers`)"""
+        with self._lock:
+            self.generation += 1
+            for key in [key for key, entry in self._entries.items() if any(entry.path == path or entry.path.startswith(path + '/') for path in paths)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
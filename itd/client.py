@@ -1,13 +1,11 @@
 # from warnings import deprecated
+import logging
 from uuid import UUID
 from _io import BufferedReader
-from typing import cast, Iterator
+from typing import cast, Any, Callable, Generator, Iterable, Iterator, TypeVar
 from datetime import datetime
-import json
-import time
-
-from requests.exceptions import ConnectionError, HTTPError
-from sseclient import SSEClient
+from threading import Event, RLock, Timer
+from functools import partial, wraps
 
 from itd.routes.users import get_user, update_profile, follow, unfollow, get_followers, get_following, update_privacy
 from itd.routes.etc import get_top_clans, get_who_to_follow, get_platform_status
@@ -34,63 +32,214 @@ from itd.models.report import NewReport
 from itd.models.file import File
 from itd.models.pin import Pin
 from itd.models.event import StreamConnect, StreamNotification
+from itd.models.envelope import (
+    FOLLOWERS, WHO_TO_FOLLOW, TOP_CLANS, COMMENTS, REPLIES, HASHTAGS, HASHTAG_POSTS, NOTIFICATIONS, POSTS, USER_POSTS, POST, SEARCH, PINS,
+    FOLLOWER_ITEMS, COMMENT_ITEMS, NOTIFICATION_ITEMS,
+    USER, PROFILE_UPDATE, PRIVACY, VERIFICATION, VERIFICATION_STATUS, COMMENT, NEW_POST, REPORT, FILE, STREAM_CONNECT, STREAM_NOTIFICATION
+)
 
 from itd.enums import PostsTab, ReportTargetType, ReportTargetReason
-from itd.request import set_cookies
-from itd.exceptions import (
-    NoCookie, NoAuthData, SamePassword, InvalidOldPassword, NotFound, ValidationError, UserBanned,
-    PendingRequestExists, Forbidden, UsernameTaken, CantFollowYourself, Unauthorized,
-    CantRepostYourPost, AlreadyReposted, AlreadyReported, TooLarge, PinNotOwned, NoContent,
-    AlreadyFollowing, NotFoundOrForbidden
-)
+from itd.request import Transport
+from itd.retry import RetryPolicy
+from itd.paginate import paginate, Paginator
+from itd.cursor import Cursor
+from itd.jsonstream import ItemStream
+from itd.views import Envelope, Validation, load, load_json, load_json_items, parse
+from itd.sse import SSEParser, RecentIds
+from itd.identity import IdentityMap
+from itd.response import Response
+from itd.batch import run_batch, already_done, BatchResult
+from itd.cache import ResponseCache
+from itd.token import REFRESH_RETRY, token_expired, refresh_delay
+from itd.credentials import CredentialCache
+from itd.exceptions import NoCookie, NoAuthData, Unauthorized
+
+log = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# операция клиента: отдаёт (`yield`) вызовы роутов и других методов, получает их результаты, возвращает результат метода
+Operation = Generator[Any, Any, T]
 
 
 def refresh_on_error(func):
     def wrapper(self, *args, **kwargs):
         if self.cookies:
+            token = self._ensure_token()
             try:
                 return func(self, *args, **kwargs)
-            except (Unauthorized, ConnectionError, HTTPError):
-                self.refresh_auth()
+            except Unauthorized:
+                self._refresh_token(token)
                 return func(self, *args, **kwargs)
         else:
             return func(self, *args, **kwargs)
     return wrapper
 
 
-class Client:
-    def __init__(self, token: str | None = None, cookies: str | None = None):
+def operation(func: Callable[..., Operation]) -> Callable[..., Operation]:
+    """Метод API, общий для `Client` и `AsyncClient`
+
+    Метод пишется один раз как генератор: каждый вызов роута или другого метода клиента отдаётся через `yield`,
+    а его результат приходит обратно. `Client` выполняет вызовы сразу, `AsyncClient` - ждёт их (`await`),
+    так что в подклассах остаётся только ввод-вывод. Аннотация возврата - результат метода, а не генератор.
+    """
+    func.__operation__ = True
+    return func
+
+
+class StreamState:
+    """Состояние `stream_notifications` между переподключениями: парсер, повторы, последнее уведомление
+
+    Args:
+        backfill (int): Максимум уведомлений, догружаемых после переподключения
+    """
+    def __init__(self, client: 'BaseClient', backfill: int):
+        self.client = client
+        self.backfill = backfill
+        self.parser = SSEParser()
+        self.seen = RecentIds()
+        self.last_id: str | None = None  # последнее отданное уведомление
+        self.user_id: str | None = None
+        self.attempt = 0
+        self.connected = False
+
+    def connect(self) -> bool:
+        """Соединение открыто (ответ 200, тело ещё не читалось). Возвращает True, если пропущенное нужно догрузить"""
+        self.parser.reset()
+        resume = self.connected and self.backfill > 0 and self.last_id is not None and self.user_id is not None
+        self.connected = True
+        return resume
+
+    def missed(self, notifications: list[StreamNotification]) -> Iterator[StreamNotification]:
+        """Догруженные уведомления без уже отданных"""
+        for item in notifications:
+            if self.seen.add(str(item.id)):
+                self.last_id = str(item.id)
+                yield item
+
+    def feed(self, chunk: bytes) -> Iterator[StreamConnect | StreamNotification]:
+        """События из куска тела без повторов"""
+        for event in self.parser.feed(chunk):
+            self.attempt = 0
+            if not event.data.strip():
+                continue
+
+            try:
+                item = self.client._stream_event(event.data)
+            except ValueError as e:
+                log.warning('Не удалось разобрать событие: %s', e)
+                continue
+            if (id := getattr(item, 'id', None)) is not None:  # у StreamConnect нет id
+                if not self.seen.add(str(id)):
+                    continue
+                self.last_id = str(id)
+            self.user_id = str(item.user_id)
+            yield item
+
+    def delay(self, reconnect: RetryPolicy) -> float:
+        """Пауза перед следующим переподключением (не меньше `retry:` от сервера)"""
+        delay = reconnect.delay(self.attempt, (self.parser.retry or 0) / 1000)
+        self.attempt += 1
+        return delay
+
+
+class BaseClient:
+    """Методы API, общие для `Client` и `AsyncClient`: построение запросов и разбор ответов
+
+    Подклассы задают ввод-вывод: `_operation` (как выполнять операции), `_paginate`, `_stream`,
+    обновление токена и `_forget_credentials`. В `AsyncClient` методы API - корутины,
+    `iter_*` возвращают `AsyncPaginator`, а `*_stream` - `AsyncItemStream`.
+    """
+    _transport: Any
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '_operation' not in vars(cls):
+            return
+        for name, func in vars(BaseClient).items():
+            if getattr(func, '__operation__', False) and name not in vars(cls):
+                setattr(cls, name, cls._operation(func))
+
+    def __init__(
+        self, token: str | None, cookies: str | None, transport: Any, cache: ResponseCache | None, refresh_ahead: float | None,
+        credentials: CredentialCache | None, validation: Validation, identity_map: IdentityMap | None
+    ):
+        if validation not in ('strict', 'fast', 'raw'):
+            raise ValueError(f'Unknown validation mode: {validation!r}')
         self.cookies = cookies
+        self.refresh_ahead = refresh_ahead
+        self.validation = validation
+        self.identity_map = identity_map
+        self._credentials = credentials
+        self._transport = transport
+        if cache is not None:
+            self._transport.cache = cache
+        self._transport.cookies = cookies
         self._stream_active = False  # Флаг для остановки stream_notifications
 
         if token:
             self.token = token.replace('Bearer ', '')
-        elif self.cookies:
-            set_cookies(self.cookies)
-            self.refresh_auth()
-        else:
+        elif not self.cookies:
             raise NoAuthData()
+        elif credentials is not None and (cached := credentials.get(self.cookies)):
+            self.token = cached
+        # иначе токен подтянется при первом запросе
+
+    @property
+    def token(self) -> str:
+        return cast(str, self._transport.token)
+
+    @token.setter
+    def token(self, value: str):
+        self._transport.token = value
+        self._schedule_refresh()
+
+    def _schedule_refresh(self, min_delay: float = 0) -> None:
+        raise NotImplementedError
+
+    def _paginate(self, page: Callable[[Any], Operation[tuple[list, Any]]], start: Any, prefetch: int, max_items: int | None, cursor: Cursor | str | None) -> Any:
+        raise NotImplementedError
+
+    def _stream(self, res: Response, path: tuple[str, ...], envelope: Envelope) -> Any:
+        raise NotImplementedError
+
+    def _forget_credentials(self) -> Any:
+        raise NotImplementedError
+
+    def _parse(self, res: Response, envelope: Envelope):
+        return parse(res, envelope, self.validation, self.identity_map)
+
+    def _stream_event(self, data: bytes) -> StreamConnect | StreamNotification:
+        # у события подключения только userId и timestamp
+        envelope = STREAM_NOTIFICATION if b'"type"' in data or b'"timestamp"' not in data else STREAM_CONNECT
+        return load_json(envelope, data, self.validation, self.identity_map)
+
+    @operation
+    def _backfill(self, last_id: str, user_id: str, limit: int) -> list[StreamNotification]:
+        """Уведомления новее `last_id` (от старых к новым), не больше `limit`"""
+        missed = []
+        offset = 0
+        while len(missed) < limit:
+            data = (yield get_notifications(self._transport, 20, offset)).json()
+            for notification in data['notifications']:
+                if notification['id'] == last_id:
+                    break
+                missed.append(notification)
+            else:
+                if data['hasMore'] and data['notifications']:
+                    offset += len(data['notifications'])
+                    continue
+            break
+        # в REST уведомлениях нет получателя, он тот же, что в потоке
+        return [load(STREAM_NOTIFICATION, notification | {'userId': user_id}, self.validation, self.identity_map) for notification in reversed(missed[:limit])]
 
-    def refresh_auth(self) -> str:
-        """Обновить access token
-
-        Raises:
-            NoCookie: Нет cookie
-
-        Returns:
-            str: Токен
-        """
-        print('refresh token')
-        if not self.cookies:
-            raise NoCookie()
-
-        res = refresh_token(self.cookies)
-        res.raise_for_status()
-
-        self.token = res.json()['accessToken']
-        return self.token
+    def rate_limit_budget(self) -> dict[str, dict]:
+        """Текущий бюджет запросов по эндпоинтам, для которых уже известен лимит (см. `RateLimiter.budget`)"""
+        if self._transport.rate_limiter is None:
+            return {}
+        return self._transport.rate_limiter.budget()
 
-    @refresh_on_error
+    @operation
     def change_password(self, old: str, new: str) -> dict:
         """Смена пароля
 
@@ -109,16 +258,10 @@ class Client:
         if not self.cookies:
             raise NoCookie()
 
-        res = change_password(self.cookies, self.token, old, new)
-        if res.json().get('error', {}).get('code') == 'SAME_PASSWORD':
-            raise SamePassword()
-        if res.json().get('error', {}).get('code') == 'INVALID_OLD_PASSWORD':
-            raise InvalidOldPassword()
-        res.raise_for_status()
-
+        res = yield change_password(self._transport, old, new)
         return res.json()
 
-    @refresh_on_error
+    @operation
     def logout(self) -> dict:
         """Выход из аккаунта
 
@@ -131,12 +274,12 @@ class Client:
         if not self.cookies:
             raise NoCookie()
 
-        res = logout(self.cookies)
-        res.raise_for_status()
-
+        res = yield logout(self._transport)
+        if self._credentials is not None:
+            yield self._forget_credentials()
         return res.json()
 
-    @refresh_on_error
+    @operation
     def get_user(self, username: str) -> User:
         """Получить пользователя
 
@@ -150,25 +293,19 @@ class Client:
         Returns:
             User: Пользователь
         """
-        res = get_user(self.token, username)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('User')
-        if res.json().get('error', {}).get('code') == 'USER_BLOCKED':
-            raise UserBanned()
-        res.raise_for_status()
-
-        return User.model_validate(res.json())
+        res = yield get_user(self._transport, username)
+        return self._parse(res, USER)
 
-    @refresh_on_error
+    @operation
     def get_me(self) -> User:
         """Получить текущего пользователя (me)
 
         Returns:
             User: Пользователь
         """
-        return self.get_user('me')
+        return (yield self.get_user('me'))
 
-    @refresh_on_error
+    @operation
     def update_profile(self, username: str | None = None, display_name: str | None = None, bio: str | None = None, banner_id: UUID | None = None) -> UserProfileUpdate:
         """Обновить профиль
 
@@ -184,16 +321,10 @@ class Client:
         Returns:
             UserProfileUpdate: Обновленный профиль
         """
-        res = update_profile(self.token, bio, display_name, username, banner_id)
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[0])
-        if res.json().get('error', {}).get('code') == 'USERNAME_TAKEN':
-            raise UsernameTaken()
-        res.raise_for_status()
+        res = yield update_profile(self._transport, bio, display_name, username, banner_id)
+        return self._parse(res, PROFILE_UPDATE)
 
-        return UserProfileUpdate.model_validate(res.json())
-
-    @refresh_on_error
+    @operation
     def update_privacy(self, wall_closed: bool = False, private: bool = False) -> UserPrivacy:
         """Обновить настройки приватности
 
@@ -204,12 +335,10 @@ class Client:
         Returns:
             UserPrivacy: Обновленные данные приватности
         """
-        res = update_privacy(self.token, wall_closed, private)
-        res.raise_for_status()
-
-        return UserPrivacy.model_validate(res.json())
+        res = yield update_privacy(self._transport, wall_closed, private)
+        return self._parse(res, PRIVACY)
 
-    @refresh_on_error
+    @operation
     def follow(self, username: str) -> int:
         """Подписаться на пользователя
 
@@ -223,18 +352,10 @@ class Client:
         Returns:
             int: Число подписчиков после подписки
         """
-        res = follow(self.token, username)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('User')
-        if res.json().get('error', {}).get('code') == 'CONFLICT':
-            raise AlreadyFollowing()
-        if res.json().get('error', {}).get('code') == 'VALIDATION_ERROR' and res.status_code == 400:
-            raise CantFollowYourself()
-        res.raise_for_status()
-
+        res = yield follow(self._transport, username)
         return res.json()['followersCount']
 
-    @refresh_on_error
+    @operation
     def unfollow(self, username: str) -> int:
         """Отписаться от пользователя
 
@@ -247,14 +368,10 @@ class Client:
         Returns:
             int: Число подписчиков после отписки
         """
-        res = unfollow(self.token, username)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('User')
-        res.raise_for_status()
-
+        res = yield unfollow(self._transport, username)
         return res.json()['followersCount']
 
-    @refresh_on_error
+    @operation
     def get_followers(self, username: str, limit: int = 30, page: int = 1) -> tuple[list[UserFollower], Pagination]:
         """Получить подписчиков пользователя
 
@@ -270,14 +387,53 @@ class Client:
             list[UserFollower]: Список подписчиков
             Pagination: Данные пагинации (лимит, страница, сколько всего, есть ли еще)
         """
-        res = get_followers(self.token, username, limit, page)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('User')
-        res.raise_for_status()
+        res = yield get_followers(self._transport, username, limit, page)
+        data = self._parse(res, FOLLOWERS)['data']
+        return data['users'], data['pagination']
+
+    def iter_followers(self, username: str, limit: int = 30, cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[UserFollower]:
+        """Перебрать всех подписчиков пользователя, следующие страницы загружаются в фоне
 
-        return [UserFollower.model_validate(user) for user in res.json()['data']['users']], Pagination.model_validate(res.json()['data']['pagination'])
+        Args:
+            username (str): username
+            limit (int, optional): Размер страницы. Defaults to 30.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум подписчиков. Defaults to None (все).
+
+        Raises:
+            NotFound: Пользователь не найден
 
-    @refresh_on_error
+        Returns:
+            Paginator[UserFollower]: Подписчики; `.cursor` - позиция для продолжения
+        """
+        def page(page: int) -> Operation[tuple[list[UserFollower], int | None]]:
+            users, pagination = yield self.get_followers(username, limit, page)
+            return users, page + 1 if pagination.has_more else None
+
+        return self._paginate(page, 1, prefetch, max_items, cursor)
+
+    @operation
+    def get_followers_stream(self, username: str, limit: int = 30, page: int = 1) -> ItemStream[UserFollower]:
+        """Получить подписчиков пользователя по мере загрузки ответа
+
+        Страница не собирается в памяти целиком: подписчики валидируются по одному, пока приходит тело.
+
+        Args:
+            username (str): username
+            limit (int, optional): Лимит. Defaults to 30.
+            page (int, optional): Страница. Defaults to 1.
+
+        Raises:
+            NotFound: Пользователь не найден
+
+        Returns:
+            ItemStream[UserFollower]: Подписчики; после перебора `.rest['data']['pagination']` - пагинация
+        """
+        res = yield get_followers(self._transport, username, limit, page, stream=True)
+        return self._stream(res, ('data', 'users'), FOLLOWER_ITEMS)
+
+    @operation
     def get_following(self, username: str, limit: int = 30, page: int = 1) -> tuple[list[UserFollower], Pagination]:
         """Получить подписки пользователя
 
@@ -293,15 +449,53 @@ class Client:
             list[UserFollower]: Список подписок
             Pagination: Данные пагинации (лимит, страница, сколько всего, есть ли еще)
         """
-        res = get_following(self.token, username, limit, page)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('User')
-        res.raise_for_status()
+        res = yield get_following(self._transport, username, limit, page)
+        data = self._parse(res, FOLLOWERS)['data']
+        return data['users'], data['pagination']
+
+    def iter_following(self, username: str, limit: int = 30, cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[UserFollower]:
+        """Перебрать все подписки пользователя, следующие страницы загружаются в фоне
+
+        Args:
+            username (str): username
+            limit (int, optional): Размер страницы. Defaults to 30.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум подписок. Defaults to None (все).
+
+        Raises:
+            NotFound: Пользователь не найден
+
+        Returns:
+            Paginator[UserFollower]: Подписки; `.cursor` - позиция для продолжения
+        """
+        def page(page: int) -> Operation[tuple[list[UserFollower], int | None]]:
+            users, pagination = yield self.get_following(username, limit, page)
+            return users, page + 1 if pagination.has_more else None
+
+        return self._paginate(page, 1, prefetch, max_items, cursor)
 
-        return [UserFollower.model_validate(user) for user in res.json()['data']['users']], Pagination.model_validate(res.json()['data']['pagination'])
+    @operation
+    def get_following_stream(self, username: str, limit: int = 30, page: int = 1) -> ItemStream[UserFollower]:
+        """Получить подписки пользователя по мере загрузки ответа
 
+        Страница не собирается в памяти целиком: подписки валидируются по одной, пока приходит тело.
 
-    @refresh_on_error
+        Args:
+            username (str): username
+            limit (int, optional): Лимит. Defaults to 30.
+            page (int, optional): Страница. Defaults to 1.
+
+        Raises:
+            NotFound: Пользователь не найден
+
+        Returns:
+            ItemStream[UserFollower]: Подписки; после перебора `.rest['data']['pagination']` - пагинация
+        """
+        res = yield get_following(self._transport, username, limit, page, stream=True)
+        return self._stream(res, ('data', 'users'), FOLLOWER_ITEMS)
+
+    @operation
     def verify(self, file_url: str) -> Verification:
         """Отправить запрос на верификацию
 
@@ -314,63 +508,50 @@ class Client:
         Returns:
             Verification: Верификация
         """
-        res = verify(self.token, file_url)
-        if res.json().get('error', {}).get('code') == 'PENDING_REQUEST_EXISTS':
-            raise PendingRequestExists()
-        res.raise_for_status()
+        res = yield verify(self._transport, file_url)
+        return self._parse(res, VERIFICATION)
 
-        return Verification.model_validate(res.json())
-
-    @refresh_on_error
+    @operation
     def get_verification_status(self) -> VerificationStatus:
         """Получить статус верификации
 
         Returns:
             VerificationStatus: Верификация
         """
-        res = get_verification_status(self.token)
-        res.raise_for_status()
-
-        return VerificationStatus.model_validate(res.json())
+        res = yield get_verification_status(self._transport)
+        return self._parse(res, VERIFICATION_STATUS)
 
-    @refresh_on_error
+    @operation
     def get_who_to_follow(self) -> list[UserWhoToFollow]:
         """Получить список популярных пользователей (кого читать)
 
         Returns:
             list[UserWhoToFollow]: Список пользователей
         """
-        res = get_who_to_follow(self.token)
-        res.raise_for_status()
-
-        return [UserWhoToFollow.model_validate(user) for user in res.json()['users']]
+        res = yield get_who_to_follow(self._transport)
+        return self._parse(res, WHO_TO_FOLLOW)['users']
 
-    @refresh_on_error
+    @operation
     def get_top_clans(self) -> list[Clan]:
         """Получить топ кланов
 
         Returns:
             list[Clan]: Топ кланов
         """
-        res = get_top_clans(self.token)
-        res.raise_for_status()
+        res = yield get_top_clans(self._transport)
+        return self._parse(res, TOP_CLANS)['clans']
 
-        return [Clan.model_validate(clan) for clan in res.json()['clans']]
-
-    @refresh_on_error
+    @operation
     def get_platform_status(self) -> bool:
         """Получить статус платформы
 
         Returns:
             bool: read only
         """
-        res = get_platform_status(self.token)
-        res.raise_for_status()
-
+        res = yield get_platform_status(self._transport)
         return res.json()['readOnly']
 
-
-    @refresh_on_error
+    @operation
     def add_comment(self, post_id: UUID, content: str, attachment_ids: list[UUID] = []) -> Comment:
         """Добавить комментарий
 
@@ -387,17 +568,10 @@ class Client:
         Returns:
             Comment: Комментарий
         """
-        res = add_comment(self.token, post_id, content, attachment_ids)
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[0])
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        res.raise_for_status()
-
-        return Comment.model_validate(res.json())
+        res = yield add_comment(self._transport, post_id, content, attachment_ids)
+        return self._parse(res, COMMENT)
 
-
-    @refresh_on_error
+    @operation
     def add_reply_comment(self, comment_id: UUID, content: str, author_id: UUID, attachment_ids: list[UUID] = []) -> Comment:
         """Добавить ответный комментарий
 
@@ -414,21 +588,10 @@ class Client:
         Returns:
             Comment: Комментарий
         """
-        res = add_reply_comment(self.token, comment_id, content, author_id, attachment_ids)
-        if res.status_code == 500 and 'Failed query' in res.text:
-            raise NotFound('User')
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[0])
-        if res.json().get('error', {}).get('code') == 'VALIDATION_ERROR':
-            raise NoContent()
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Comment')
-        res.raise_for_status()
-
-        return Comment.model_validate(res.json())
+        res = yield add_reply_comment(self._transport, comment_id, content, author_id, attachment_ids)
+        return self._parse(res, COMMENT)
 
-
-    @refresh_on_error
+    @operation
     def get_comments(self, post_id: UUID, limit: int = 20, cursor: int = 0, sort: str = 'popular') -> tuple[list[Comment], Pagination]:
         """Получить список комментариев
 
@@ -445,15 +608,35 @@ class Client:
             list[Comment]: Список комментариев
             Pagination: Пагинация
         """
-        res = get_comments(self.token, post_id, limit, cursor, sort)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield get_comments(self._transport, post_id, limit, cursor, sort)
+        data = self._parse(res, COMMENTS)['data']
+
+        return data['comments'], Pagination(page=(cursor // limit) or 1, limit=limit, total=data['total'], hasMore=data['hasMore'], nextCursor=None)
+
+    def iter_comments(self, post_id: UUID, limit: int = 20, sort: str = 'popular', cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[Comment]:
+        """Перебрать все комментарии поста, следующие страницы загружаются в фоне
+
+        Args:
+            post_id (UUID): UUID поста
+            limit (int, optional): Размер страницы. Defaults to 20.
+            sort (str, optional): Сортировка. Defaults to 'popular'.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум комментариев. Defaults to None (все).
+
+        Raises:
+            NotFound: Пост не найден
+
+        Returns:
+            Paginator[Comment]: Комментарии; `.cursor` - позиция для продолжения
+        """
+        def page(offset: int) -> Operation[tuple[list[Comment], int | None]]:
+            comments, pagination = yield self.get_comments(post_id, limit, offset, sort)
+            return comments, offset + len(comments) if pagination.has_more else None
 
-        return [Comment.model_validate(comment) for comment in data['comments']], Pagination(page=(cursor // limit) or 1, limit=limit, total=data['total'], hasMore=data['hasMore'], nextCursor=None)
+        return self._paginate(page, 0, prefetch, max_items, cursor)
 
-    @refresh_on_error
+    @operation
     def get_replies(self, comment_id: UUID, limit: int = 50, page: int = 1, sort: str = 'oldest') -> tuple[list[Comment], Pagination]:
         """Получить список комментариев
 
@@ -470,16 +653,56 @@ class Client:
             list[Comment]: Список комментариев
             Pagination: Пагинация
         """
-        res = get_replies(self.token, comment_id, page, limit, sort)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Comment')
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield get_replies(self._transport, comment_id, page, limit, sort)
+        data = self._parse(res, REPLIES)['data']
+
+        return data['replies'], data['pagination']
 
-        return [Comment.model_validate(comment) for comment in data['replies']], Pagination.model_validate(data['pagination'])
+    def iter_replies(self, comment_id: UUID, limit: int = 50, sort: str = 'oldest', cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[Comment]:
+        """Перебрать все ответы на комментарий, следующие страницы загружаются в фоне
 
+        Args:
+            comment_id (UUID): UUID комментария
+            limit (int, optional): Размер страницы. Defaults to 50.
+            sort (str, optional): Сортировка. Defaults to 'oldest'.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум ответов. Defaults to None (все).
+
+        Raises:
+            NotFound: Комментарий не найден
 
-    @refresh_on_error
+        Returns:
+            Paginator[Comment]: Ответы; `.cursor` - позиция для продолжения
+        """
+        def page(page: int) -> Operation[tuple[list[Comment], int | None]]:
+            replies, pagination = yield self.get_replies(comment_id, limit, page, sort)
+            return replies, page + 1 if pagination.has_more else None
+
+        return self._paginate(page, 1, prefetch, max_items, cursor)
+
+    @operation
+    def get_replies_stream(self, comment_id: UUID, limit: int = 50, page: int = 1, sort: str = 'oldest') -> ItemStream[Comment]:
+        """Получить ответы на комментарий по мере загрузки ответа
+
+        Страница не собирается в памяти целиком: ответы валидируются по одному, пока приходит тело.
+
+        Args:
+            comment_id (UUID): UUID комментария
+            limit (int, optional): Лимит. Defaults to 50.
+            page (int, optional): Страница. Defaults to 1.
+            sort (str, optional): Сортировка. Defaults to 'oldest'.
+
+        Raises:
+            NotFound: Комментарий не найден
+
+        Returns:
+            ItemStream[Comment]: Ответы; после перебора `.rest['data']['pagination']` - пагинация
+        """
+        res = yield get_replies(self._transport, comment_id, page, limit, sort, stream=True)
+        return self._stream(res, ('data', 'replies'), COMMENT_ITEMS)
+
+    @operation
     def like_comment(self, id: UUID) -> int:
         """Лайкнуть комментарий
 
@@ -488,18 +711,15 @@ class Client:
 
         Raises:
             NotFound: Комментарий не найден
+            AlreadyLiked: Комментарий уже лайкнут
 
         Returns:
             int: Количество лайков
         """
-        res = like_comment(self.token, id)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Comment')
-        res.raise_for_status()
-
+        res = yield like_comment(self._transport, id)
         return res.json()['likesCount']
 
-    @refresh_on_error
+    @operation
     def unlike_comment(self, id: UUID) -> int:
         """Убрать лайк с комментария
 
@@ -512,14 +732,10 @@ class Client:
         Returns:
             int: Количество лайков
         """
-        res = unlike_comment(self.token, id)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Comment')
-        res.raise_for_status()
-
+        res = yield unlike_comment(self._transport, id)
         return res.json()['likesCount']
 
-    @refresh_on_error
+    @operation
     def delete_comment(self, id: UUID) -> None:
         """Удалить комментарий
 
@@ -530,16 +746,9 @@ class Client:
             NotFound: Комментарий не найден
             Forbidden: Нет прав на удаление
         """
-        res = delete_comment(self.token, id)
-        if res.status_code == 204:
-            return
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Comment')
-        if res.json().get('error', {}).get('code') == 'FORBIDDEN':
-            raise Forbidden('delete comment')
-        res.raise_for_status()
+        yield delete_comment(self._transport, id)
 
-    @refresh_on_error
+    @operation
     def get_hashtags(self, limit: int = 10) -> list[Hashtag]:
         """Получить список популярных хэштэгов
 
@@ -549,12 +758,10 @@ class Client:
         Returns:
             list[Hashtag]: Список хэштэгов
         """
-        res = get_hashtags(self.token, limit)
-        res.raise_for_status()
+        res = yield get_hashtags(self._transport, limit)
+        return self._parse(res, HASHTAGS)['data']['hashtags']
 
-        return [Hashtag.model_validate(hashtag) for hashtag in res.json()['data']['hashtags']]
-
-    @refresh_on_error
+    @operation
     def get_posts_by_hashtag(self, hashtag: str, limit: int = 20, cursor: UUID | None = None) -> tuple[Hashtag | None, list[Post], Pagination]:
         """Получить посты по хэштэгу
 
@@ -568,14 +775,31 @@ class Client:
             list[Post]: Посты
             Pagination: Пагинация
         """
-        res = get_posts_by_hashtag(self.token, hashtag, limit, cursor)
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield get_posts_by_hashtag(self._transport, hashtag, limit, cursor)
+        data = self._parse(res, HASHTAG_POSTS)['data']
 
-        return Hashtag.model_validate(data['hashtag']), [Post.model_validate(post) for post in data['posts']], Pagination.model_validate(data['pagination'])
+        return data['hashtag'], data['posts'], data['pagination']
 
+    def iter_posts_by_hashtag(self, hashtag: str, limit: int = 20, cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[Post]:
+        """Перебрать все посты по хэштэгу, следующие страницы загружаются в фоне
 
-    @refresh_on_error
+        Args:
+            hashtag (str): Хэштэг (без #)
+            limit (int, optional): Размер страницы. Defaults to 20.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум постов. Defaults to None (все).
+
+        Returns:
+            Paginator[Post]: Посты; `.cursor` - позиция для продолжения
+        """
+        def page(cursor: UUID | None) -> Operation[tuple[list[Post], UUID | None]]:
+            _, posts, pagination = yield self.get_posts_by_hashtag(hashtag, limit, cursor)
+            return posts, pagination.next_cursor if pagination.has_more else None
+
+        return self._paginate(page, None, prefetch, max_items, cursor)
+
+    @operation
     def get_notifications(self, limit: int = 20, offset: int = 0) -> tuple[list[Notification], Pagination]:
         """Получить уведомления
 
@@ -587,15 +811,45 @@ class Client:
             list[Notification]: Уведомления
             Pagination: Пагинация
         """
-        res = get_notifications(self.token, limit, offset)
-        res.raise_for_status()
+        res = yield get_notifications(self._transport, limit, offset)
+        data = self._parse(res, NOTIFICATIONS)
+        return data['notifications'], Pagination(page=(offset // limit) + 1, limit=limit, hasMore=data['hasMore'], nextCursor=None)
+
+    def iter_notifications(self, limit: int = 20, cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[Notification]:
+        """Перебрать все уведомления, следующие страницы загружаются в фоне
+
+        Args:
+            limit (int, optional): Размер страницы. Defaults to 20.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум уведомлений. Defaults to None (все).
+
+        Returns:
+            Paginator[Notification]: Уведомления; `.cursor` - позиция для продолжения
+        """
+        def page(offset: int) -> Operation[tuple[list[Notification], int | None]]:
+            notifications, pagination = yield self.get_notifications(limit, offset)
+            return notifications, offset + len(notifications) if pagination.has_more else None
+
+        return self._paginate(page, 0, prefetch, max_items, cursor)
+
+    @operation
+    def get_notifications_stream(self, limit: int = 20, offset: int = 0) -> ItemStream[Notification]:
+        """Получить уведомления по мере загрузки ответа
+
+        Страница не собирается в памяти целиком: уведомления валидируются по одному, пока приходит тело.
+
+        Args:
+            limit (int, optional): Лимит. Defaults to 20.
+            offset (int, optional): Сдвиг. Defaults to 0.
 
-        return (
-            [Notification.model_validate(notification) for notification in res.json()['notifications']],
-            Pagination(page=(offset // limit) + 1, limit=limit, hasMore=res.json()['hasMore'], nextCursor=None)
-        )
+        Returns:
+            ItemStream[Notification]: Уведомления; после перебора `.rest['hasMore']` - есть ли ещё
+        """
+        res = yield get_notifications(self._transport, limit, offset, stream=True)
+        return self._stream(res, ('notifications',), NOTIFICATION_ITEMS)
 
-    @refresh_on_error
+    @operation
     def mark_as_read(self, id: UUID) -> bool:
         """Прочитать уведомление
 
@@ -605,32 +859,25 @@ class Client:
         Returns:
             bool: Успешно (False - уже прочитано)
         """
-        res = mark_as_read(self.token, id)
-        res.raise_for_status()
-
+        res = yield mark_as_read(self._transport, id)
         return res.json()['success']
 
-    @refresh_on_error
+    @operation
     def mark_all_as_read(self) -> None:
         """Прочитать все уведомления"""
-        res = mark_all_as_read(self.token)
-        res.raise_for_status()
-
+        yield mark_all_as_read(self._transport)
 
-    @refresh_on_error
+    @operation
     def get_unread_notifications_count(self) -> int:
         """Получить количество непрочитанных уведомлений
 
         Returns:
             int: Количество
         """
-        res = get_unread_notifications_count(self.token)
-        res.raise_for_status()
-
+        res = yield get_unread_notifications_count(self._transport)
         return res.json()['count']
 
-
-    @refresh_on_error
+    @operation
     def create_post(self, content: str, wall_recipient_id: UUID | None = None, attach_ids: list[UUID] = []) -> NewPost:
         """Создать пост
 
@@ -646,16 +893,10 @@ class Client:
         Returns:
             NewPost: Новый пост
         """
-        res = create_post(self.token, content, wall_recipient_id, attach_ids)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Wall recipient')
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[0])
-        res.raise_for_status()
-
-        return NewPost.model_validate(res.json())
+        res = yield create_post(self._transport, content, wall_recipient_id, attach_ids)
+        return self._parse(res, NEW_POST)
 
-    @refresh_on_error
+    @operation
     def get_posts(self, cursor: int = 0, tab: PostsTab = PostsTab.POPULAR) -> tuple[list[Post], PostsPagintaion]:
         """Получить список постов
 
@@ -667,13 +908,30 @@ class Client:
             list[Post]: Список постов
             Pagination: Пагинация
         """
-        res = get_posts(self.token, cursor, tab)
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield get_posts(self._transport, cursor, tab)
+        data = self._parse(res, POSTS)['data']
 
-        return [Post.model_validate(post) for post in data['posts']], PostsPagintaion.model_validate(data['pagination'])
+        return data['posts'], data['pagination']
 
-    @refresh_on_error
+    def iter_posts(self, tab: PostsTab = PostsTab.POPULAR, cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[Post]:
+        """Перебрать ленту постов, следующие страницы загружаются в фоне
+
+        Args:
+            tab (PostsTab, optional): Вкладка (популярное или подписки). Defaults to PostsTab.POPULAR.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум постов. Defaults to None (вся лента).
+
+        Returns:
+            Paginator[Post]: Посты; `.cursor` - позиция для продолжения
+        """
+        def page(cursor: int) -> Operation[tuple[list[Post], int | None]]:
+            posts, pagination = yield self.get_posts(cursor, tab)
+            return posts, pagination.next_cursor if pagination.has_more else None
+
+        return self._paginate(page, 0, prefetch, max_items, cursor)
+
+    @operation
     def get_post(self, id: UUID) -> Post:
         """Получить пост
 
@@ -686,14 +944,10 @@ class Client:
         Returns:
             Post: Пост
         """
-        res = get_post(self.token, id)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        res.raise_for_status()
-
-        return Post.model_validate(res.json()['data'])
+        res = yield get_post(self._transport, id)
+        return self._parse(res, POST)['data']
 
-    @refresh_on_error
+    @operation
     def edit_post(self, id: UUID, content: str) -> str:
         """Редактировать пост
 
@@ -709,19 +963,10 @@ class Client:
         Returns:
             str: Новое содержимое
         """
-        res = edit_post(self.token, id, content)
-
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        if res.json().get('error', {}).get('code') == 'FORBIDDEN':
-            raise Forbidden('edit post')
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[0])
-        res.raise_for_status()
-
+        res = yield edit_post(self._transport, id, content)
         return res.json()['content']
 
-    @refresh_on_error
+    @operation
     def delete_post(self, id: UUID) -> None:
         """Удалить пост
 
@@ -732,17 +977,9 @@ class Client:
             NotFound: Пост не найден
             Forbidden: Нет доступа
         """
-        res = delete_post(self.token, id)
-        if res.status_code == 204:
-            return
+        yield delete_post(self._transport, id)
 
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        if res.json().get('error', {}).get('code') == 'FORBIDDEN':
-            raise Forbidden('delete post')
-        res.raise_for_status()
-
-    @refresh_on_error
+    @operation
     def pin_post(self, id: UUID):
         """Закрепить пост
 
@@ -753,15 +990,9 @@ class Client:
             NotFound: Пост не найден
             Forbidden: Нет доступа
         """
-        res = pin_post(self.token, id)
-
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        if res.json().get('error', {}).get('code') == 'FORBIDDEN':
-            raise Forbidden('pin post')
-        res.raise_for_status()
+        yield pin_post(self._transport, id)
 
-    @refresh_on_error
+    @operation
     def repost(self, id: UUID, content: str | None = None) -> NewPost:
         """Репостнуть пост
 
@@ -778,21 +1009,10 @@ class Client:
         Returns:
             NewPost: Новый пост
         """
-        res = repost(self.token, id, content)
+        res = yield repost(self._transport, id, content)
+        return self._parse(res, NEW_POST)
 
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        if res.json().get('error', {}).get('code') == 'CONFLICT':
-            raise AlreadyReposted()
-        if res.status_code == 422 and res.json().get('message') == 'Cannot repost your own post':
-            raise CantRepostYourPost()
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[0])
-        res.raise_for_status()
-
-        return NewPost.model_validate(res.json())
-
-    @refresh_on_error
+    @operation
     def view_post(self, id: UUID) -> None:
         """Просмотреть пост
 
@@ -802,14 +1022,9 @@ class Client:
         Raises:
             NotFound: Пост не найден
         """
-        res = view_post(self.token, id)
-        if res.status_code == 204:
-            return
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('Post')
-        res.raise_for_status()
+        yield view_post(self._transport, id)
 
-    @refresh_on_error
+    @operation
     def get_user_posts(self, username_or_id: str | UUID, limit: int = 20, cursor: datetime | None = None) -> tuple[list[Post], LikedPostsPagintaion]:
         """Получить список постов пользователя
 
@@ -825,15 +1040,34 @@ class Client:
             list[Post]: Список постов
             LikedPostsPagintaion: Пагинация
         """
-        res = get_user_posts(self.token, username_or_id, limit, cursor)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('User')
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield get_user_posts(self._transport, username_or_id, limit, cursor)
+        data = self._parse(res, USER_POSTS)['data']
+
+        return data['posts'], data['pagination']
+
+    def iter_user_posts(self, username_or_id: str | UUID, limit: int = 20, cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[Post]:
+        """Перебрать все посты пользователя, следующие страницы загружаются в фоне
+
+        Args:
+            username_or_id (str | UUID): UUID или username пользователя
+            limit (int, optional): Размер страницы. Defaults to 20.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум постов. Defaults to None (все).
+
+        Raises:
+            NotFound: Пользователь не найден
+
+        Returns:
+            Paginator[Post]: Посты; `.cursor` - позиция для продолжения
+        """
+        def page(cursor: datetime | None) -> Operation[tuple[list[Post], datetime | None]]:
+            posts, pagination = yield self.get_user_posts(username_or_id, limit, cursor)
+            return posts, pagination.next_cursor if pagination.has_more else None
 
-        return [Post.model_validate(post) for post in data['posts']], LikedPostsPagintaion.model_validate(data['pagination'])
+        return self._paginate(page, None, prefetch, max_items, cursor)
 
-    @refresh_on_error
+    @operation
     def get_liked_posts(self, username_or_id: str | UUID, limit: int = 20, cursor: datetime | None = None) -> tuple[list[Post], LikedPostsPagintaion]:
         """Получить список лайкнутых постов пользователя
 
@@ -849,16 +1083,34 @@ class Client:
             list[Post]: Список постов
             LikedPostsPagintaion: Пагинация
         """
-        res = get_liked_posts(self.token, username_or_id, limit, cursor)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('User')
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield get_liked_posts(self._transport, username_or_id, limit, cursor)
+        data = self._parse(res, USER_POSTS)['data']
+
+        return data['posts'], data['pagination']
+
+    def iter_liked_posts(self, username_or_id: str | UUID, limit: int = 20, cursor: Cursor | str | None = None, prefetch: int = 1, max_items: int | None = None) -> Paginator[Post]:
+        """Перебрать все лайкнутые посты пользователя, следующие страницы загружаются в фоне
+
+        Args:
+            username_or_id (str | UUID): UUID или username пользователя
+            limit (int, optional): Размер страницы. Defaults to 20.
+            cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции (`str(...cursor)`). Defaults to None (с начала).
+            prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+            max_items (int | None, optional): Максимум постов. Defaults to None (все).
 
-        return [Post.model_validate(post) for post in data['posts']], LikedPostsPagintaion.model_validate(data['pagination'])
+        Raises:
+            NotFound: Пользователь не найден
 
+        Returns:
+            Paginator[Post]: Посты; `.cursor` - позиция для продолжения
+        """
+        def page(cursor: datetime | None) -> Operation[tuple[list[Post], datetime | None]]:
+            posts, pagination = yield self.get_liked_posts(username_or_id, limit, cursor)
+            return posts, pagination.next_cursor if pagination.has_more else None
 
-    @refresh_on_error
+        return self._paginate(page, None, prefetch, max_items, cursor)
+
+    @operation
     def report(self, id: UUID, type: ReportTargetType = ReportTargetType.POST, reason: ReportTargetReason = ReportTargetReason.OTHER, description: str | None = None) -> NewReport:
         """Отправить жалобу
 
@@ -876,20 +1128,10 @@ class Client:
         Returns:
             NewReport: Новая жалоба
         """
-        res = report(self.token, id, type, reason, description)
-
-        if res.json().get('error', {}).get('code') == 'VALIDATION_ERROR' and 'не найден' in res.json()['error'].get('message', ''):
-            raise NotFound(type.value.title())
-        if res.json().get('error', {}).get('code') == 'VALIDATION_ERROR' and 'Вы уже отправляли жалобу' in res.json()['error'].get('message', ''):
-            raise AlreadyReported(type.value.title())
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[-1])
-        res.raise_for_status()
-
-        return NewReport.model_validate(res.json()['data'])
+        res = yield report(self._transport, id, type, reason, description)
+        return self._parse(res, REPORT)['data']
 
-
-    @refresh_on_error
+    @operation
     def search(self, query: str, user_limit: int = 5, hashtag_limit: int = 5) -> tuple[list[UserWhoToFollow], list[Hashtag]]:
         """Поиск по пользователям и хэштэгам
 
@@ -905,16 +1147,12 @@ class Client:
             list[UserWhoToFollow]: Список пользователей
             list[Hashtag]: Список хэштэгов
         """
-        res = search(self.token, query, user_limit, hashtag_limit)
-
-        if res.status_code == 414:
-            raise TooLarge()
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield search(self._transport, query, user_limit, hashtag_limit)
+        data = self._parse(res, SEARCH)['data']
 
-        return [UserWhoToFollow.model_validate(user) for user in data['users']], [Hashtag.model_validate(hashtag) for hashtag in data['hashtags']]
+        return data['users'], data['hashtags']
 
-    @refresh_on_error
+    @operation
     def search_user(self, query: str, limit: int = 5) -> list[UserWhoToFollow]:
         """Поиск пользователей
 
@@ -925,9 +1163,9 @@ class Client:
         Returns:
             list[UserWhoToFollow]: Список пользователей
         """
-        return self.search(query, limit, 0)[0]
+        return (yield self.search(query, limit, 0))[0]
 
-    @refresh_on_error
+    @operation
     def search_hashtag(self, query: str, limit: int = 5) -> list[Hashtag]:
         """Поиск хэштэгов
 
@@ -938,10 +1176,9 @@ class Client:
         Returns:
             list[Hashtag]: Список хэштэгов
         """
-        return self.search(query, 0, limit)[1]
+        return (yield self.search(query, 0, limit))[1]
 
-
-    @refresh_on_error
+    @operation
     def upload_file(self, name: str, data: BufferedReader) -> File:
         """Загрузить файл
 
@@ -952,12 +1189,10 @@ class Client:
         Returns:
             File: Файл
         """
-        res = upload_file(self.token, name, data)
-        res.raise_for_status()
-
-        return File.model_validate(res.json())
+        res = yield upload_file(self._transport, name, data)
+        return self._parse(res, FILE)
 
-    @refresh_on_error
+    @operation
     def get_file(self, id: UUID) -> File:
         """Получить файл
 
@@ -970,14 +1205,10 @@ class Client:
         Returns:
             File: Файл
         """
-        res = get_file(self.token, id)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFoundOrForbidden('File')
-        res.raise_for_status()
+        res = yield get_file(self._transport, id)
+        return self._parse(res, FILE)
 
-        return File.model_validate(res.json())
-
-    @refresh_on_error
+    @operation
     def delete_file(self, id: UUID) -> File:
         """Удалить файл
 
@@ -987,13 +1218,10 @@ class Client:
         Raises:
             NotFound: Файл не найден
         """
-        res = delete_file(self.token, id)
-        if res.json().get('error', {}).get('code') == 'NOT_FOUND':
-            raise NotFound('File')
-        res.raise_for_status()
-
-        return File.model_validate(res.json())
+        res = yield delete_file(self._transport, id)
+        return self._parse(res, FILE)
 
+    @operation
     def update_banner(self, name: str) -> UserProfileUpdate:
         """Обновить банер (шорткат из upload_file + update_profile)
 
@@ -1003,20 +1231,19 @@ class Client:
         Returns:
             UserProfileUpdate: Обновленный профиль
         """
-        id = self.upload_file(name, cast(BufferedReader, open(name, 'rb'))).id
-        return self.update_profile(banner_id=id)
+        id = (yield self.upload_file(name, cast(BufferedReader, open(name, 'rb')))).id
+        return (yield self.update_profile(banner_id=id))
 
-    @refresh_on_error
+    @operation
     def restore_post(self, post_id: UUID) -> None:
         """Восстановить удалённый пост
 
         Args:
             post_id: UUID поста
         """
-        res = restore_post(self.token, post_id)
-        res.raise_for_status()
+        yield restore_post(self._transport, post_id)
 
-    @refresh_on_error
+    @operation
     def like_post(self, post_id: UUID) -> int:
         """Лайкнуть пост
 
@@ -1025,18 +1252,15 @@ class Client:
 
         Raises:
             NotFound: Пост не найден
+            AlreadyLiked: Пост уже лайкнут
 
         Returns:
             int: Количество лайков
         """
-        res = like_post(self.token, post_id)
-
-        if res.status_code == 404:
-            raise NotFound("Post")
-
+        res = yield like_post(self._transport, post_id)
         return res.json()['likesCount']
 
-    @refresh_on_error
+    @operation
     def unlike_post(self, post_id: UUID) -> int:
         """Убрать лайк с поста
 
@@ -1049,15 +1273,10 @@ class Client:
         Returns:
             int: Количество лайков
         """
-        res = unlike_post(self.token, post_id)
-
-        if res.status_code == 404:
-            raise NotFound("Post not found")
-
+        res = yield unlike_post(self._transport, post_id)
         return res.json()['likesCount']
 
-
-    @refresh_on_error
+    @operation
     def get_pins(self) -> tuple[list[Pin], str]:
         """Список пинов
 
@@ -1065,33 +1284,266 @@ class Client:
             list[Pin]: Список пинов
             str: Активный пин
         """
-        res = get_pins(self.token)
-        res.raise_for_status()
-        data = res.json()['data']
+        res = yield get_pins(self._transport)
+        data = self._parse(res, PINS)['data']
 
-        return [Pin.model_validate(pin) for pin in data['pins']], data['activePin']
+        return data['pins'], data['activePin']
 
-    @refresh_on_error
+    @operation
     def remove_pin(self):
         """Снять пин"""
-        res = remove_pin(self.token)
-        res.raise_for_status()
+        yield remove_pin(self._transport)
 
-    @refresh_on_error
+    @operation
     def set_pin(self, slug: str):
-        res = set_pin(self.token, slug)
-        if res.status_code == 422 and 'found' in res.json():
-            raise ValidationError(*list(res.json()['found'].items())[0])
-        if res.json().get('error', {}).get('code') == 'PIN_NOT_OWNED':
-            raise PinNotOwned(slug)
-        res.raise_for_status()
-
+        res = yield set_pin(self._transport, slug)
         return res.json()['pin']
 
-    @refresh_on_error
-    def stream_notifications(self) -> Iterator[StreamConnect | StreamNotification]:
+
+class Client(BaseClient):
+    def __init__(
+        self, token: str | None = None, cookies: str | None = None, transport: Transport | None = None,
+        cache: ResponseCache | None = None, refresh_ahead: float | None = 60, credentials: CredentialCache | None = None,
+        validation: Validation = 'strict', identity_map: IdentityMap | None = None
+    ):
+        """
+        Args:
+            token (str | None, optional): Access token. Без него токен получается по cookies при первом запросе. Defaults to None.
+            cookies (str | None, optional): Cookies с refresh_token. Defaults to None.
+            transport (Transport | None, optional): Свой транспорт (размер пула, keep-alive, таймауты). Defaults to None.
+            cache (ResponseCache | None, optional): Кеш ответов для пользователей, постов, хэштэгов и т.п. Defaults to None (без кеша).
+            refresh_ahead (float | None, optional): За сколько секунд до истечения токена обновлять его в фоне (нужны cookies). None - только после Unauthorized. Defaults to 60.
+            credentials (CredentialCache | None, optional): Кеш токенов на диске, общий для процессов. Defaults to None.
+            validation (Validation, optional): Разбор ответов: 'strict' - модели pydantic с полной валидацией,
+                'fast' - представления только для чтения, поля приводятся к типам при первом обращении,
+                'raw' - такие же представления без приведения типов (время и UUID - строки). Defaults to 'strict'.
+            identity_map (IdentityMap | None, optional): Общие экземпляры пользователей и пинов для повторов в ответах (только 'strict'). Defaults to None.
+        """
+        self._refresh_lock = RLock()
+        self._refresh_timer: Timer | None = None
+        self._stream_stopped = Event()  # будит ожидание перед переподключением
+        super().__init__(token, cookies, transport or Transport(), cache, refresh_ahead, credentials, validation, identity_map)
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрыть соединения транспорта и остановить фоновое обновление токена"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self._transport.close()
+
+    @staticmethod
+    def _operation(func: Callable[..., Operation]) -> Callable:
+        def run(self, *args, **kwargs):
+            return self._run(func(self, *args, **kwargs))
+        return wraps(func)(refresh_on_error(run))
+
+    @staticmethod
+    def _run(operation: Operation[T]) -> T:
+        """Выполнить операцию: вызовы роутов уже вернули результат, он просто отправляется обратно в генератор"""
+        try:
+            result = next(operation)
+            while True:
+                result = operation.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def _paginate(self, page: Callable[[Any], Operation[tuple[list, Any]]], start: Any, prefetch: int, max_items: int | None, cursor: Cursor | str | None) -> Paginator:
+        return paginate(lambda value: self._run(page(value)), start, prefetch, max_items, cursor)
+
+    def _stream(self, res: Response, path: tuple[str, ...], envelope: Envelope) -> ItemStream:
+        return ItemStream(res.iter_bytes(), path, partial(load_json_items, envelope, validation=self.validation, identity=self.identity_map), res.close)
+
+    def _schedule_refresh(self, min_delay: float = 0) -> None:
+        """Запланировать обновление токена незадолго до истечения, но не раньше чем через `min_delay` секунд"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        if not self.cookies or self.refresh_ahead is None:
+            return
+        token = self._transport.token
+        delay = refresh_delay(token, self.refresh_ahead)
+        if delay is None:
+            return
+        self._refresh_timer = Timer(max(delay, min_delay), self._refresh_in_background, (token,))
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_in_background(self, token: str) -> None:
+        try:
+            self._refresh_token(token)
+        except Exception as e:
+            # повторим позже; если токен успеет истечь, он обновится перед следующим запросом
+            log.warning('Не удалось заранее обновить токен, повтор через %.0f с: %r', REFRESH_RETRY, e)
+            if self._transport.token == token:
+                self._schedule_refresh(REFRESH_RETRY)
+
+    def _refresh_token(self, expired: str | None) -> str:
+        """Обновить токен, если он всё ещё `expired`. Одновременно идёт только одно обновление, остальные ждут его результат"""
+        with self._refresh_lock:
+            if self._transport.token != expired:  # токен уже обновил другой поток, пока мы ждали
+                return self.token
+            return self.refresh_auth()
+
+    def _ensure_token(self) -> str | None:
+        """Токен для запроса: если он уже истёк (например, фоновое обновление не успело), обновить сразу"""
+        token = self._transport.token
+        if not token or token_expired(token):
+            return self._refresh_token(token)
+        return token
+
+    def _forget_credentials(self) -> None:
+        with self._credentials.lock():
+            self._credentials.remove(self.cookies)
+
+    def refresh_auth(self) -> str:
+        """Обновить access token
+
+        Raises:
+            NoCookie: Нет cookie
+
+        Returns:
+            str: Токен
+        """
+        print('refresh token')
+        if not self.cookies:
+            raise NoCookie()
+
+        with self._refresh_lock:
+            if self._credentials is None:
+                res = refresh_token(self._transport)
+
+                self.token = res.json()['accessToken']
+                return self.token
+
+            with self._credentials.lock():
+                cached = self._credentials.get(self.cookies)
+                if cached and cached != self._transport.token:  # токен уже обновил другой процесс
+                    self.token = cached
+                    return self.token
+
+                res = refresh_token(self._transport)
+
+                self.token = res.json()['accessToken']
+                self._credentials.put(self.cookies, self.token)
+                return self.token
+
+    def get_users(self, usernames: Iterable[str], max_workers: int = 8) -> BatchResult[str, User]:
+        """Получить нескольких пользователей параллельно в `max_workers` потоках
+
+        Повторы загружаются один раз, при включённом `cache` ответы берутся из кеша.
+        Ошибка одного пользователя не прерывает остальных.
+
+        Args:
+            usernames (Iterable[str]): username'ы
+            max_workers (int, optional): Сколько запросов выполнять одновременно. Defaults to 8.
+
+        Returns:
+            BatchResult[str, User]: Пользователи и ошибки (NotFound, UserBanned) по username, время и скорость
+        """
+        return run_batch(usernames, self.get_user, max_workers)
+
+    def follow_users(self, usernames: Iterable[str], max_workers: int = 8) -> BatchResult[str, int]:
+        """Подписаться на нескольких пользователей параллельно в `max_workers` потоках
+
+        Ошибка одного пользователя не прерывает остальных, уже оформленная подписка (AlreadyFollowing) считается успехом.
+
+        Args:
+            usernames (Iterable[str]): username'ы
+            max_workers (int, optional): Сколько запросов выполнять одновременно. Defaults to 8.
+
+        Returns:
+            BatchResult[str, int]: Число подписчиков или ошибка (NotFound, CantFollowYourself) по username; уже оформленные подписки - в `already`
+        """
+        return run_batch(usernames, self.follow, max_workers, already_done)
+
+    def unfollow_users(self, usernames: Iterable[str], max_workers: int = 8) -> BatchResult[str, int]:
+        """Отписаться от нескольких пользователей параллельно в `max_workers` потоках
+
+        Ошибка одного пользователя не прерывает остальных.
+
+        Args:
+            usernames (Iterable[str]): username'ы
+            max_workers (int, optional): Сколько запросов выполнять одновременно. Defaults to 8.
+
+        Returns:
+            BatchResult[str, int]: Число подписчиков или ошибка (NotFound) по username
+        """
+        return run_batch(usernames, self.unfollow, max_workers)
+
+    def like_comments(self, ids: Iterable[UUID], max_workers: int = 8) -> BatchResult[UUID, int]:
+        """Лайкнуть несколько комментариев параллельно в `max_workers` потоках
+
+        Ошибка одного комментария не прерывает остальные, повторный лайк (AlreadyLiked) считается успехом.
+
+        Args:
+            ids (Iterable[UUID]): UUID комментариев
+            max_workers (int, optional): Сколько запросов выполнять одновременно. Defaults to 8.
+
+        Returns:
+            BatchResult[UUID, int]: Количество лайков или ошибка (NotFound) по UUID; уже лайкнутые - в `already`
+        """
+        return run_batch(ids, self.like_comment, max_workers, already_done)
+
+    def view_posts(self, ids: Iterable[UUID], max_workers: int = 8) -> BatchResult[UUID, None]:
+        """Просмотреть несколько постов параллельно в `max_workers` потоках
+
+        Ошибка одного поста не прерывает остальные.
+
+        Args:
+            ids (Iterable[UUID]): UUID постов
+            max_workers (int, optional): Сколько запросов выполнять одновременно. Defaults to 8.
+
+        Returns:
+            BatchResult[UUID, None]: Ошибки (NotFound) по UUID
+        """
+        return run_batch(ids, self.view_post, max_workers)
+
+    def like_posts(self, post_ids: Iterable[UUID], max_workers: int = 8) -> BatchResult[UUID, int]:
+        """Лайкнуть несколько постов параллельно в `max_workers` потоках
+
+        Ошибка одного поста не прерывает остальные, повторный лайк (AlreadyLiked) считается успехом.
+
+        Args:
+            post_ids (Iterable[UUID]): UUID постов
+            max_workers (int, optional): Сколько запросов выполнять одновременно. Defaults to 8.
+
+        Returns:
+            BatchResult[UUID, int]: Количество лайков или ошибка (NotFound) по UUID; уже лайкнутые - в `already`
+        """
+        return run_batch(post_ids, self.like_post, max_workers, already_done)
+
+    def unlike_posts(self, post_ids: Iterable[UUID], max_workers: int = 8) -> BatchResult[UUID, int]:
+        """Убрать лайки с нескольких постов параллельно в `max_workers` потоках
+
+        Ошибка одного поста не прерывает остальные.
+
+        Args:
+            post_ids (Iterable[UUID]): UUID постов
+            max_workers (int, optional): Сколько запросов выполнять одновременно. Defaults to 8.
+
+        Returns:
+            BatchResult[UUID, int]: Количество лайков или ошибка (NotFound) по UUID
+        """
+        return run_batch(post_ids, self.unlike_post, max_workers)
+
+    def stream_notifications(self, backfill: int = 100, reconnect: RetryPolicy | None = None, stall_timeout: float | None = 90) -> Iterator[StreamConnect | StreamNotification]:
         """Слушать SSE поток уведомлений
-        
+
+        При обрыве поток переподключается с экспоненциальной задержкой и jitter (не меньше `retry:` от сервера)
+        и передаёт `Last-Event-ID`. Уведомления, пришедшие пока соединения не было, догружаются через
+        `get_notifications` до последнего полученного; повторы отсеиваются по id. Соединение, по которому
+        `stall_timeout` секунд не приходит ни событий, ни heartbeat, считается мёртвым и переоткрывается.
+
+        Args:
+            backfill (int, optional): Максимум уведомлений, догружаемых после переподключения (0 - не догружать). Defaults to 100.
+            reconnect (RetryPolicy | None, optional): Задержки переподключения (`backoff`, `max_backoff`). Defaults to RetryPolicy(backoff=1, max_backoff=60).
+            stall_timeout (float | None, optional): Секунд тишины до переподключения (None - ждать сколько угодно). Defaults to 90.
+
         Yields:
             StreamConnect | StreamNotification: События подключения или уведомления
             
@@ -1113,51 +1565,46 @@ class Client:
             ```
         """
         self._stream_active = True
-        
+        self._stream_stopped.clear()
+        reconnect = reconnect or RetryPolicy(backoff=1, max_backoff=60)
+        state = StreamState(self, backfill)
+
         while self._stream_active:
+            token = self._ensure_token() if self.cookies else self.token
             try:
-                response = stream_notifications(self.token)
-                response.raise_for_status()
-                
-                client = SSEClient(response)
-                
-                for event in client.events():
-                    if not self._stream_active:
-                        response.close()
-                        return
-                        
-                    try:
-                        if not event.data or event.data.strip() == '':
-                            continue
-                            
-                        data = json.loads(event.data)
-                        
-                        if 'userId' in data and 'timestamp' in data and 'type' not in data:
-                            yield StreamConnect.model_validate(data)
-                        else:
-                            yield StreamNotification.model_validate(data)
-                            
-                    except json.JSONDecodeError:
-                        print(f'Не удалось распарсить сообщение: {event.data}')
-                        continue
-                    except Exception as e:
-                        print(f'Ошибка обработки события: {e}')
-                        continue
-                        
+                with stream_notifications(self._transport, state.parser.last_event_id, stall_timeout) as response:
+                    if response.status_code == 401:
+                        raise Unauthorized()
+                    response.raise_for_status()
+                    if state.connect():
+                        # соединение есть: догружаем то, что пришло пока его не было
+                        yield from state.missed(self._backfill(state.last_id, state.user_id, backfill))
+
+                    for chunk in response.iter_content(chunk_size=None):
+                        for item in state.feed(chunk):
+                            if not self._stream_active:
+                                return
+                            yield item
+
             except Unauthorized:
                 if self.cookies and self._stream_active:
-                    print('Токен истек, обновляем...')
-                    self.refresh_auth()
+                    log.info('Токен истек, обновляем...')
+                    self._refresh_token(token)
                     continue
                 else:
                     raise
             except Exception as e:
-                if not self._stream_active:
-                    return
-                print(f'Ошибка соединения: {e}, переподключение через 5 секунд...')
-                time.sleep(5)
-                continue
-    
+                reason = f'Ошибка соединения: {e}'
+            else:
+                reason = 'Сервер закрыл поток'
+            if not self._stream_active:
+                return
+
+            delay = state.delay(reconnect)
+            log.warning('%s, переподключение через %.1f с...', reason, delay)
+            if self._stream_stopped.wait(delay):
+                return
+
     def stop_stream(self):
         """Остановить прослушивание SSE потока
         
@@ -1183,4 +1630,6 @@ class Client:
             thread.join()
             ```
         """
-        self._stream_active = False
\ No newline at end of file
+        self._stream_active = False
+        self._stream_stopped.set()
+        self._transport.close_streams()  # ожидание данных в сокете прерывается сразу
\ No newline at end of file
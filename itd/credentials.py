@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from hashlib import sha256
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from itd.token import token_expiry
+
+
+def default_path() -> Path:
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'itd-sdk' / 'credentials.json'
+
+
+def account_key(cookies: str) -> str:
+    """Ключ аккаунта: хэш refresh_token (или всех cookies, если его там нет). Сами cookies на диск не пишутся"""
+    for cookie in cookies.split(';'):
+        name, _, value = cookie.strip().partition('=')
+        if name == 'refresh_token':
+            return sha256(value.encode()).hexdigest()
+    return sha256(cookies.encode()).hexdigest()
+
+
+class FileLock:
+    """Эксклюзивная блокировка файла между процессами (flock, на Windows - msvcrt.locking)"""
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK сдаётся через 10 секунд, ждём дальше
+                        pass
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class CredentialCache:
+    """Кеш access token на диске, общий для процессов и запусков
+
+    Клиент с cookies берёт отсюда ещё действующий токен вместо запроса /auth/refresh,
+    а обновляет токен под файловой блокировкой: если одновременно стартуют 20 воркеров,
+    refresh делает только первый, остальные читают его результат.
+
+    Args:
+        path (str | os.PathLike | None, optional): Файл кеша. Defaults to `~/.cache/itd-sdk/credentials.json`.
+        margin (float, optional): Токен, истекающий раньше чем через `margin` секунд, считается недействительным. Defaults to 30.
+    """
+    def __init__(self, path: str | os.PathLike | None = None, margin: float = 30):
+        self.path = Path(path) if path is not None else default_path()
+        self.margin = margin
+
+    def lock(self) -> FileLock:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return FileLock(str(self.path) + '.lock')
+
+    def _read(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: dict[str, dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + f'.{os.getpid()}.tmp')
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def get(self, cookies: str) -> str | None:
+        """Действующий токен аккаунта или None"""
+        entry = self._read().get(account_key(cookies))
+        if not isinstance(entry, dict) or not entry.get('token'):
+            return None
+        expires = entry.get('expires')
+        if expires is not None and expires - self.margin <= time.time():
+            return None
+        return entry['token']
+
+    def put(self, cookies: str, token: str) -> None:
+        """Сохранить токен аккаунта. Вызывать под `lock()`, если с кешем работают несколько процессов"""
+        data = self._read()
+        now = time.time()
+        # заодно выкидываем истёкшие токены других аккаунтов
+        data = {key: entry for key, entry in data.items() if isinstance(entry, dict) and (entry.get('expires') is None or entry['expires'] > now)}
+        data[account_key(cookies)] = {'token': token, 'expires': token_expiry(token)}
+        self._write(data)
+
+    def remove(self, cookies: str) -> None:
+        data = self._read()
+        if data.pop(account_key(cookies), None) is not None:
+            self._write(data)
@@ -0,0 +1,78 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from uuid import UUID
+
+CursorValue = int | datetime | UUID | str | None
+
+
+class Cursor:
+    """Позиция в списке: курсор страницы API и сколько элементов этой страницы уже обработано
+
+    Один тип для всех списков (страница, offset, int / datetime / UUID / строковый курсор).
+    `str(cursor)` - короткая строка для сохранения, `Cursor.decode` восстанавливает курсор из неё.
+
+    Args:
+        value (CursorValue, optional): Курсор страницы API (None - первая страница). Defaults to None.
+        skip (int, optional): Сколько элементов страницы уже обработано. Defaults to 0.
+    """
+    __slots__ = ('value', 'skip')
+
+    def __init__(self, value: CursorValue = None, skip: int = 0):
+        self.value = value
+        self.skip = skip
+
+    def encode(self) -> str:
+        if self.value is None:
+            data: list = ['n', None]
+        elif isinstance(self.value, datetime):
+            data = ['d', self.value.isoformat()]
+        elif isinstance(self.value, UUID):
+            data = ['u', self.value.hex]
+        elif isinstance(self.value, str):  # курсор из ответа без приведения типов (validation='raw')
+            data = ['s', self.value]
+        else:
+            data = ['i', int(self.value)]
+        if self.skip:
+            data.append(self.skip)
+        return urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, token: str) -> 'Cursor':
+        """Восстановить курсор из строки `encode`
+
+        Raises:
+            ValueError: Строка не является курсором
+        """
+        try:
+            kind, raw, *rest = json.loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            skip = int(rest[0]) if rest else 0
+            if kind == 'n':
+                return cls(None, skip)
+            if kind == 'd':
+                return cls(datetime.fromisoformat(raw), skip)
+            if kind == 'u':
+                return cls(UUID(raw), skip)
+            if kind == 's':
+                return cls(str(raw), skip)
+            if kind == 'i':
+                return cls(int(raw), skip)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f'Invalid cursor: {token!r}') from e
+        raise ValueError(f'Invalid cursor: {token!r}')
+
+    @classmethod
+    def parse(cls, cursor: 'Cursor | str') -> 'Cursor':
+        return cursor if isinstance(cursor, Cursor) else cls.decode(cursor)
+
+    def __str__(self) -> str:
+        return self.encode()
+
+    def __repr__(self) -> str:
+        return f'Cursor({self.value!r}, skip={self.skip})'
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Cursor) and (self.value, self.skip) == (other.value, other.skip)
+
+    def __hash__(self) -> int:
+        return hash((self.value, self.skip))
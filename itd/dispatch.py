@@ -0,0 +1,299 @@
+import logging
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Literal
+
+from pydantic_core import to_json
+
+from itd.enums import NotificationType
+from itd.models.envelope import STREAM_NOTIFICATION
+from itd.views import View, load_json, raw
+
+if TYPE_CHECKING:
+    from itd.client import Client
+
+log = logging.getLogger(__name__)
+
+Overflow = Literal['block', 'drop_oldest', 'spill']
+Handler = Callable[[Any], Any]
+
+
+class Latency:
+    """Время работы обработчика"""
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self) -> str:
+        return f'<Latency count={self.count} mean={self.mean * 1000:.1f}ms max={self.max * 1000:.1f}ms>'
+
+
+class DispatchMetrics:
+    """Счётчики диспетчера
+
+    Attributes:
+        received (int): Уведомлений из потока
+        handled (int): Вызовов обработчиков без ошибок
+        failed (int): Вызовов обработчиков с ошибкой
+        dropped (int): Старых уведомлений выброшено при переполнении ('drop_oldest')
+        spilled (int): Уведомлений записано на диск при переполнении ('spill')
+        depth (int): Уведомлений в очереди и на диске сейчас
+        max_depth (int): Наибольшая глубина очереди
+        latency (dict[str, Latency]): Время работы по обработчикам (`__qualname__`)
+    """
+    def __init__(self):
+        self.received = 0
+        self.handled = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.latency: dict[str, Latency] = {}
+        self._lock = threading.Lock()  # обработчики работают в нескольких потоках
+
+    def observe_depth(self, depth: int) -> None:
+        self.depth = depth
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def observe_latency(self, handler: Handler, seconds: float, ok: bool) -> None:
+        name = getattr(handler, '__qualname__', repr(handler))
+        with self._lock:
+            latency = self.latency.get(name)
+            if latency is None:
+                latency = self.latency[name] = Latency()
+            latency.add(seconds)
+            if ok:
+                self.handled += 1
+            else:
+                self.failed += 1
+
+    def __repr__(self) -> str:
+        return (
+            f'<DispatchMetrics received={self.received} handled={self.handled} failed={self.failed} '
+            f'dropped={self.dropped} spilled={self.spilled} depth={self.depth} max_depth={self.max_depth}>'
+        )
+
+
+class Spill:
+    """Очередь уведомлений в файле (JSON по строке), когда в памяти нет места
+
+    Args:
+        path (str | Path | None, optional): Файл. Defaults to None (временный файл, удаляется при закрытии).
+    """
+    def __init__(self, path: str | Path | None = None):
+        self._file: IO[bytes] = open(path, 'w+b') if path is not None else tempfile.TemporaryFile()
+        self._read = 0
+        self._size = 0
+
+    def push(self, data: bytes) -> None:
+        self._file.seek(0, 2)
+        self._file.write(data + b'\n')
+        self._size += 1
+
+    def pop(self) -> bytes:
+        self._file.seek(self._read)
+        line = self._file.readline()
+        self._read = self._file.tell()
+        self._size -= 1
+        if not self._size:
+            self._file.seek(0)
+            self._file.truncate()
+            self._read = 0
+        return line.rstrip(b'\n')
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BaseDispatcher:
+    """Реестр обработчиков и метрики, общие для `Dispatcher` и `AsyncDispatcher`"""
+    def __init__(self, client: Any, workers: int, max_queue: int, overflow: Overflow, spill_path: str | Path | None, stream: dict[str, Any]):
+        if overflow not in ('block', 'drop_oldest', 'spill'):
+            raise ValueError(f'Unknown overflow policy: {overflow!r}')
+        if workers < 1 or max_queue < 1:
+            raise ValueError('workers and max_queue must be positive')
+        self.client = client
+        self.stream = stream
+        self.workers = workers
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self.metrics = DispatchMetrics()
+        self._handlers: dict[str | None, list[Handler]] = {}
+
+    def on(self, *types: NotificationType | str) -> Callable[[Handler], Handler]:
+        """Декоратор: обработчик уведомлений этих типов (без типов - всех уведомлений)"""
+        def register(handler: Handler) -> Handler:
+            self.add_handler(handler, *types)
+            return handler
+        return register
+
+    def add_handler(self, handler: Handler, *types: NotificationType | str) -> None:
+        for key in [_key(tp) for tp in types] or [None]:
+            self._handlers.setdefault(key, []).append(handler)
+
+    def handlers_for(self, notification: Any) -> list[Handler]:
+        return self._handlers.get(_key(notification.type), []) + self._handlers.get(None, [])
+
+    def _dump(self, notification: Any) -> bytes:
+        if isinstance(notification, View):
+            return to_json(raw(notification))
+        return notification.model_dump_json(by_alias=True).encode()
+
+    def _load(self, data: bytes) -> Any:
+        return load_json(STREAM_NOTIFICATION, data, self.client.validation, self.client.identity_map)
+
+
+def _key(tp: NotificationType | str) -> str:
+    return tp.value if isinstance(tp, NotificationType) else tp
+
+
+class Dispatcher(BaseDispatcher):
+    """Обработка уведомлений из `stream_notifications` в пуле потоков
+
+    Поток читается без остановок, уведомления складываются в ограниченную очередь и разбираются
+    `workers` потоками, так что медленный обработчик (запись в БД, HTTP запрос) не задерживает чтение сокета.
+    Порядок обработки между потоками не гарантируется. Ошибки обработчиков пишутся в лог и считаются в `metrics.failed`.
+
+    Политики переполнения очереди:
+    - `block` - чтение потока ждёт места в очереди
+    - `drop_oldest` - самое старое уведомление выбрасывается
+    - `spill` - уведомления пишутся в файл и возвращаются в очередь, когда она освободится
+
+    Args:
+        client (Client): Клиент
+        workers (int, optional): Потоков обработки. Defaults to 4.
+        max_queue (int, optional): Размер очереди. Defaults to 1000.
+        overflow (Overflow, optional): Политика переполнения. Defaults to 'block'.
+        spill_path (str | Path | None, optional): Файл для 'spill'. Defaults to None (временный файл).
+        **stream: Аргументы `stream_notifications` (`backfill`, `reconnect`)
+
+    Example:
+        ```python
+        dispatcher = Dispatcher(client, workers=8, overflow='drop_oldest')
+
+        @dispatcher.on(NotificationType.FOLLOW)
+        def on_follow(notification):
+            db.save_follower(notification.actor.id)
+
+        dispatcher.run()  # до dispatcher.stop()
+        ```
+    """
+    def __init__(
+        self, client: 'Client', workers: int = 4, max_queue: int = 1000, overflow: Overflow = 'block',
+        spill_path: str | Path | None = None, **stream: Any
+    ):
+        super().__init__(client, workers, max_queue, overflow, spill_path, stream)
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._spill: Spill | None = None
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        """Читать поток и обрабатывать уведомления до `stop()`; оставшиеся в очереди обрабатываются перед выходом"""
+        if self.overflow == 'spill':
+            self._spill = Spill(self.spill_path)
+        threads = [threading.Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for event in self.client.stream_notifications(**self.stream):
+                if getattr(event, 'id', None) is None:  # StreamConnect
+                    continue
+                self.metrics.received += 1
+                self._put(event)
+        finally:
+            # None ставится только в разобранную очередь: после ошибки потока она может быть полна, и put(None) ждал бы места
+            while True:
+                self._refill()
+                self._queue.join()
+                if not self._spill:
+                    break
+            for _ in threads:
+                self._queue.put(None)
+            for thread in threads:
+                thread.join()
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def stop(self) -> None:
+        """Остановить чтение потока (можно из обработчика или другого потока)"""
+        self.client.stop_stream()
+
+    def _put(self, notification: Any) -> None:
+        if self.overflow == 'block':
+            self._queue.put(notification)
+        elif self.overflow == 'drop_oldest':
+            while True:
+                try:
+                    self._queue.put_nowait(notification)
+                    break
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    self._queue.task_done()
+                    self.metrics.dropped += 1
+        else:
+            with self._lock:
+                # пока на диске что-то есть, новые уведомления идут за ними
+                if self._spill or self._queue.full():
+                    self._spill.push(self._dump(notification))
+                    self.metrics.spilled += 1
+                else:
+                    self._queue.put_nowait(notification)
+            self._refill()
+        self._observe_depth()
+
+    def _refill(self) -> None:
+        """Вернуть уведомления с диска в освободившуюся очередь"""
+        if not self._spill:
+            return
+        with self._lock:
+            while self._spill and not self._queue.full():
+                self._queue.put_nowait(self._load(self._spill.pop()))
+
+    def _observe_depth(self) -> None:
+        self.metrics.observe_depth(self._queue.qsize() + (len(self._spill) if self._spill else 0))
+
+    def _work(self) -> None:
+        while True:
+            self._refill()
+            notification = self._queue.get()
+            try:
+                if notification is None:
+                    return
+                self._observe_depth()
+                for handler in self.handlers_for(notification):
+                    started = time.perf_counter()
+                    try:
+                        handler(notification)
+                        ok = True
+                    except Exception:
+                        log.exception('Ошибка обработчика %s', getattr(handler, '__qualname__', handler))
+                        ok = False
+                    self.metrics.observe_latency(handler, time.perf_counter() - started, ok)
+            finally:
+                self._queue.task_done()
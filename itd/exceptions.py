@@ -113,4 +113,10 @@ class NoContent(Exception):
 
 class AlreadyFollowing(Exception):
     def __str__(self) -> str:
-        return 'Already following user'
\ No newline at end of file
+        return 'Already following user'
+
+class AlreadyLiked(Exception):
+    def __init__(self, obj: str) -> None:
+        self.obj = obj
+    def __str__(self) -> str:
+        return f'{self.obj} already liked'
\ No newline at end of file
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, TypeVar
+
+from pydantic_core import SchemaValidator, core_schema
+
+T = TypeVar('T')
+
+
+class IdentityMap:
+    """LRU карта моделей по ключу: пользователи по `id`, пины по `slug`
+
+    Повторы одного автора на странице и между ответами становятся одним экземпляром модели:
+    объект переиспользуется без валидации, если пришли те же данные, иначе валидируется заново и заменяет старый.
+    Экземпляры общие для всех ответов, поэтому менять их поля не стоит.
+
+    Args:
+        max_entries (int, optional): Максимум объектов, лишние вытесняются по LRU. Defaults to 10000.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[dict, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def intern(self, cls: type[T], key: Hashable, data: dict, validate: Callable[[dict], T]) -> T:
+        """Экземпляр `cls` для `data`: из карты, если данные не изменились, иначе результат `validate`"""
+        entry_key = (cls, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] == data:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return entry[1]
+
+        value = validate(data)
+        with self._lock:
+            self.misses += 1
+            self._entries[entry_key] = (data, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f'<IdentityMap entries={len(self._entries)} hits={self.hits} misses={self.misses}>'
+
+
+def _interned(cls: type, field: str) -> Callable[[Any, Callable, core_schema.ValidationInfo], Any]:
+    def validate(data: Any, handler: Callable[[Any], Any], info: core_schema.ValidationInfo) -> Any:
+        identity = info.context.get('identity') if info.context else None
+        if identity is None or not isinstance(data, dict) or field not in data:
+            return handler(data)
+        return identity.intern(cls, data[field], data, handler)
+    return validate
+
+
+def _wrap_models(schema: Any) -> Any:
+    if isinstance(schema, list):
+        return [_wrap_models(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    schema = {key: _wrap_models(value) for key, value in schema.items()}
+    field = getattr(schema.get('cls'), '__identity_key__', None) if schema.get('type') == 'model' else None
+    if field is None:
+        return schema
+    ref = schema.pop('ref', None)
+    return core_schema.with_info_wrap_validator_function(_interned(schema['cls'], field), schema, ref=ref)
+
+
+def interning_validator(schema: core_schema.CoreSchema) -> SchemaValidator:
+    """Валидатор схемы, в котором модели с `__identity_key__` берутся из `IdentityMap` контекста (`context={'identity': ...}`)
+
+    Обычные адаптеры не меняются, так что без карты валидация не становится медленнее.
+    """
+    return SchemaValidator(_wrap_models(schema))
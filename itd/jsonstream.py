@@ -0,0 +1,183 @@
+import json
+import re
+from collections import deque
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+from pydantic_core import from_json
+
+T = TypeVar('T')
+
+_TOKEN = re.compile(rb'[{}\[\]",]')
+_PLAIN = re.compile(rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*')  # всё до скобки, строки целиком
+_STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)  # от открывающей кавычки до закрывающей
+
+
+class ItemScanner:
+    """Разрезает JSON тело, приходящее кусками, на элементы одного массива объектов
+
+    Массив ищется по пути ключей (`('data', 'users')`), каждый элемент отдаётся байтами, как только пришёл целиком.
+    В памяти держится только недочитанный элемент и остальное тело с пустым массивом (`rest`).
+
+    Args:
+        path (tuple[str, ...]): Ключи объектов до массива
+    """
+    def __init__(self, path: tuple[str, ...]):
+        self.path = list(path)
+        self.found = False
+        self.done = False  # массив закончился
+        self._buffer = bytearray()
+        self._head = bytearray()  # тело без элементов массива
+        self._frames: list[list] = []  # до массива: [скобка, ключ, ждём ли ключ]
+        self._depth = 0  # внутри массива: вложенность относительно него
+        self._start: int | None = None  # начало текущего элемента в буфере
+        self._pos = 0  # с какого места буфера продолжать разбор
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Добавить кусок тела. Возвращает элементы массива, которые закончились в нём"""
+        if self.done:
+            self._head += chunk
+            return []
+        self._buffer += chunk
+        if not self.found and not self._find():
+            return []
+        return self._items()
+
+    def _find(self) -> bool:
+        buffer, frames = self._buffer, self._frames
+        pos = 0
+        while (match := _TOKEN.search(buffer, pos)) is not None:
+            i = match.start()
+            char = buffer[i]
+            if char == 0x22:  # "
+                end = _STRING_END.match(buffer, i + 1)
+                if end is None:
+                    break  # строка ещё не пришла целиком
+                pos = end.end()
+                if frames and frames[-1][2]:
+                    frames[-1][1] = json.loads(buffer[i:pos])
+                    frames[-1][2] = False
+                continue
+            pos = i + 1
+            if char == 0x7B:  # {
+                frames.append([char, None, True])
+            elif char == 0x5B:  # [
+                if all(frame[0] == 0x7B for frame in frames) and [frame[1] for frame in frames] == self.path:
+                    self._head += buffer[:pos]
+                    del buffer[:pos]
+                    self.found = True
+                    return True
+                frames.append([char, None, False])
+            elif char == 0x2C:  # ,
+                if frames and frames[-1][0] == 0x7B:
+                    frames[-1][2] = True
+            elif frames:  # } ]
+                frames.pop()
+
+        self._head += buffer[:pos]
+        del buffer[:pos]
+        return False
+
+    def _items(self) -> list[bytes]:
+        buffer = self._buffer
+        items = []
+        depth, start, pos = self._depth, self._start, self._pos
+        size = len(buffer)
+        while (pos := _PLAIN.match(buffer, pos).end()) < size:
+            char = buffer[pos]
+            if char == 0x22:  # строка ещё не пришла целиком
+                break
+            if char == 0x7B or char == 0x5B:  # { [
+                if depth == 0:
+                    start = pos
+                depth += 1
+            elif depth == 0:  # ] самого массива
+                self._head += buffer[pos:]
+                buffer.clear()
+                self.done = True
+                return items
+            else:
+                depth -= 1
+                if depth == 0:
+                    items.append(bytes(buffer[start:pos + 1]))
+                    start = None
+            pos += 1
+
+        # разобранное начало буфера больше не нужно
+        cut = pos if start is None else start
+        del buffer[:cut]
+        self._depth, self._start, self._pos = depth, None if start is None else start - cut, pos - cut
+        return items
+
+    def close(self) -> None:
+        """Проверить, что тело закончилось вместе с массивом"""
+        if not self.found:
+            raise ValueError(f'Array {".".join(self.path)!r} not found in response')
+        if not self.done:
+            raise ValueError('Response body ended inside the array')
+
+    @property
+    def rest(self) -> Any:
+        """Тело ответа без элементов массива (пагинация и прочие поля)"""
+        return from_json(bytes(self._head)) if self.done else None
+
+
+class ItemStream(Generic[T]):
+    """Итератор по элементам массива из тела ответа, которые валидируются по мере загрузки
+
+    Память не зависит от размера страницы: тело читается кусками, элементы из каждого куска валидируются
+    из своих байтов одним вызовом. После перебора в `rest` лежит остальное тело (пагинация, `hasMore`).
+    Соединение закрывается в конце перебора или при `close()`.
+
+    Args:
+        chunks (Iterable[bytes]): Куски тела ответа
+        path (tuple[str, ...]): Путь к массиву
+        load (Callable[[list[bytes]], list[T]]): Валидация элементов из байтов
+        close (Callable[[], None] | None, optional): Закрыть ответ. Defaults to None.
+    """
+    def __init__(self, chunks: Iterable[bytes], path: tuple[str, ...], load: Callable[[list[bytes]], list[T]], close: Callable[[], None] | None = None):
+        self._chunks = iter(chunks)
+        self._scanner = ItemScanner(path)
+        self._load = load
+        self._close = close
+        self._items: deque[T] = deque()
+        self._finished = False
+
+    def __iter__(self) -> 'ItemStream[T]':
+        return self
+
+    def __next__(self) -> T:
+        try:
+            while not self._items:
+                if self._finished:
+                    raise StopIteration
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    self._finished = True
+                    self.close()
+                    self._scanner.close()
+                elif items := self._scanner.feed(chunk):
+                    self._items.extend(self._load(items))
+            return self._items.popleft()
+        except StopIteration:
+            raise
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def rest(self) -> Any:
+        """Остальное тело ответа (с пустым массивом), доступно после перебора"""
+        return self._scanner.rest
+
+    def close(self) -> None:
+        self._finished = True
+        self._items.clear()
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __enter__(self) -> 'ItemStream[T]':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
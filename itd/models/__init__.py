@@ -1,3 +1,25 @@
-from itd.models.event import StreamConnect, StreamNotification
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from itd.models.event import StreamConnect, StreamNotification
+
+_LAZY = {
+    'StreamConnect': ('itd.models.event', 'StreamConnect'),
+    'StreamNotification': ('itd.models.event', 'StreamNotification'),
+}
 
 __all__ = ['StreamConnect', 'StreamNotification']
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module, attr = _LAZY[name]
+    value = getattr(import_module(module), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
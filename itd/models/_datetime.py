@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator
+
+
+def parse_datetime(value: Any) -> Any:
+    """Разобрать время из ответа API без strptime и исключений
+
+    ISO 8601 (`2026-01-30T12:58:14.228Z`) остаётся pydantic, формат Postgres
+    (`2026-01-30 12:58:14.228+00`) разбирается `datetime.fromisoformat`,
+    дробная часть секунд дополняется нулями до 6 цифр.
+    """
+    if type(value) is str and value[10:11] == ' ':
+        if value[-3] in '+-':  # +00 -> +00:00, короткий сдвиг до python 3.11 fromisoformat не понимает
+            value += ':00'
+        if value[19:20] == '.':  # до python 3.11 fromisoformat понимает только 3 или 6 цифр дробной части
+            end = 20
+            while value[end:end + 1].isdigit():
+                end += 1
+            if end != 26:
+                value = value[:20] + value[20:end].ljust(6, '0') + value[end:]
+        return datetime.fromisoformat(value)
+    return value
+
+
+Timestamp = Annotated[datetime, BeforeValidator(parse_datetime)]
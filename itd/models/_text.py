@@ -1,21 +1,14 @@
 from uuid import UUID
-from datetime import datetime
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
+
+from itd.models._datetime import Timestamp
 
 
 class TextObject(BaseModel):
     id: UUID
     content: str
 
-    created_at: datetime = Field(alias='createdAt')
-
-    model_config = {'populate_by_name': True}
+    created_at: Timestamp = Field(alias='createdAt')
 
-    @field_validator('created_at', mode='plain')
-    @classmethod
-    def validate_created_at(cls, v: str):
-        try:
-            return datetime.strptime(v + '00', '%Y-%m-%d %H:%M:%S.%f%z')
-        except ValueError:
-            return datetime.strptime(v, '%Y-%m-%dT%H:%M:%S.%fZ')
\ No newline at end of file
+    model_config = {'populate_by_name': True, 'defer_build': True}
@@ -3,4 +3,6 @@ from pydantic import BaseModel, Field
 
 class Clan(BaseModel):
     avatar: str
-    member_count: int = Field(0, alias='memberCount')
\ No newline at end of file
+    member_count: int = Field(0, alias='memberCount')
+
+    model_config = {'defer_build': True}
\ No newline at end of file
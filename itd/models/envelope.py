@@ -0,0 +1,173 @@
+"""Ответы API целиком: тело валидируется за один проход прямо из байтов (`itd.views.parse`)
+
+Схемы собираются при первом использовании (`defer_build`), поэтому импорт модуля дешёвый.
+"""
+from typing import Any
+
+from pydantic import ConfigDict, with_config
+from typing_extensions import TypedDict
+
+from itd.views import Envelope
+from itd.models.clan import Clan
+from itd.models.comment import Comment
+from itd.models.event import StreamConnect, StreamNotification
+from itd.models.file import File
+from itd.models.hashtag import Hashtag
+from itd.models.notification import Notification
+from itd.models.pagination import Pagination, PostsPagintaion, LikedPostsPagintaion
+from itd.models.pin import Pin
+from itd.models.post import Post, NewPost
+from itd.models.report import NewReport
+from itd.models.user import User, UserFollower, UserPrivacy, UserProfileUpdate, UserWhoToFollow
+from itd.models.verification import Verification, VerificationStatus
+
+_deferred = with_config(ConfigDict(defer_build=True))
+
+
+@_deferred
+class FollowersData(TypedDict):
+    users: list[UserFollower]
+    pagination: Pagination
+
+@_deferred
+class FollowersResponse(TypedDict):
+    data: FollowersData
+
+
+@_deferred
+class WhoToFollowResponse(TypedDict):
+    users: list[UserWhoToFollow]
+
+
+@_deferred
+class TopClansResponse(TypedDict):
+    clans: list[Clan]
+
+
+@_deferred
+class CommentsData(TypedDict):
+    comments: list[Comment]
+    total: int
+    hasMore: bool
+
+@_deferred
+class CommentsResponse(TypedDict):
+    data: CommentsData
+
+
+@_deferred
+class RepliesData(TypedDict):
+    replies: list[Comment]
+    pagination: Pagination
+
+@_deferred
+class RepliesResponse(TypedDict):
+    data: RepliesData
+
+
+@_deferred
+class HashtagsData(TypedDict):
+    hashtags: list[Hashtag]
+
+@_deferred
+class HashtagsResponse(TypedDict):
+    data: HashtagsData
+
+
+@_deferred
+class HashtagPostsData(TypedDict):
+    hashtag: Hashtag | None
+    posts: list[Post]
+    pagination: Pagination
+
+@_deferred
+class HashtagPostsResponse(TypedDict):
+    data: HashtagPostsData
+
+
+@_deferred
+class NotificationsResponse(TypedDict):
+    notifications: list[Notification]
+    hasMore: bool
+
+
+@_deferred
+class PostsData(TypedDict):
+    posts: list[Post]
+    pagination: PostsPagintaion
+
+@_deferred
+class PostsResponse(TypedDict):
+    data: PostsData
+
+
+@_deferred
+class UserPostsData(TypedDict):
+    posts: list[Post]
+    pagination: LikedPostsPagintaion
+
+@_deferred
+class UserPostsResponse(TypedDict):
+    data: UserPostsData
+
+
+@_deferred
+class PostResponse(TypedDict):
+    data: Post
+
+
+@_deferred
+class SearchData(TypedDict):
+    users: list[UserWhoToFollow]
+    hashtags: list[Hashtag]
+
+@_deferred
+class SearchResponse(TypedDict):
+    data: SearchData
+
+
+@_deferred
+class ReportResponse(TypedDict):
+    data: NewReport
+
+
+@_deferred
+class PinsData(TypedDict):
+    pins: list[Pin]
+    activePin: Any
+
+@_deferred
+class PinsResponse(TypedDict):
+    data: PinsData
+
+
+FOLLOWERS = Envelope(FollowersResponse)
+WHO_TO_FOLLOW = Envelope(WhoToFollowResponse)
+TOP_CLANS = Envelope(TopClansResponse)
+COMMENTS = Envelope(CommentsResponse)
+REPLIES = Envelope(RepliesResponse)
+HASHTAGS = Envelope(HashtagsResponse)
+HASHTAG_POSTS = Envelope(HashtagPostsResponse)
+NOTIFICATIONS = Envelope(NotificationsResponse)
+POSTS = Envelope(PostsResponse)
+USER_POSTS = Envelope(UserPostsResponse)
+POST = Envelope(PostResponse)
+SEARCH = Envelope(SearchResponse)
+PINS = Envelope(PinsResponse)
+
+# элементы страниц для потокового разбора (`itd.jsonstream`)
+FOLLOWER_ITEMS = Envelope(list[UserFollower])
+COMMENT_ITEMS = Envelope(list[Comment])
+NOTIFICATION_ITEMS = Envelope(list[Notification])
+
+USER = Envelope(User)
+PROFILE_UPDATE = Envelope(UserProfileUpdate)
+PRIVACY = Envelope(UserPrivacy)
+VERIFICATION = Envelope(Verification)
+VERIFICATION_STATUS = Envelope(VerificationStatus)
+COMMENT = Envelope(Comment)
+NEW_POST = Envelope(NewPost)
+REPORT = Envelope(ReportResponse)
+FILE = Envelope(File)
+STREAM_CONNECT = Envelope(StreamConnect)
+STREAM_NOTIFICATION = Envelope(StreamNotification)
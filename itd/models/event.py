@@ -1,9 +1,9 @@
 from uuid import UUID
-from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
 from itd.enums import NotificationType, NotificationTargetType
 from itd.models.user import UserNotification
 
@@ -13,6 +13,8 @@ class StreamConnect(BaseModel):
     user_id: UUID = Field(alias='userId')
     timestamp: int
 
+    model_config = {'defer_build': True}
+
 
 class StreamNotification(BaseModel):
     """Уведомление из SSE потока"""
@@ -23,11 +25,13 @@ class StreamNotification(BaseModel):
     target_id: UUID | None = Field(None, alias='targetId')
     
     preview: str | None = None
-    read_at: datetime | None = Field(None, alias='readAt')
-    created_at: datetime = Field(alias='createdAt')
+    read_at: Timestamp | None = Field(None, alias='readAt')
+    created_at: Timestamp = Field(alias='createdAt')
     
     user_id: UUID = Field(alias='userId')
     actor: UserNotification
     
     read: bool = False
     sound: bool = True
+
+    model_config = {'defer_build': True}
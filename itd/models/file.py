@@ -1,8 +1,8 @@
 from uuid import UUID
-from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
 from itd.enums import AttachType
 
 class File(BaseModel):
@@ -11,7 +11,9 @@ class File(BaseModel):
     filename: str
     mime_type: str = Field(alias='mimeType')
     size: int
-    created_at: datetime | None = Field(None, alias='createdAt')
+    created_at: Timestamp | None = Field(None, alias='createdAt')
+
+    model_config = {'defer_build': True}
 
 
 class PostAttach(BaseModel):
@@ -22,6 +24,8 @@ class PostAttach(BaseModel):
     width: int | None = None
     height: int | None = None
 
+    model_config = {'defer_build': True}
+
 
 class Attach(PostAttach):
     filename: str
@@ -5,4 +5,6 @@ from pydantic import BaseModel, Field
 class Hashtag(BaseModel):
     id: UUID
     name: str
-    posts_count: int = Field(0, alias='postsCount')
\ No newline at end of file
+    posts_count: int = Field(0, alias='postsCount')
+
+    model_config = {'defer_build': True}
\ No newline at end of file
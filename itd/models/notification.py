@@ -1,8 +1,8 @@
 from uuid import UUID
-from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
 from itd.enums import NotificationType, NotificationTargetType
 from itd.models.user import UserNotification
 
@@ -16,7 +16,9 @@ class Notification(BaseModel):
     preview: str | None = None # follow - none, comment/reply - content, repost - original post content, like - post content, wall_post - wall post content
 
     read: bool = False
-    read_at: datetime | None = Field(None, alias='readAt')
-    created_at: datetime = Field(alias='createdAt')
+    read_at: Timestamp | None = Field(None, alias='readAt')
+    created_at: Timestamp = Field(alias='createdAt')
 
-    actor: UserNotification
\ No newline at end of file
+    actor: UserNotification
+
+    model_config = {'defer_build': True}
\ No newline at end of file
@@ -1,8 +1,9 @@
 from uuid import UUID
-from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
+
 class Pagination(BaseModel):
     page: int | None = 1
     limit: int = 20
@@ -10,14 +11,20 @@ class Pagination(BaseModel):
     has_more: bool = Field(True, alias='hasMore')
     next_cursor: UUID | None = Field(None, alias='nextCursor')
 
+    model_config = {'defer_build': True}
+
 
 class PostsPagintaion(BaseModel):
     limit: int = 20
     next_cursor: int | None = Field(1, alias='nextCursor')
     has_more: bool = Field(True, alias='hasMore')
 
+    model_config = {'defer_build': True}
+
 
 class LikedPostsPagintaion(BaseModel):
     limit: int = 20
-    next_cursor: datetime | None = Field(None, alias='nextCursor')
+    next_cursor: Timestamp | None = Field(None, alias='nextCursor')
     has_more: bool = Field(True, alias='hasMore')
+
+    model_config = {'defer_build': True}
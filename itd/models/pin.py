@@ -1,12 +1,16 @@
-from datetime import datetime
-
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
+
 class ShortPin(BaseModel):
     slug: str
     name: str
     description: str
 
+    model_config = {'defer_build': True}
+
+    __identity_key__ = 'slug'  # см. itd.identity
+
 
 class Pin(ShortPin):
-    granted_at: datetime = Field(alias='grantedAt')
\ No newline at end of file
+    granted_at: Timestamp = Field(alias='grantedAt')
\ No newline at end of file
@@ -1,14 +1,16 @@
 from uuid import UUID
-from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
 from itd.enums import ReportTargetType, ReportTargetReason
 
 
 class NewReport(BaseModel):
     id: UUID
-    created_at: datetime = Field(alias='createdAt')
+    created_at: Timestamp = Field(alias='createdAt')
+
+    model_config = {'defer_build': True}
 
 
 class Report(NewReport):
@@ -1,8 +1,8 @@
 from uuid import UUID
-from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
 from itd.models.pin import ShortPin
 
 
@@ -10,7 +10,7 @@ class UserPrivacy(BaseModel):
     private: bool | None = Field(None, alias='isPrivate') # none for not me
     wall_closed: bool = Field(False, alias='wallClosed')
 
-    model_config = {'populate_by_name': True}
+    model_config = {'populate_by_name': True, 'defer_build': True}
 
 
 class UserProfileUpdate(BaseModel):
@@ -19,7 +19,9 @@ class UserProfileUpdate(BaseModel):
     display_name: str = Field(alias='displayName')
     bio: str | None = None
 
-    updated_at: datetime | None = Field(None, alias='updatedAt')
+    updated_at: Timestamp | None = Field(None, alias='updatedAt')
+
+    model_config = {'defer_build': True}
 
 
 class UserNewPost(BaseModel):
@@ -30,10 +32,14 @@ class UserNewPost(BaseModel):
 
     verified: bool = False
 
+    model_config = {'defer_build': True}
+
 
 class UserNotification(UserNewPost):
     id: UUID
 
+    __identity_key__ = 'id'  # см. itd.identity
+
 
 class UserPost(UserNotification, UserNewPost):
     pass
@@ -61,4 +67,4 @@ class User(UserSearch, UserPrivacy):
 
     is_followed: bool | None = Field(None, alias='isFollowedBy') # none for me
 
-    created_at: datetime = Field(alias='createdAt')
+    created_at: Timestamp = Field(alias='createdAt')
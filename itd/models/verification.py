@@ -1,8 +1,9 @@
 from uuid import UUID
-from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from itd.models._datetime import Timestamp
+
 class Verification(BaseModel):
     id: UUID
     user_id: UUID = Field(alias='userId')
@@ -11,13 +12,17 @@ class Verification(BaseModel):
 
     reject_reason: str | None = Field(None, alias='rejectionReason')
     reviewer: str | None = Field(None, alias='reviewedBy')
-    reviewed_at: datetime | None = Field(None, alias='reviewedAt')
+    reviewed_at: Timestamp | None = Field(None, alias='reviewedAt')
+
+    created_at: Timestamp = Field(alias='createdAt')
+    updated_at: Timestamp = Field(alias='updatedAt')
 
-    created_at: datetime = Field(alias='createdAt')
-    updated_at: datetime = Field(alias='updatedAt')
+    model_config = {'defer_build': True}
 
 
 class VerificationStatus(BaseModel):
     status: str # should be enum, but we dont know all statuses (what status for accepted?)
     request_id: UUID = Field(alias='requestId')
-    submitted_at: datetime = Field(alias='submittedAt')
\ No newline at end of file
+    submitted_at: Timestamp = Field(alias='submittedAt')
+
+    model_config = {'defer_build': True}
\ No newline at end of file
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Generic, Hashable, TypeVar
+
+from itd.async_client import AsyncClient
+from itd.async_request import AsyncTransport, httpx
+from itd.models.event import StreamNotification
+
+log = logging.getLogger(__name__)
+
+K = TypeVar('K', bound=Hashable)
+
+_STOP = object()
+
+
+class NotificationMultiplexer(Generic[K]):
+    """SSE уведомления многих аккаунтов в одном event loop
+
+    Каждый аккаунт - свой `AsyncClient` (свой токен, обновление по своим cookies, переподключение и догрузка
+    пропущенного как в `stream_notifications`), поток читает отдельная задача asyncio. Уведомления всех аккаунтов
+    попадают в одну ограниченную очередь и отдаются парами `(account, notification)`; события подключения пропускаются.
+    Простаивающее соединение - это задача, ждущая сокет, и буфер парсера: ни потоков, ни опроса.
+
+    Аккаунт, поток которого остановился с ошибкой (например, Unauthorized без cookies), попадает в `errors`,
+    остальные продолжают работать.
+
+    Args:
+        clients (dict[K, AsyncClient] | None, optional): Клиенты по аккаунтам. Defaults to None.
+        max_queue (int, optional): Размер общей очереди; если потребитель не успевает, чтение потоков ждёт. Defaults to 10000.
+        **stream: Аргументы `stream_notifications` (`backfill`, `reconnect`)
+
+    Example:
+        ```python
+        mux = NotificationMultiplexer.from_cookies({'alice': 'refresh_token=...', 'bob': 'refresh_token=...'})
+        async with mux:
+            async for account, notification in mux:
+                print(account, notification.type, notification.actor.username)
+        ```
+    """
+    def __init__(self, clients: dict[K, AsyncClient] | None = None, max_queue: int = 10000, **stream: Any):
+        self.clients: dict[K, AsyncClient] = dict(clients or {})
+        self.errors: dict[K, Exception] = {}
+        self.max_queue = max_queue
+        self.stream = stream
+        self._tasks: dict[K, asyncio.Task] = {}
+        self._queue: asyncio.Queue | None = None
+        self._closed = False
+        self._http: 'httpx.AsyncClient | None' = None  # общий пул, если клиенты созданы в `from_cookies`
+
+    @classmethod
+    def from_cookies(cls, accounts: dict[K, str], max_queue: int = 10000, connect_timeout: float = 20, **stream: Any) -> 'NotificationMultiplexer[K]':
+        """Создать клиентов по cookies аккаунтов с одним общим пулом соединений
+
+        Args:
+            accounts (dict[K, str]): Cookies с refresh_token по аккаунтам
+            max_queue (int, optional): Размер общей очереди. Defaults to 10000.
+            connect_timeout (float, optional): Таймаут подключения в секундах. Defaults to 20.
+            **stream: Аргументы `stream_notifications`
+
+        Returns:
+            NotificationMultiplexer[K]: Мультиплексор, который закроет клиентов и пул в `aclose()`
+        """
+        if httpx is None:
+            raise ImportError('NotificationMultiplexer requires httpx: pip install itd-sdk[async]')
+        # по соединению на поток и запас для обновления токенов и догрузки
+        connections = len(accounts) + 20
+        http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            timeout=httpx.Timeout(20, connect=connect_timeout)
+        )
+        clients = {
+            account: AsyncClient(cookies=cookies, transport=AsyncTransport(connect_timeout=connect_timeout, http=http))
+            for account, cookies in accounts.items()
+        }
+        mux = cls(clients, max_queue, **stream)
+        mux._http = http
+        return mux
+
+    def add(self, account: K, client: AsyncClient) -> None:
+        """Добавить аккаунт (если мультиплексор уже читает, поток аккаунта открывается сразу)"""
+        if account in self.clients:
+            raise ValueError(f'Account {account!r} is already added')
+        self.clients[account] = client
+        if self._queue is not None and not self._closed:
+            self._start(account)
+
+    async def remove(self, account: K) -> AsyncClient:
+        """Закрыть поток аккаунта и убрать его. Возвращает клиента (он не закрывается)"""
+        client = self.clients.pop(account)
+        self.errors.pop(account, None)
+        await self._cancel([account])
+        return client
+
+    def _start(self, account: K) -> None:
+        self._tasks[account] = asyncio.create_task(self._listen(account, self.clients[account]))
+
+    async def _listen(self, account: K, client: AsyncClient) -> None:
+        try:
+            async for event in client.stream_notifications(**self.stream):
+                if getattr(event, 'id', None) is not None:  # у StreamConnect нет id
+                    await self._queue.put((account, event))
+        except Exception as e:
+            self.errors[account] = e
+            log.exception('Поток уведомлений %r остановлен', account)
+        finally:
+            if self._tasks.get(account) is asyncio.current_task():
+                del self._tasks[account]
+
+    async def _cancel(self, accounts: list[K]) -> None:
+        tasks = [task for account in accounts if (task := self._tasks.pop(account, None)) is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aiter__(self) -> AsyncIterator[tuple[K, StreamNotification]]:
+        if self._queue is not None:
+            raise RuntimeError('NotificationMultiplexer can be iterated only once')
+        self._queue = asyncio.Queue(self.max_queue)
+        for account in self.clients:
+            self._start(account)
+        try:
+            while not self._closed:
+                item = await self._queue.get()
+                if item is _STOP or self._closed:
+                    return
+                yield item
+        finally:
+            await self._cancel(list(self._tasks))
+
+    def stop(self) -> None:
+        """Остановить все потоки: перебор закончится на следующем шаге"""
+        self._closed = True
+        for task in self._tasks.values():
+            task.cancel()
+        if self._queue is not None and not self._queue.full():
+            self._queue.put_nowait(_STOP)
+
+    async def aclose(self) -> None:
+        """Остановить потоки; клиентов и пул, созданных в `from_cookies`, закрыть"""
+        self.stop()
+        await self._cancel(list(self._tasks))
+        if self._http is not None:
+            await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+            await self._http.aclose()
+            self._http = None
+
+    async def __aenter__(self) -> 'NotificationMultiplexer[K]':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def __repr__(self) -> str:
+        return f'<NotificationMultiplexer accounts={len(self.clients)} streaming={len(self._tasks)} errors={len(self.errors)}>'
@@ -0,0 +1,153 @@
+from queue import Queue, Full
+from threading import Event, Thread
+from typing import Any, Awaitable, Callable, Generic, Iterator, TypeVar
+
+from itd.cursor import Cursor
+
+T = TypeVar('T')
+C = TypeVar('C')
+
+# Страница: (элементы, курсор следующей страницы или None, если это последняя)
+PageFetcher = Callable[[C], tuple[list[T], C | None]]
+AsyncPageFetcher = Callable[[C], Awaitable[tuple[list[T], C | None]]]
+
+# Загруженная страница: (курсор страницы, сколько элементов пропустить, элементы, курсор следующей)
+RawPage = tuple[Any, int, list, Any]
+
+_DONE = object()
+
+
+def _take(page: RawPage, left: int | None) -> tuple[list, Cursor | None]:
+    """Элементы страницы, которые нужно отдать, и позиция сразу после них (None - список закончился)"""
+    value, skip, items, next_value = page
+    taken = items[skip:] if left is None else items[skip:skip + left]
+    if skip + len(taken) < len(items):
+        return taken, Cursor(value, skip + len(taken))
+    return taken, Cursor(next_value) if items and next_value is not None else None
+
+
+def _pages(fetch_page: PageFetcher, cursor: Cursor, max_items: int | None) -> Iterator[RawPage]:
+    value, skip = cursor.value, cursor.skip
+    fetched = 0
+    while True:
+        items, next_value = fetch_page(value)
+        yield value, skip, items, next_value
+        fetched += max(len(items) - skip, 0)
+        # пустая страница с hasMore - дальше ничего не будет
+        if not items or next_value is None or (max_items is not None and fetched >= max_items):
+            return
+        value, skip = next_value, 0
+
+
+def _prefetched(pages: Iterator[RawPage], depth: int) -> Iterator[RawPage]:
+    """Загружать страницы в фоновом потоке, держа готовыми до `depth` страниц"""
+    queue: Queue = Queue(depth)
+    stop = Event()
+
+    def put(item: tuple) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+
+    Thread(target=produce, name='itd-prefetch', daemon=True).start()
+    try:
+        while True:
+            page, error = queue.get()
+            if error is not None:
+                raise error
+            if page is _DONE:
+                return
+            yield page
+    finally:
+        stop.set()  # потребитель остановился - фоновый поток дальше не грузит
+
+
+class Paginator(Generic[T]):
+    """Итератор по элементам всех страниц, следующие страницы загружаются в фоне
+
+    `cursor` - позиция сразу после последнего отданного элемента (None - список закончился).
+    `str(cursor)` можно сохранить и передать в `iter_*(cursor=...)`, чтобы продолжить с того же места.
+    `pages()` отдаёт страницы целиком вместе с позицией после каждой.
+
+    Args:
+        fetch_page (PageFetcher): Загрузка страницы по курсору
+        start (C | None): Курсор первой страницы (None - с начала)
+        prefetch (int, optional): Сколько страниц загружать заранее (0 - без фоновой загрузки). Defaults to 1.
+        max_items (int | None, optional): Максимум элементов. Defaults to None (все).
+        cursor (Cursor | str | None, optional): Продолжить с сохранённой позиции. Defaults to None (с начала).
+    """
+    def __init__(self, fetch_page: PageFetcher, start: C | None, prefetch: int = 1, max_items: int | None = None, cursor: Cursor | str | None = None):
+        self.cursor: Cursor | None = Cursor.parse(cursor) if cursor is not None else Cursor(start)
+        self._fetch_page = fetch_page
+        self._prefetch = prefetch
+        self._max_items = max_items
+        self._items: Iterator[T] | None = None
+
+    def _chunks(self) -> Iterator[tuple[list[T], Cursor | None, Any, int]]:
+        if self.cursor is None:
+            return
+        pages = _pages(self._fetch_page, self.cursor, self._max_items)
+        if self._prefetch > 0:
+            pages = _prefetched(pages, self._prefetch)
+
+        count = 0
+        try:
+            for page in pages:
+                left = None if self._max_items is None else self._max_items - count
+                taken, after = _take(page, left)
+                count += len(taken)
+                yield taken, after, page[0], page[1]
+                if left is not None and len(taken) >= left:
+                    return
+        finally:
+            pages.close()
+
+    def pages(self) -> Iterator[tuple[list[T], Cursor | None]]:
+        """Перебрать страницы
+
+        Yields:
+            tuple[list[T], Cursor | None]: Элементы страницы и позиция после неё (None - список закончился)
+        """
+        for taken, after, _, _ in self._chunks():
+            self.cursor = after
+            yield taken, after
+
+    def _each(self) -> Iterator[T]:
+        for taken, after, value, skip in self._chunks():
+            end = skip + len(taken)
+            for position, item in enumerate(taken, skip + 1):
+                self.cursor = after if position == end else Cursor(value, position)
+                yield item
+            if not taken:
+                self.cursor = after
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        if self._items is None:
+            self._items = self._each()
+        return next(self._items)
+
+    def close(self) -> None:
+        """Остановить фоновую загрузку страниц"""
+        if self._items is not None:
+            self._items.close()
+
+
+def paginate(fetch_page: PageFetcher, start: C | None, prefetch: int = 1, max_items: int | None = None, cursor: Cursor | str | None = None) -> Paginator:
+    """Перебрать элементы всех страниц, загружая следующие страницы в фоне (см. `Paginator`)"""
+    return Paginator(fetch_page, start, prefetch, max_items, cursor)
@@ -0,0 +1,154 @@
+import time
+from collections import deque
+from threading import Lock
+
+# статические сегменты путей API, всё остальное (UUID, username, хэштэг) - параметр
+_STATIC_SEGMENTS = {
+    'v1', 'auth', 'refresh', 'change-password', 'logout', 'users', 'me', 'privacy', 'pin', 'pins', 'follow',
+    'followers', 'following', 'stats', 'top-clans', 'suggestions', 'who-to-follow', 'platform', 'status',
+    'posts', 'user', 'liked', 'like', 'view', 'repost', 'restore', 'comments', 'replies', 'hashtags', 'trending',
+    'notifications', 'read', 'read-all', 'count', 'stream', 'files', 'upload', 'reports', 'search',
+    'verification', 'submit'
+}
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Ключ эндпоинта для лимитов: `GET users/:id/followers`"""
+    path = url.split('?', 1)[0].strip('/')
+    return method.upper() + ' ' + '/'.join(part if part in _STATIC_SEGMENTS else ':id' for part in path.split('/'))
+
+
+class TokenBucket:
+    """Token bucket одного эндпоинта. Пока лимит не известен (`rate is None`), запросы не ограничиваются"""
+    def __init__(self):
+        self.rate: float | None = None  # токенов в секунду
+        self.capacity = 0.0
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.increased_at = 0.0  # когда скорость последний раз росла (или была урезана)
+        self.sent: deque[float] = deque()  # время отправки запросов в пределах окна
+
+    def refill(self, now: float) -> None:
+        if self.rate is not None and now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = max(self.updated, now)
+
+    def set_rate(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate)  # пачка - не больше секунды запросов
+
+
+class RateLimiter:
+    """Планировщик запросов с лимитами, которые узнаются из ответов `RATE_LIMIT_EXCEEDED` / `Too Many Requests`
+
+    Скорость подбирается как AIMD: после превышения лимита эндпоинт блокируется на retryAfter,
+    а его скорость становится долей `decrease` от скорости, с которой запросы шли последние `window` секунд.
+    Затем каждые `increase_every` секунд без превышения скорость растёт на `increase` запросов в секунду,
+    так что после случайного 429 пропускная способность возвращается к прежней за несколько секунд.
+    Запросы сверх бюджета ждут своей очереди, а не падают.
+
+    Args:
+        decrease (float, optional): Во сколько раз урезать наблюдаемую скорость при превышении лимита. Defaults to 0.5.
+        increase (float, optional): На сколько запросов в секунду поднимать скорость. Defaults to 1.
+        increase_every (float, optional): Как часто поднимать скорость, в секундах. Defaults to 2.
+        window (float, optional): Окно, по которому считается наблюдаемая скорость, в секундах. Defaults to 5.
+        max_retries (int, optional): Сколько раз повторять запрос после превышения лимита. Defaults to 5.
+        min_backoff (float, optional): Пауза, если сервер не прислал retryAfter. Defaults to 1.
+    """
+    def __init__(
+        self, decrease: float = 0.5, increase: float = 1, increase_every: float = 2, window: float = 5,
+        max_retries: int = 5, min_backoff: float = 1
+    ):
+        self.decrease = decrease
+        self.increase = increase
+        self.increase_every = increase_every
+        self.window = window
+        self.max_retries = max_retries
+        self.min_backoff = min_backoff
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = Lock()
+
+    def _bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket()
+        return bucket
+
+    def _increase(self, bucket: TokenBucket, now: float) -> None:
+        steps = int((now - bucket.increased_at) / self.increase_every)
+        if steps > 0:
+            bucket.set_rate(bucket.rate + steps * self.increase)
+            bucket.increased_at += steps * self.increase_every
+
+    def acquire(self, key: str) -> float:
+        """Занять место в очереди эндпоинта
+
+        Returns:
+            float: Сколько секунд подождать перед отправкой запроса
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(key)
+            while bucket.sent and bucket.sent[0] < now - self.window:
+                bucket.sent.popleft()
+
+            if bucket.rate is None:
+                bucket.sent.append(now)
+                return max(0.0, bucket.blocked_until - now)
+
+            self._increase(bucket, now)
+            bucket.refill(now)
+            bucket.tokens -= 1  # токен может уйти в минус - это и есть очередь
+            wait = max(-bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0, bucket.blocked_until - now)
+            bucket.sent.append(now + wait)
+            return wait
+
+    def limited(self, key: str, retry_after: float = 0) -> float:
+        """Сообщить о превышении лимита и пересчитать бюджет эндпоинта
+
+        Args:
+            key (str): Ключ эндпоинта
+            retry_after (float, optional): retryAfter из ответа в секундах. Defaults to 0.
+
+        Returns:
+            float: Сколько секунд подождать перед повтором
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(key)
+            sent = [at for at in bucket.sent if now - self.window <= at <= now]
+            # скорость перед превышением: запросы окна за время от первого из них (не меньше секунды)
+            observed = len(sent) / max(1.0, now - sent[0]) if sent else 1.0
+            if bucket.rate is not None:
+                observed = min(observed, bucket.rate)
+
+            bucket.blocked_until = max(bucket.blocked_until, now + max(retry_after, self.min_backoff))
+            bucket.set_rate(max(observed * self.decrease, 1 / self.window))
+            # после блокировки повторный запрос уходит сразу, дальше - в темпе новой скорости
+            bucket.tokens = 1.0
+            bucket.updated = bucket.increased_at = bucket.blocked_until
+            return bucket.blocked_until - now
+
+    def budget(self) -> dict[str, dict]:
+        """Текущий бюджет по эндпоинтам, для которых известен лимит
+
+        Returns:
+            dict[str, dict]: `{'GET users/:id': {'rate': запросов/сек, 'capacity': ..., 'available': ..., 'blocked_for': сек}}`
+        """
+        with self._lock:
+            now = time.monotonic()
+            result = {}
+            for key, bucket in self._buckets.items():
+                if bucket.rate is None and bucket.blocked_until <= now:
+                    continue
+                if bucket.rate is not None:
+                    self._increase(bucket, now)
+                bucket.refill(now)
+                result[key] = {
+                    'rate': bucket.rate,
+                    'capacity': bucket.capacity,
+                    'available': max(0.0, bucket.tokens),
+                    'blocked_for': max(0.0, bucket.blocked_until - now)
+                }
+            return result
@@ -0,0 +1,185 @@
+"""Компактное хранение больших выгрузок: записи со `__slots__` и таблицы по столбцам
+
+Модель pydantic занимает около килобайта (словарь полей, `UUID`, `datetime`), поэтому миллионы подписчиков
+или постов удобнее держать здесь. Записи - те же поля в слотах, таблицы - столбцы в `array` / `bytearray`
+(UUID по 16 байт, счётчики и флаги в массивах чисел). Обратно в модели - `to_model()` / `table[i]`, без валидации.
+"""
+from array import array
+from datetime import datetime, timezone
+from math import isnan, nan
+from typing import Any, ClassVar, Generic, Iterable, Iterator, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from itd.models.hashtag import Hashtag
+from itd.models.post import PostShort
+from itd.models.user import UserFollower, UserPost
+
+M = TypeVar('M', bound=BaseModel)
+R = TypeVar('R', bound='Record')
+
+
+class Record(Generic[M]):
+    """Запись со `__slots__`: поля модели без словаря экземпляра и валидации
+
+    Вложенные модели из `nested` хранятся своими записями, а не моделями pydantic.
+    """
+    __slots__ = ()
+    model: ClassVar[type]
+    nested: ClassVar[dict[str, 'type[Record]']] = {}
+
+    def __init__(self, *values: Any):
+        for name, value in zip(self.__slots__, values, strict=True):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_model(cls: type[R], model: M) -> R:
+        values = [getattr(model, name) for name in cls.__slots__]
+        if cls.nested:
+            values = [
+                cls.nested[name].from_model(value) if name in cls.nested and value is not None else value
+                for name, value in zip(cls.__slots__, values)
+            ]
+        return cls(*values)
+
+    def to_model(self) -> M:
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        for name in self.nested:
+            if fields[name] is not None:
+                fields[name] = fields[name].to_model()
+        return self.model.model_construct(**fields)
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(' + ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__) + ')'
+
+
+class FollowerRecord(Record[UserFollower]):
+    __slots__ = ('id', 'username', 'display_name', 'avatar', 'pin', 'verified', 'is_following')
+    model = UserFollower
+
+
+class UserRecord(Record[UserPost]):
+    __slots__ = ('id', 'username', 'display_name', 'avatar', 'pin', 'verified')
+    model = UserPost
+
+
+class PostRecord(Record[PostShort]):
+    __slots__ = ('id', 'content', 'created_at', 'author', 'likes_count', 'comments_count', 'reposts_count', 'views_count')
+    model = PostShort
+    nested = {'author': UserRecord}
+
+
+class HashtagRecord(Record[Hashtag]):
+    __slots__ = ('id', 'name', 'posts_count')
+    model = Hashtag
+
+
+class Table(Generic[M]):
+    """Таблица моделей по столбцам
+
+    Типы столбцов: `uuid` - 16 байт в `bytearray`, `int` - `array('q')`, `bool` - байт в `bytearray`,
+    `time` - секунды UTC в `array('d')`, `obj` - список (строки, пины), подкласс `Table` - вложенная модель по столбцам.
+
+    Args:
+        models (Iterable[M], optional): Начальные модели. Defaults to ().
+    """
+    model: ClassVar[type]
+    columns: ClassVar[tuple[tuple[str, 'str | type[Table]'], ...]]
+
+    def __init__(self, models: Iterable[M] = ()):
+        self._data: dict[str, Any] = {name: kind() if isinstance(kind, type) else _COLUMNS[kind]() for name, kind in self.columns}
+        self._size = 0
+        self.extend(models)
+
+    def append(self, model: M) -> None:
+        for name, kind in self.columns:
+            if isinstance(kind, type):
+                self._data[name].append(getattr(model, name))
+            else:
+                _APPEND[kind](self._data[name], getattr(model, name))
+        self._size += 1
+
+    def extend(self, models: Iterable[M]) -> None:
+        for model in models:
+            self.append(model)
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Поля строки по именам модели"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('table index out of range')
+        return {name: self._data[name][index] if isinstance(kind, type) else _READ[kind](self._data[name], index) for name, kind in self.columns}
+
+    def __getitem__(self, index: int) -> M:
+        return self.model.model_construct(**self.row(index))
+
+    def __iter__(self) -> Iterator[M]:
+        for index in range(self._size):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> Any:
+        """Столбец как есть (`array`, `bytearray` или список), например для подсчётов без создания моделей"""
+        return self._data[name]
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} rows={self._size}>'
+
+
+def _append_uuid(column: bytearray, value: UUID) -> None:
+    column += value.bytes
+
+
+def _append_time(column: array, value: datetime | None) -> None:
+    column.append(nan if value is None else value.timestamp())
+
+
+def _read_time(column: array, index: int) -> datetime | None:
+    value = column[index]
+    return None if isnan(value) else datetime.fromtimestamp(value, timezone.utc)
+
+
+_COLUMNS = {'uuid': bytearray, 'int': lambda: array('q'), 'bool': bytearray, 'time': lambda: array('d'), 'obj': list}
+_APPEND = {'uuid': _append_uuid, 'int': array.append, 'bool': bytearray.append, 'time': _append_time, 'obj': list.append}
+_READ = {
+    'uuid': lambda column, index: UUID(bytes=bytes(column[index * 16:index * 16 + 16])),
+    'int': array.__getitem__,
+    'bool': lambda column, index: bool(column[index]),
+    'time': _read_time,
+    'obj': list.__getitem__,
+}
+
+
+class FollowerTable(Table[UserFollower]):
+    model = UserFollower
+    columns = (
+        ('id', 'uuid'), ('username', 'obj'), ('display_name', 'obj'), ('avatar', 'obj'), ('pin', 'obj'),
+        ('verified', 'bool'), ('is_following', 'bool'),
+    )
+
+
+class AuthorTable(Table[UserPost]):
+    model = UserPost
+    columns = (
+        ('id', 'uuid'), ('username', 'obj'), ('display_name', 'obj'), ('avatar', 'obj'), ('pin', 'obj'), ('verified', 'bool'),
+    )
+
+
+class PostTable(Table[PostShort]):
+    model = PostShort
+    columns = (
+        ('id', 'uuid'), ('content', 'obj'), ('created_at', 'time'), ('author', AuthorTable),
+        ('likes_count', 'int'), ('comments_count', 'int'), ('reposts_count', 'int'), ('views_count', 'int'),
+    )
+
+
+class HashtagTable(Table[Hashtag]):
+    model = Hashtag
+    columns = (('id', 'uuid'), ('name', 'obj'), ('posts_count', 'int'))
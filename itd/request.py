@@ -1,16 +1,27 @@
+import socket
+import time
+import warnings
 from _io import BufferedReader
+from threading import Lock, Thread
+from typing import Callable
+from weakref import WeakSet
 
-from requests import Session
-from requests.exceptions import JSONDecodeError
+from requests import Session, Response as RequestsResponse
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
 
-from itd.exceptions import InvalidToken, InvalidCookie, RateLimitExceeded, Unauthorized
+from itd.response import Response, ErrorTable
+from itd.ratelimit import RateLimiter, endpoint_key
+from itd.retry import RetryPolicy
+from itd.cache import ResponseCache, CacheEntry
+from itd.singleflight import SingleFlight, request_key
+from itd.exceptions import RateLimitExceeded
 
-s = Session()
+BASE_URL = 'https://xn--d1ah4a.com/api/'
 
 
-def fetch(token: str, method: str, url: str, params: dict = {}, files: dict[str, tuple[str, BufferedReader]] = {}):
-    base = f'https://xn--d1ah4a.com/api/{url}'
-    headers = {
+def api_headers(token: str) -> dict[str, str]:
+    return {
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3",
         "Accept-Encoding": "gzip, deflate, br, zstd",
@@ -26,43 +37,17 @@ def fetch(token: str, method: str, url: str, params: dict = {}, files: dict[str,
         "Cache-Control": "no-cache",
         "TE": "trailers"
     }
-    method = method.lower()
-    if method == "get":
-        res = s.get(base, timeout=120 if files else 20, params=params, headers=headers)
-    else:
-        res = s.request(method.upper(), base, timeout=120 if files else 20, json=params, headers=headers, files=files)
-
-    try:
-        if res.json().get('error') == 'Too Many Requests':
-            raise RateLimitExceeded(0)
-        if res.json().get('error', {}).get('code') == 'RATE_LIMIT_EXCEEDED':
-            raise RateLimitExceeded(res.json()['error'].get('retryAfter', 0))
-        if res.json().get('error', {}).get('code') == 'UNAUTHORIZED':
-            raise Unauthorized()
-    except (JSONDecodeError, AttributeError):
-        pass # todo
-
-    if not res.ok:
-        print(res.text)
-    return res
 
 
-def fetch_stream(token: str, url: str):
-    """Fetch для SSE streaming запросов"""
-    base = f'https://xn--d1ah4a.com/api/{url}'
-    headers = {
+def stream_headers(token: str) -> dict[str, str]:
+    return {
         "Accept": "text/event-stream",
         "Authorization": 'Bearer ' + token,
         "Cache-Control": "no-cache"
     }
-    return s.get(base, headers=headers, stream=True, timeout=None)
-
 
-def set_cookies(cookies: str):
-    for cookie in cookies.split('; '):
-        s.cookies.set(cookie.split('=')[0], cookie.split('=')[-1], path='/', domain='xn--d1ah4a.com.com')
 
-def auth_fetch(cookies: str, method: str, url: str, params: dict = {}, token: str | None = None):
+def auth_headers(cookies: str, token: str | None = None) -> dict[str, str]:
     headers = {
         "Host": "xn--d1ah4a.com",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:140.0) Gecko/20100101 Firefox/140.0",
@@ -86,24 +71,294 @@ def auth_fetch(cookies: str, method: str, url: str, params: dict = {}, token: st
     }
     if token:
         headers['Authorization'] = 'Bearer ' + token
+    return headers
+
+
+class Transport:
+    """Транспорт клиента: собственная сессия с пулом соединений, токен и cookies аккаунта
+
+    У каждого клиента свой транспорт, поэтому cookies и заголовки разных аккаунтов не смешиваются.
+    Заголовки собираются заново на каждый запрос, сессия не изменяется после создания,
+    так что один транспорт можно безопасно использовать из нескольких потоков.
+
+    Args:
+        token (str | None, optional): Access token. Defaults to None.
+        cookies (str | None, optional): Cookies с refresh_token. Defaults to None.
+        pool_size (int, optional): Сколько пулов (хостов) держать в кеше. Defaults to 10.
+        max_connections_per_host (int, optional): Максимум соединений в пуле одного хоста. Defaults to 10.
+        pool_block (bool, optional): Ждать свободное соединение, а не открывать лишнее. Defaults to False.
+        keep_alive (bool, optional): Переиспользовать соединения между запросами. Defaults to True.
+        connect_timeout (float, optional): Таймаут подключения в секундах. Defaults to 20.
+        read_timeout (float, optional): Таймаут чтения ответа в секундах. Defaults to 20.
+        upload_timeout (float, optional): Таймаут чтения для загрузки файлов. Defaults to 120.
+        rate_limit (bool, optional): Подстраиваться под лимиты API вместо RateLimitExceeded (см. `RateLimiter`). Defaults to True.
+        retry (RetryPolicy | None, optional): Политика повторов при сетевых ошибках и 5xx. Defaults to RetryPolicy().
+        cache (ResponseCache | None, optional): Кеш ответов GET запросов (см. `ResponseCache`). Defaults to None (без кеша).
+        coalesce (bool, optional): Одновременные одинаковые GET запросы (URL, параметры, токен) отправлять один раз. Defaults to True.
+    """
+    def __init__(
+        self, token: str | None = None, cookies: str | None = None,
+        pool_size: int = 10, max_connections_per_host: int = 10, pool_block: bool = False, keep_alive: bool = True,
+        connect_timeout: float = 20, read_timeout: float = 20, upload_timeout: float = 120, rate_limit: bool = True,
+        retry: RetryPolicy | None = None, cache: ResponseCache | None = None, coalesce: bool = True
+    ):
+        self.token = token
+        self.cookies = cookies
+        self.rate_limiter = RateLimiter() if rate_limit else None
+        self.retry = retry or RetryPolicy()
+        self.cache = cache
+        self._flights = SingleFlight() if coalesce else None
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.upload_timeout = upload_timeout
+        self._streams: WeakSet[RequestsResponse] = WeakSet()  # открытые SSE потоки для close_streams
+
+        self.session = Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=max_connections_per_host, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _headers(self, headers: dict[str, str]) -> dict[str, str]:
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+        return headers
+
+    def _paced(self, method: str, url: str, send: Callable[[], Response], retry: bool = True) -> Response:
+        """Отправить запрос в темпе лимитов эндпоинта, повторяя его после RateLimitExceeded"""
+        if self.rate_limiter is None:
+            return send()
+
+        key = endpoint_key(method, url)
+        attempt = 0
+        while True:
+            wait = self.rate_limiter.acquire(key)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return send()
+            except RateLimitExceeded as e:
+                self.rate_limiter.limited(key, e.retry_after)
+                if not retry or attempt >= self.rate_limiter.max_retries:
+                    raise
+                attempt += 1
+
+    def _send(self, method: str, url: str, send: Callable[[], Response], idempotent: bool | None = None, retry: bool = True) -> Response:
+        """Отправить запрос, повторяя его по политике `self.retry`"""
+        if not retry:
+            return self._paced(method, url, send, retry)
+
+        # превышение лимита повторяет сам RateLimiter, если он включён
+        errors = (ConnectionError, Timeout) if self.rate_limiter is not None else (ConnectionError, Timeout, RateLimitExceeded)
+        attempt = 0
+        while True:
+            try:
+                res = self._paced(method, url, send)
+            except errors as e:
+                delay = self.retry.next_delay(attempt, method, idempotent, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry.next_delay(attempt, method, idempotent, response=res)
+                if delay is None:
+                    return res
+                res.close()  # ответ с `stream=True` иначе держит соединение до сборки мусора
+            attempt += 1
+            time.sleep(delay)
+
+    def request(
+        self, token: str, method: str, url: str, params: dict = {}, files: dict[str, tuple[str, BufferedReader]] = {},
+        errors: ErrorTable = {}, idempotent: bool | None = None, headers: dict[str, str] = {}, stream: bool = False
+    ) -> Response:
+        """Запрос к API с явным токеном. Выбрасывает ошибки API, но не проверяет HTTP статус
+
+        С `stream=True` тело успешного ответа не читается, его отдаёт `Response.iter_bytes`.
+        """
+        headers = self._headers(api_headers(token) | headers)
+        timeout = (self.connect_timeout, self.upload_timeout if files else self.read_timeout)
+        method = method.lower()
+
+        def send() -> Response:
+            if method == "get":
+                res = Response(self.session.get(BASE_URL + url, timeout=timeout, params=params, headers=headers, stream=stream))
+            else:
+                res = Response(self.session.request(method.upper(), BASE_URL + url, timeout=timeout, json=params, headers=headers, files=files))
+            if not stream or not res.ok:
+                res.raise_for_error(errors)
+            return res
+
+        # файл уже прочитан при первой отправке, поэтому загрузку не повторяем
+        return self._send(method, url, send, idempotent, retry=not files)
+
+    def auth_request(self, cookies: str, method: str, url: str, params: dict = {}, token: str | None = None, errors: ErrorTable = {}) -> Response:
+        """Запрос к auth API с явными cookies"""
+        headers = self._headers(auth_headers(cookies, token))
+        timeout = (self.connect_timeout, self.read_timeout)
+
+        def send() -> Response:
+            if method == 'get':
+                res = Response(self.session.get(BASE_URL + url, timeout=timeout, params=params, headers=headers))
+            else:
+                res = Response(self.session.request(method, BASE_URL + url, timeout=timeout, json=params, headers=headers))
+            res.raise_for_error(errors, auth=True)
+            return res
+
+        return self._send(method, url, send)
+
+    def _revalidate(self, key: tuple, entry: CacheEntry | None, url: str, params: dict, errors: ErrorTable, ttl: float) -> Response:
+        """Запросить ответ для кеша, условным запросом, если у записи есть ETag / Last-Modified"""
+        generation = self.cache.generation
+        res = self.request(self.token or '', 'get', url, params, errors=errors, headers=entry.validators() if entry else {})
+        if res.status_code == 304 and entry is not None:
+            self.cache.refresh(key, ttl)
+            return entry.response
+        res.raise_for_status()
+        self.cache.store(key, url, res, ttl, generation)
+        return res
+
+    def _revalidate_later(self, key: tuple, entry: CacheEntry, url: str, params: dict, errors: ErrorTable, ttl: float) -> None:
+        if not self.cache.begin_revalidation(key):
+            return
 
-    if method == 'get':
-        res = s.get(f'https://xn--d1ah4a.com/api/{url}', timeout=20, params=params, headers=headers)
-    else:
-        res = s.request(method, f'https://xn--d1ah4a.com/api/{url}', timeout=20, json=params, headers=headers)
+        def run() -> None:
+            try:
+                self._revalidate(key, entry, url, params, errors, ttl)
+            except Exception:
+                pass  # устаревшая запись уже отдана, ошибка всплывёт при следующем запросе
+            finally:
+                self.cache.end_revalidation(key)
 
-    if res.text == 'UNAUTHORIZED':
-        raise InvalidToken()
+        Thread(target=run, daemon=True).start()
+
+    def _cached(self, url: str, params: dict, errors: ErrorTable) -> Response | None:
+        ttl = self.cache.ttl_for(url)
+        if not ttl:
+            return None
+        key = self.cache.key(self.token, url, params)
+        entry, fresh, stale = self.cache.lookup(key)
+        if fresh:
+            return entry.response
+        if stale:
+            self._revalidate_later(key, entry, url, params, errors, ttl)
+            return entry.response
+        return self._revalidate(key, entry, url, params, errors, ttl)
+
+    def fetch(
+        self, method: str, url: str, params: dict = {}, files: dict[str, tuple[str, BufferedReader]] = {},
+        errors: ErrorTable = {}, idempotent: bool | None = None, invalidates: tuple[str, ...] = (), stream: bool = False
+    ) -> Response:
+        """Запрос к API от имени клиента
+
+        Args:
+            invalidates (tuple[str, ...], optional): Пути, записи кеша которых устаревают после успешного запроса. Defaults to ().
+            stream (bool, optional): Не читать тело сразу (`Response.iter_bytes`), такие запросы не кешируются и не объединяются. Defaults to False.
+        """
+        if self._flights is not None and method.lower() == 'get' and not stream:
+            key = request_key(method, self.token, url, params)
+            return self._flights.do(key, lambda: self._fetch(method, url, params, files, errors, idempotent, invalidates))
+        return self._fetch(method, url, params, files, errors, idempotent, invalidates, stream)
+
+    def _fetch(
+        self, method: str, url: str, params: dict, files: dict[str, tuple[str, BufferedReader]],
+        errors: ErrorTable, idempotent: bool | None, invalidates: tuple[str, ...], stream: bool = False
+    ) -> Response:
+        if self.cache is not None and method.lower() == 'get' and not stream:
+            res = self._cached(url, params, errors)
+            if res is not None:
+                return res
+
+        res = self.request(self.token or '', method, url, params, files, errors, idempotent, stream=stream)
+        res.raise_for_status()
+        if self.cache is not None and invalidates:
+            self.cache.invalidate(*invalidates)
+        return res
+
+    def auth_fetch(self, method: str, url: str, params: dict = {}, with_token: bool = False, errors: ErrorTable = {}) -> Response:
+        res = self.auth_request(self.cookies or '', method, url, params, self.token if with_token else None, errors)
+        res.raise_for_status()
+        return res
+
+    def fetch_stream(self, url: str, token: str | None = None, headers: dict[str, str] | None = None, read_timeout: float | None = None) -> RequestsResponse:
+        """Fetch для SSE streaming запросов
+
+        `read_timeout` - сколько ждать следующих байт потока (None - без ограничения)
+        """
+        res = self.session.get(BASE_URL + url, headers=self._headers(stream_headers(token or self.token or '') | (headers or {})), stream=True, timeout=(self.connect_timeout, read_timeout))
+        self._streams.add(res)
+        return res
+
+    def close_streams(self) -> None:
+        """Сразу оборвать открытые SSE потоки, даже если другой поток ждёт в них данных"""
+        for res in list(self._streams):
+            shutdown(_stream_socket(res))
+        self._streams.clear()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _stream_socket(res: RequestsResponse) -> socket.socket | None:
+    """Сокет потокового ответа (у urllib3 нет публичного доступа к нему)"""
+    sock = getattr(getattr(res.raw, '_connection', None), 'sock', None)
+    if sock is None:
+        fp = getattr(getattr(res.raw, '_fp', None), 'fp', None)
+        sock = getattr(getattr(fp, 'raw', None), '_sock', None)
+    return sock
+
+
+def shutdown(sock: socket.socket | None) -> None:
+    """shutdown, а не close: ожидающий в сокете `recv` сразу получает конец потока"""
+    if sock is None:
+        return
     try:
-        if res.json().get('error') == 'Too Many Requests':
-            raise RateLimitExceeded(0)
-        if res.json().get('error', {}).get('code') == 'RATE_LIMIT_EXCEEDED':
-            raise RateLimitExceeded(res.json()['error'].get('retryAfter', 0))
-        if res.json().get('error', {}).get('code') in ('SESSION_NOT_FOUND', 'REFRESH_TOKEN_MISSING', 'SESSION_REVOKED', 'SESSION_EXPIRED'):
-            raise InvalidCookie(res.json()['error']['code'])
-        if res.json().get('error', {}).get('code') == 'UNAUTHORIZED':
-            raise Unauthorized()
-    except JSONDecodeError:
-        print('fail to parse json')
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass  # уже закрыт
+
 
+_default: Transport | None = None
+_default_lock = Lock()
+
+
+def _default_transport() -> Transport:
+    """Транспорт для функций ниже, создаётся при первом вызове (кастомные запросы с явным токеном, поэтому без общих лимитов)"""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = Transport(rate_limit=False, retry=RetryPolicy(retries=0))
+    return _default
+
+
+def __getattr__(name: str):
+    if name == 's':
+        warnings.warn(
+            'itd.request.s is deprecated: use Transport().session or pass transport= to Client',
+            DeprecationWarning, stacklevel=2
+        )
+        return _default_transport().session
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def fetch(token: str, method: str, url: str, params: dict = {}, files: dict[str, tuple[str, BufferedReader]] = {}, errors: ErrorTable = {}) -> Response:
+    res = _default_transport().request(token, method, url, params, files, errors)
+    if not res.ok:
+        print(res.text)
     return res
+
+
+def fetch_stream(token: str, url: str) -> RequestsResponse:
+    """Fetch для SSE streaming запросов"""
+    return _default_transport().fetch_stream(url, token)
+
+
+def set_cookies(cookies: str):
+    """Устарело: cookies передаются в заголовке каждого запроса (`auth_fetch(cookies, ...)`, `Client(cookies=...)`),
+    общая сессия больше не меняется"""
+    warnings.warn(
+        'set_cookies is deprecated and does nothing: pass cookies to auth_fetch or Client(cookies=...)',
+        DeprecationWarning, stacklevel=2
+    )
+
+def auth_fetch(cookies: str, method: str, url: str, params: dict = {}, token: str | None = None, errors: ErrorTable = {}) -> Response:
+    return _default_transport().auth_request(cookies, method, url, params, token, errors)
@@ -0,0 +1,154 @@
+import json
+from typing import Any, AsyncIterator, Iterator, Union
+
+from itd.exceptions import InvalidToken, InvalidCookie, RateLimitExceeded, Unauthorized, ValidationError
+
+# Таблица ошибок роута: ключ -> исключение, первое совпадение выбрасывается.
+# Ключ: str - код ошибки (`error.code`), int - HTTP статус,
+# tuple - все части должны совпасть (int - статус, str - код или подстрока сообщения)
+ErrorTable = dict[Union[str, int, tuple[Union[str, int], ...]], Union[Exception, type[Exception]]]
+
+SESSION_ERRORS = ('SESSION_NOT_FOUND', 'REFRESH_TOKEN_MISSING', 'SESSION_REVOKED', 'SESSION_EXPIRED')
+
+_NOT_DECODED = object()
+
+
+class Response:
+    """Ответ API. Тело декодируется из JSON не больше одного раза
+
+    Оборачивает `requests.Response` или `httpx.Response` с одинаковым интерфейсом.
+    """
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.status_code: int = raw.status_code
+        self.headers = raw.headers
+        self._json = _NOT_DECODED
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def content(self) -> bytes:
+        return self.raw.content
+
+    @property
+    def text(self) -> str:
+        return self.raw.text
+
+    def json(self) -> Any:
+        if self._json is _NOT_DECODED:
+            try:
+                self._json = json.loads(self.content)
+            except ValueError as e:
+                self._json = e
+        if isinstance(self._json, ValueError):
+            raise self._json
+        return self._json
+
+    @property
+    def decoded(self) -> bool:
+        """JSON тело уже декодировано (`json()`)"""
+        return self._json is not _NOT_DECODED
+
+    def parse(self, adapter: Any, context: dict | None = None) -> Any:
+        """Провалидировать тело pydantic `TypeAdapter`-ом (или `SchemaValidator`)
+
+        Если JSON ещё не декодирован, валидация идёт прямо из байтов (`validate_json`), без промежуточных dict.
+        """
+        if self._json is _NOT_DECODED:
+            return adapter.validate_json(self.content, context=context)
+        return adapter.validate_python(self.json(), context=context)
+
+    def iter_bytes(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Тело кусками по мере загрузки (запрос отправлен с `stream=True`)"""
+        return self.raw.iter_content(chunk_size)
+
+    def aiter_bytes(self, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """`iter_bytes` для httpx"""
+        return self.raw.aiter_bytes(chunk_size)
+
+    def close(self) -> None:
+        self.raw.close()
+
+    async def aclose(self) -> None:
+        await self.raw.aclose()
+
+    @property
+    def data(self) -> dict:
+        """JSON тело, если это объект, иначе пустой dict"""
+        try:
+            data = self.json()
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @property
+    def error(self) -> dict:
+        error = self.data.get('error')
+        return error if isinstance(error, dict) else {}
+
+    @property
+    def error_code(self) -> str | None:
+        return self.error.get('code')
+
+    @property
+    def message(self) -> str:
+        return self.error.get('message') or self.data.get('message') or ''
+
+    @property
+    def retry_after(self) -> int:
+        """Значение заголовка Retry-After в секундах (0, если его нет)"""
+        try:
+            return int(self.headers.get('Retry-After', 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def raise_for_status(self) -> None:
+        self.raw.raise_for_status()
+
+    def _matches(self, key: str | int | tuple) -> bool:
+        if isinstance(key, int):
+            return self.status_code == key
+        if isinstance(key, str):
+            return self.error_code == key
+        return all(
+            self.status_code == part if isinstance(part, int)
+            else self.error_code == part or part in self.message or part in self.text
+            for part in key
+        )
+
+    def raise_for_error(self, errors: ErrorTable = {}, auth: bool = False) -> None:
+        """Выбросить исключение по коду ошибки: сначала общие ошибки, затем таблица роута
+
+        Args:
+            errors (ErrorTable, optional): Таблица ошибок роута. Defaults to {}.
+            auth (bool, optional): Запрос к auth эндпоинту (ошибки сессии). Defaults to False.
+        """
+        if auth and self.text == 'UNAUTHORIZED':
+            raise InvalidToken()
+
+        if self.ok and b'"error"' not in self.content:
+            return  # тело успешного ответа не декодируем - его разберёт `parse`
+
+        data = self.data
+        code = self.error_code
+        if code == 'RATE_LIMIT_EXCEEDED':
+            raise RateLimitExceeded(self.error.get('retryAfter', 0))
+        if data.get('error') == 'Too Many Requests' or self.status_code == 429:
+            raise RateLimitExceeded(self.retry_after)
+        if auth and code in SESSION_ERRORS:
+            raise InvalidCookie(code)
+        if code == 'UNAUTHORIZED':
+            raise Unauthorized()
+
+        for key, exc in errors.items():
+            if self._matches(key):
+                raise exc
+
+        if self.status_code == 422 and isinstance(data.get('found'), dict) and data['found']:
+            # property - путь к невалидному полю (/description), found - всё тело запроса
+            name = str(data.get('property') or '').lstrip('/')
+            if name in data['found']:
+                raise ValidationError(name, data['found'][name])
+            raise ValidationError(*list(data['found'].items())[0])
@@ -0,0 +1,59 @@
+import random
+
+from itd.exceptions import RateLimitExceeded
+from itd.response import Response
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+class RetryPolicy:
+    """Политика повторов при сетевых ошибках и 5xx: экспоненциальная задержка с jitter
+
+    Повторяются только идемпотентные запросы (GET, PUT, DELETE и роуты, помеченные `idempotent=True`,
+    например просмотр поста). POST повторяется только с `retry_all_methods=True`.
+    RateLimitExceeded (если лимиты не обрабатывает `RateLimiter`) повторяется для любых методов:
+    запрос сервером не выполнен. Задержка не меньше retryAfter / Retry-After из ответа.
+
+    Args:
+        retries (int, optional): Сколько раз повторять запрос (0 - не повторять). Defaults to 3.
+        backoff (float, optional): Базовая задержка в секундах, удваивается с каждой попыткой. Defaults to 0.5.
+        max_backoff (float, optional): Максимальная задержка в секундах. Defaults to 30.
+        statuses (tuple[int, ...], optional): HTTP статусы, после которых запрос повторяется. Defaults to (500, 502, 503, 504).
+        retry_all_methods (bool, optional): Повторять и неидемпотентные запросы. Defaults to False.
+    """
+    def __init__(
+        self, retries: int = 3, backoff: float = 0.5, max_backoff: float = 30,
+        statuses: tuple[int, ...] = (500, 502, 503, 504), retry_all_methods: bool = False
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.retry_all_methods = retry_all_methods
+
+    def allows(self, method: str, idempotent: bool | None = None) -> bool:
+        if idempotent is not None:
+            return idempotent or self.retry_all_methods
+        return self.retry_all_methods or method.upper() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, retry_after: float = 0) -> float:
+        """Задержка перед повтором номер `attempt` (с нуля): full jitter, но не меньше retry_after"""
+        return max(retry_after, random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+
+    def next_delay(self, attempt: int, method: str, idempotent: bool | None = None, error: Exception | None = None, response: Response | None = None) -> float | None:
+        """Решить, повторять ли запрос после ошибки или ответа
+
+        Returns:
+            float | None: Задержка в секундах или None, если повторять не нужно
+        """
+        if attempt >= self.retries:
+            return None
+        if isinstance(error, RateLimitExceeded):
+            return self.delay(attempt, error.retry_after)
+        if not self.allows(method, idempotent):
+            return None
+        if error is not None:
+            return self.delay(attempt)
+        if response is not None and response.status_code in self.statuses:
+            return self.delay(attempt, response.retry_after)
+        return None
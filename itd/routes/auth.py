@@ -1,12 +1,16 @@
-from requests import Response
+from itd.response import Response
 
-from itd.request import auth_fetch
+from itd.request import Transport
+from itd.exceptions import SamePassword, InvalidOldPassword
 
-def refresh_token(cookies: str) -> Response:
-    return auth_fetch(cookies, 'post', 'v1/auth/refresh')
+def refresh_token(transport: Transport) -> Response:
+    return transport.auth_fetch('post', 'v1/auth/refresh')
 
-def change_password(cookies: str, token: str, old: str, new: str) -> Response:
-    return auth_fetch(cookies, 'post', 'v1/auth/change-password', {'newPassword': new, 'oldPassword': old}, token)
+def change_password(transport: Transport, old: str, new: str) -> Response:
+    return transport.auth_fetch('post', 'v1/auth/change-password', {'newPassword': new, 'oldPassword': old}, with_token=True, errors={
+        'SAME_PASSWORD': SamePassword,
+        'INVALID_OLD_PASSWORD': InvalidOldPassword
+    })
 
-def logout(cookies: str) -> Response:
-    return auth_fetch(cookies, 'post', 'v1/auth/logout')
+def logout(transport: Transport) -> Response:
+    return transport.auth_fetch('post', 'v1/auth/logout')
@@ -1,24 +1,29 @@
 from uuid import UUID
 
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import NotFound, NoContent, Forbidden, AlreadyLiked
 
-def add_comment(token: str, post_id: UUID, content: str, attachment_ids: list[UUID] = []):
-    return fetch(token, 'post', f'posts/{post_id}/comments', {'content': content, "attachmentIds": list(map(str, attachment_ids))})
+def add_comment(transport: Transport, post_id: UUID, content: str, attachment_ids: list[UUID] = []):
+    return transport.fetch('post', f'posts/{post_id}/comments', {'content': content, "attachmentIds": list(map(str, attachment_ids))}, errors={'NOT_FOUND': NotFound('Post')}, invalidates=(f'posts/{post_id}',))
 
-def add_reply_comment(token: str, comment_id: UUID, content: str, author_id: UUID, attachment_ids: list[UUID] = []):
-    return fetch(token, 'post', f'comments/{comment_id}/replies', {'content': content, 'replyToUserId': str(author_id), "attachmentIds": list(map(str, attachment_ids))})
+def add_reply_comment(transport: Transport, comment_id: UUID, content: str, author_id: UUID, attachment_ids: list[UUID] = []):
+    return transport.fetch('post', f'comments/{comment_id}/replies', {'content': content, 'replyToUserId': str(author_id), "attachmentIds": list(map(str, attachment_ids))}, errors={
+        (500, 'Failed query'): NotFound('User'),
+        'VALIDATION_ERROR': NoContent,
+        'NOT_FOUND': NotFound('Comment')
+    })
 
-def get_comments(token: str, post_id: UUID, limit: int = 20, cursor: int = 0, sort: str = 'popular'):
-    return fetch(token, 'get', f'posts/{post_id}/comments', {'limit': limit, 'sort': sort, 'cursor': cursor})
+def get_comments(transport: Transport, post_id: UUID, limit: int = 20, cursor: int = 0, sort: str = 'popular'):
+    return transport.fetch('get', f'posts/{post_id}/comments', {'limit': limit, 'sort': sort, 'cursor': cursor}, errors={'NOT_FOUND': NotFound('Post')})
 
-def like_comment(token: str, comment_id: UUID):
-    return fetch(token, 'post', f'comments/{comment_id}/like')
+def like_comment(transport: Transport, comment_id: UUID):
+    return transport.fetch('post', f'comments/{comment_id}/like', errors={'NOT_FOUND': NotFound('Comment'), 'CONFLICT': AlreadyLiked('Comment')})
 
-def unlike_comment(token: str, comment_id: UUID):
-    return fetch(token, 'delete', f'comments/{comment_id}/like')
+def unlike_comment(transport: Transport, comment_id: UUID):
+    return transport.fetch('delete', f'comments/{comment_id}/like', errors={'NOT_FOUND': NotFound('Comment')})
 
-def delete_comment(token: str, comment_id: UUID):
-    return fetch(token, 'delete', f'comments/{comment_id}')
+def delete_comment(transport: Transport, comment_id: UUID):
+    return transport.fetch('delete', f'comments/{comment_id}', errors={'NOT_FOUND': NotFound('Comment'), 'FORBIDDEN': Forbidden('delete comment')})
 
-def get_replies(token: str, comment_id: UUID, page: int = 1, limit: int = 50, sort: str = 'oldest'):
-    return fetch(token, 'get', f'comments/{comment_id}/replies', {'page': page, 'limit': limit, 'sort': sort})
+def get_replies(transport: Transport, comment_id: UUID, page: int = 1, limit: int = 50, sort: str = 'oldest', stream: bool = False):
+    return transport.fetch('get', f'comments/{comment_id}/replies', {'page': page, 'limit': limit, 'sort': sort}, errors={'NOT_FOUND': NotFound('Comment')}, stream=stream)
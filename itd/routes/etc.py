@@ -1,10 +1,10 @@
-from itd.request import fetch
+from itd.request import Transport
 
-def get_top_clans(token: str):
-    return fetch(token, 'get', 'users/stats/top-clans')
+def get_top_clans(transport: Transport):
+    return transport.fetch('get', 'users/stats/top-clans')
 
-def get_who_to_follow(token: str):
-    return fetch(token, 'get', 'users/suggestions/who-to-follow')
+def get_who_to_follow(transport: Transport):
+    return transport.fetch('get', 'users/suggestions/who-to-follow')
 
-def get_platform_status(token: str):
-    return fetch(token, 'get', 'platform/status')
\ No newline at end of file
+def get_platform_status(transport: Transport):
+    return transport.fetch('get', 'platform/status')
\ No newline at end of file
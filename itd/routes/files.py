@@ -1,14 +1,15 @@
 from _io import BufferedReader
 from uuid import UUID
 
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import NotFound, NotFoundOrForbidden
 
 
-def upload_file(token: str, name: str, data: BufferedReader):
-    return fetch(token, 'post', 'files/upload', files={'file': (name, data)})
+def upload_file(transport: Transport, name: str, data: BufferedReader):
+    return transport.fetch('post', 'files/upload', files={'file': (name, data)})
 
-def get_file(token: str, id: UUID):
-    return fetch(token, 'get', f'files/{id}')
+def get_file(transport: Transport, id: UUID):
+    return transport.fetch('get', f'files/{id}', errors={'NOT_FOUND': NotFoundOrForbidden('File')})
 
-def delete_file(token: str, id: UUID):
-    return fetch(token, 'delete', f'files/{id}')
\ No newline at end of file
+def delete_file(transport: Transport, id: UUID):
+    return transport.fetch('delete', f'files/{id}', errors={'NOT_FOUND': NotFound('File')})
\ No newline at end of file
@@ -1,23 +1,28 @@
 from uuid import UUID
 
-from itd.request import fetch, fetch_stream
+from itd.request import Transport
 
-def get_notifications(token: str, limit: int = 20, offset: int = 0):
-    return fetch(token, 'get', 'notifications', {'limit': limit, 'offset': offset})
+def get_notifications(transport: Transport, limit: int = 20, offset: int = 0, stream: bool = False):
+    return transport.fetch('get', 'notifications', {'limit': limit, 'offset': offset}, stream=stream)
 
-def mark_as_read(token: str, id: UUID):
-    return fetch(token, 'post', f'notifications/{id}/read')
+def mark_as_read(transport: Transport, id: UUID):
+    return transport.fetch('post', f'notifications/{id}/read')
 
-def mark_all_as_read(token: str):
-    return fetch(token, 'post', f'notifications/read-all')
+def mark_all_as_read(transport: Transport):
+    return transport.fetch('post', f'notifications/read-all')
 
-def get_unread_notifications_count(token: str):
-    return fetch(token, 'get', 'notifications/count')
+def get_unread_notifications_count(transport: Transport):
+    return transport.fetch('get', 'notifications/count')
 
-def stream_notifications(token: str):
+def stream_notifications(transport: Transport, last_event_id: str | None = None, read_timeout: float | None = None):
     """Получить SSE поток уведомлений
-    
+
+    Args:
+        last_event_id (str | None, optional): `id` последнего полученного события, чтобы сервер продолжил с него. Defaults to None.
+        read_timeout (float | None, optional): Сколько секунд ждать данных (включая heartbeat), прежде чем считать соединение мёртвым. Defaults to None.
+
     Returns:
         Response: Streaming response для SSE
     """
-    return fetch_stream(token, 'notifications/stream')
\ No newline at end of file
+    headers = {'Last-Event-ID': last_event_id} if last_event_id else None
+    return transport.fetch_stream('notifications/stream', headers=headers, read_timeout=read_timeout)
\ No newline at end of file
@@ -1,10 +1,11 @@
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import PinNotOwned
 
-def get_pins(token: str):
-    return fetch(token, 'get', 'users/me/pins')
+def get_pins(transport: Transport):
+    return transport.fetch('get', 'users/me/pins')
 
-def remove_pin(token: str):
-    return fetch(token, 'delete', 'users/me/pin')
+def remove_pin(transport: Transport):
+    return transport.fetch('delete', 'users/me/pin', invalidates=('users',))
 
-def set_pin(token: str, slug: str):
-    return fetch(token, 'put', 'users/me/pin', {'slug': slug})
\ No newline at end of file
+def set_pin(transport: Transport, slug: str):
+    return transport.fetch('put', 'users/me/pin', {'slug': slug}, errors={'PIN_NOT_OWNED': PinNotOwned(slug)}, invalidates=('users',))
\ No newline at end of file
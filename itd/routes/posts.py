@@ -1,53 +1,58 @@
 from datetime import datetime
 from uuid import UUID
 
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import NotFound, Forbidden, AlreadyReposted, AlreadyLiked, CantRepostYourPost
 from itd.enums import PostsTab
 
-def create_post(token: str, content: str, wall_recipient_id: UUID | None = None, attachment_ids: list[UUID] = []):
+def create_post(transport: Transport, content: str, wall_recipient_id: UUID | None = None, attachment_ids: list[UUID] = []):
     data: dict = {'content': content}
     if wall_recipient_id:
         data['wallRecipientId'] = str(wall_recipient_id)
     if attachment_ids:
         data['attachmentIds'] = list(map(str, attachment_ids))
 
-    return fetch(token, 'post', 'posts', data)
+    return transport.fetch('post', 'posts', data, errors={'NOT_FOUND': NotFound('Wall recipient')})
 
-def get_posts(token: str, cursor: int = 0, tab: PostsTab = PostsTab.POPULAR):
-    return fetch(token, 'get', 'posts', {'cursor': cursor, 'tab': tab.value})
+def get_posts(transport: Transport, cursor: int = 0, tab: PostsTab = PostsTab.POPULAR):
+    return transport.fetch('get', 'posts', {'cursor': cursor, 'tab': tab.value})
 
-def get_post(token: str, id: UUID):
-    return fetch(token, 'get', f'posts/{id}')
+def get_post(transport: Transport, id: UUID):
+    return transport.fetch('get', f'posts/{id}', errors={'NOT_FOUND': NotFound('Post')})
 
-def edit_post(token: str, id: UUID, content: str):
-    return fetch(token, 'put', f'posts/{id}', {'content': content})
+def edit_post(transport: Transport, id: UUID, content: str):
+    return transport.fetch('put', f'posts/{id}', {'content': content}, errors={'NOT_FOUND': NotFound('Post'), 'FORBIDDEN': Forbidden('edit post')}, invalidates=(f'posts/{id}',))
 
-def delete_post(token: str, id: UUID):
-    return fetch(token, 'delete', f'posts/{id}')
+def delete_post(transport: Transport, id: UUID):
+    return transport.fetch('delete', f'posts/{id}', errors={'NOT_FOUND': NotFound('Post'), 'FORBIDDEN': Forbidden('delete post')}, invalidates=(f'posts/{id}',))
 
-def pin_post(token: str, id: UUID):
-    return fetch(token, 'post', f'posts/{id}/pin')
+def pin_post(transport: Transport, id: UUID):
+    return transport.fetch('post', f'posts/{id}/pin', errors={'NOT_FOUND': NotFound('Post'), 'FORBIDDEN': Forbidden('pin post')}, invalidates=(f'posts/{id}', 'users'))
 
-def repost(token: str, id: UUID, content: str | None = None):
+def repost(transport: Transport, id: UUID, content: str | None = None):
     data = {}
     if content:
         data['content'] = content
-    return fetch(token, 'post', f'posts/{id}/repost', data)
+    return transport.fetch('post', f'posts/{id}/repost', data, errors={
+        'NOT_FOUND': NotFound('Post'),
+        'CONFLICT': AlreadyReposted,
+        (422, 'Cannot repost your own post'): CantRepostYourPost
+    }, invalidates=(f'posts/{id}',))
 
-def view_post(token: str, id: UUID):
-    return fetch(token, 'post', f'posts/{id}/view')
+def view_post(transport: Transport, id: UUID):
+    return transport.fetch('post', f'posts/{id}/view', errors={'NOT_FOUND': NotFound('Post')}, idempotent=True)
 
-def get_liked_posts(token: str, username_or_id: str | UUID, limit: int = 20, cursor: datetime | None = None):
-    return fetch(token, 'get', f'posts/user/{username_or_id}/liked', {'limit': limit, 'cursor': cursor})
+def get_liked_posts(transport: Transport, username_or_id: str | UUID, limit: int = 20, cursor: datetime | None = None):
+    return transport.fetch('get', f'posts/user/{username_or_id}/liked', {'limit': limit, 'cursor': cursor}, errors={'NOT_FOUND': NotFound('User')})
 
-def get_user_posts(token: str, username_or_id: str | UUID, limit: int = 20, cursor: datetime | None = None):
-    return fetch(token, 'get', f'posts/user/{username_or_id}', {'limit': limit, 'cursor': cursor})
+def get_user_posts(transport: Transport, username_or_id: str | UUID, limit: int = 20, cursor: datetime | None = None):
+    return transport.fetch('get', f'posts/user/{username_or_id}', {'limit': limit, 'cursor': cursor}, errors={'NOT_FOUND': NotFound('User')})
 
-def restore_post(token: str, post_id: UUID):
-    return fetch(token, "post", f"posts/{post_id}/restore",)
+def restore_post(transport: Transport, post_id: UUID):
+    return transport.fetch("post", f"posts/{post_id}/restore", invalidates=(f'posts/{post_id}',))
 
-def like_post(token: str, post_id: UUID):
-    return fetch(token, "post", f"posts/{post_id}/like")
+def like_post(transport: Transport, post_id: UUID):
+    return transport.fetch("post", f"posts/{post_id}/like", errors={404: NotFound('Post'), 'CONFLICT': AlreadyLiked('Post')}, invalidates=(f'posts/{post_id}',))
 
-def unlike_post(token: str, post_id: UUID):
-    return fetch(token, "delete", f"posts/{post_id}/like")
+def unlike_post(transport: Transport, post_id: UUID):
+    return transport.fetch("delete", f"posts/{post_id}/like", errors={404: NotFound('Post')}, invalidates=(f'posts/{post_id}',))
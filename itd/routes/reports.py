@@ -1,9 +1,13 @@
 from uuid import UUID
 
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import NotFound, AlreadyReported
 from itd.enums import ReportTargetReason, ReportTargetType
 
-def report(token: str, id: UUID, type: ReportTargetType = ReportTargetType.POST, reason: ReportTargetReason = ReportTargetReason.OTHER, description: str | None = None):
+def report(transport: Transport, id: UUID, type: ReportTargetType = ReportTargetType.POST, reason: ReportTargetReason = ReportTargetReason.OTHER, description: str | None = None):
     if description is None:
         description = ''
-    return fetch(token, 'post', 'reports', {'targetId': str(id), 'targetType': type.value, 'reason': reason.value, 'description': description})
\ No newline at end of file
+    return transport.fetch('post', 'reports', {'targetId': str(id), 'targetType': type.value, 'reason': reason.value, 'description': description}, errors={
+        ('VALIDATION_ERROR', 'не найден'): NotFound(type.value.title()),
+        ('VALIDATION_ERROR', 'Вы уже отправляли жалобу'): AlreadyReported(type.value.title())
+    })
\ No newline at end of file
@@ -1,4 +1,5 @@
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import TooLarge
 
-def search(token: str, query: str, user_limit: int = 5, hashtag_limit: int = 5):
-    return fetch(token, 'get', 'search', {'userLimit': user_limit, 'hashtagLimit': hashtag_limit, 'q': query})
\ No newline at end of file
+def search(transport: Transport, query: str, user_limit: int = 5, hashtag_limit: int = 5):
+    return transport.fetch('get', 'search', {'userLimit': user_limit, 'hashtagLimit': hashtag_limit, 'q': query}, errors={414: TooLarge})
\ No newline at end of file
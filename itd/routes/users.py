@@ -1,12 +1,13 @@
 from uuid import UUID
 
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import NotFound, UserBanned, UsernameTaken, AlreadyFollowing, CantFollowYourself
 
 
-def get_user(token: str, username: str):
-    return fetch(token, 'get', f'users/{username}')
+def get_user(transport: Transport, username: str):
+    return transport.fetch('get', f'users/{username}', errors={'NOT_FOUND': NotFound('User'), 'USER_BLOCKED': UserBanned})
 
-def update_profile(token: str, bio: str | None = None, display_name: str | None = None, username: str | None = None, banner_id: UUID | None = None):
+def update_profile(transport: Transport, bio: str | None = None, display_name: str | None = None, username: str | None = None, banner_id: UUID | None = None):
     data = {}
     if bio:
         data['bio'] = bio
@@ -16,25 +17,29 @@ def update_profile(token: str, bio: str | None = None, display_name: str | None
         data['username'] = username
     if banner_id:
         data['bannerId'] = str(banner_id)
-    return fetch(token, 'put', 'users/me', data)
+    return transport.fetch('put', 'users/me', data, errors={'USERNAME_TAKEN': UsernameTaken}, invalidates=('users',))
 
-def update_privacy(token: str, wall_closed: bool = False, private: bool = False):
+def update_privacy(transport: Transport, wall_closed: bool = False, private: bool = False):
     data = {}
     if wall_closed is not None:
         data['wallClosed'] = wall_closed
     if private is not None:
         data['isPrivate'] = private
-    return fetch(token, 'put', 'users/me/privacy', data)
+    return transport.fetch('put', 'users/me/privacy', data, invalidates=('users',))
 
-def follow(token: str, username: str):
-    return fetch(token, 'post', f'users/{username}/follow')
+def follow(transport: Transport, username: str):
+    return transport.fetch('post', f'users/{username}/follow', errors={
+        'NOT_FOUND': NotFound('User'),
+        'CONFLICT': AlreadyFollowing,
+        ('VALIDATION_ERROR', 400): CantFollowYourself
+    }, invalidates=(f'users/{username}', 'users/me'))
 
-def unfollow(token: str, username: str):
-    return fetch(token, 'delete', f'users/{username}/follow')
+def unfollow(transport: Transport, username: str):
+    return transport.fetch('delete', f'users/{username}/follow', errors={'NOT_FOUND': NotFound('User')}, invalidates=(f'users/{username}', 'users/me'))
 
-def get_followers(token: str, username: str, limit: int = 30, page: int = 1):
-    return fetch(token, 'get', f'users/{username}/followers', {'limit': limit, 'page': page})
+def get_followers(transport: Transport, username: str, limit: int = 30, page: int = 1, stream: bool = False):
+    return transport.fetch('get', f'users/{username}/followers', {'limit': limit, 'page': page}, errors={'NOT_FOUND': NotFound('User')}, stream=stream)
 
-def get_following(token: str, username: str, limit: int = 30, page: int = 1):
-    return fetch(token, 'get', f'users/{username}/following', {'limit': limit, 'page': page})
+def get_following(transport: Transport, username: str, limit: int = 30, page: int = 1, stream: bool = False):
+    return transport.fetch('get', f'users/{username}/following', {'limit': limit, 'page': page}, errors={'NOT_FOUND': NotFound('User')}, stream=stream)
 
@@ -1,14 +1,15 @@
 from warnings import deprecated
-from itd.request import fetch
+from itd.request import Transport
+from itd.exceptions import PendingRequestExists
 
-def verify(token: str, file_url: str):
+def verify(transport: Transport, file_url: str):
     # {"success":true,"request":{"id":"fc54e54f-8586-4d8c-809e-df93161f99da","userId":"9096a85b-c319-483e-8940-6921be427ad0","videoUrl":"https://943701f000610900cbe86b72234e451d.bckt.ru/videos/354f28a6-9ac7-48a6-879a-a454062b1d6b.mp4","status":"pending","rejectionReason":null,"reviewedBy":null,"reviewedAt":null,"createdAt":"2026-01-30T12:58:14.228Z","updatedAt":"2026-01-30T12:58:14.228Z"}}
-    return fetch(token, 'post', 'verification/submit', {'videoUrl': file_url})
+    return transport.fetch('post', 'verification/submit', {'videoUrl': file_url}, errors={'PENDING_REQUEST_EXISTS': PendingRequestExists})
 
 @deprecated("verificate устарела используйте verify")
-def verificate(token: str, file_url: str):
-    return verify(token, file_url)
+def verificate(transport: Transport, file_url: str):
+    return verify(transport, file_url)
 
 
-def get_verification_status(token: str):
-    return fetch(token, 'get', 'verification/status')
\ No newline at end of file
+def get_verification_status(transport: Transport):
+    return transport.fetch('get', 'verification/status')
\ No newline at end of file
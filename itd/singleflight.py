@@ -0,0 +1,44 @@
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+def request_key(method: str, token: str | None, url: str, params: dict) -> tuple:
+    """Ключ одинаковых запросов: метод, URL, параметры и токен"""
+    return (method.upper(), token, url, tuple(sorted((k, str(v)) for k, v in params.items() if v is not None)))
+
+
+class SingleFlight:
+    """Объединение одновременных одинаковых вызовов: выполняется один, остальные ждут его результат
+
+    Если вызов упал, все ожидающие получают то же исключение.
+    """
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
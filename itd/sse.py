@@ -0,0 +1,124 @@
+"""Разбор Server-Sent Events прямо из байтов ответа
+
+Поток режется на события по пустой строке, поля `data` / `event` / `id` / `retry` читаются из строк события,
+комментарии (`:` в начале строки, обычно heartbeat) пропускаются. `data` остаётся байтами, чтобы JSON
+валидировался без промежуточной строки и `json.loads`.
+"""
+from collections import OrderedDict
+
+
+class Event:
+    """Событие SSE
+
+    Args:
+        data (bytes): Данные (строки `data:` через перевод строки)
+        event (str): Тип события. Defaults to 'message'.
+        id (str | None): `id` события, если был. Defaults to None.
+    """
+    __slots__ = ('data', 'event', 'id')
+
+    def __init__(self, data: bytes, event: str = 'message', id: str | None = None):
+        self.data = data
+        self.event = event
+        self.id = id
+
+    def __repr__(self) -> str:
+        return f'Event(data={self.data!r}, event={self.event!r}, id={self.id!r})'
+
+
+class SSEParser:
+    """Инкрементальный парсер SSE: куски тела в `feed`, готовые события на выходе
+
+    Attributes:
+        last_event_id (str | None): Последний `id:` из потока (для заголовка `Last-Event-ID` при переподключении)
+        retry (int | None): Последнее значение `retry:` в миллисекундах
+    """
+    def __init__(self):
+        self.last_event_id: str | None = None
+        self.retry: int | None = None
+        self._buffer = bytearray()  # недочитанное событие, дописывается на месте
+        self._scan = 0  # с какого места искать конец события: до него в буфере `\n\n` уже нет
+        self._cr = False  # кусок закончился на \r, следующий может начаться с \n
+
+    def reset(self) -> None:
+        """Новое соединение: недочитанное событие отбрасывается, `last_event_id` и `retry` остаются"""
+        self._buffer.clear()
+        self._scan = 0
+        self._cr = False
+
+    def feed(self, chunk: bytes) -> list['Event']:
+        """Добавить кусок тела. Возвращает события, которые закончились в нём"""
+        if self._cr and chunk[:1] == b'\n':
+            chunk = chunk[1:]
+        self._cr = chunk[-1:] == b'\r'
+        if b'\r' in chunk:
+            chunk = chunk.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+        buffer = self._buffer
+        buffer += chunk
+        events = []
+        start = 0
+        end = buffer.find(b'\n\n', self._scan)
+        if end != -1:
+            with memoryview(buffer) as view:
+                while end != -1:
+                    event = self._event(buffer, view, start, end)
+                    if event is not None:
+                        events.append(event)
+                    start = end + 2
+                    end = buffer.find(b'\n\n', start)
+            del buffer[:start]
+        # последний байт может оказаться первым `\n` разделителя
+        self._scan = max(0, len(buffer) - 1)
+        return events
+
+    def _event(self, buffer: bytearray, view: memoryview, start: int, end: int) -> Event | None:
+        if buffer.startswith(b'data:', start) and buffer.find(b'\n', start, end) == -1:
+            # обычный случай - одна строка data
+            offset = start + 6 if buffer[start + 5:start + 6] == b' ' else start + 5
+            return Event(view[offset:end].tobytes(), id=self.last_event_id)
+
+        data: list[bytes] = []
+        name = 'message'
+        for line in view[start:end].tobytes().split(b'\n'):
+            if not line or line[0] == 0x3A:  # : комментарий
+                continue
+            field, _, value = line.partition(b':')
+            if value[:1] == b' ':
+                value = value[1:]
+            if field == b'data':
+                data.append(value)
+            elif field == b'event':
+                name = value.decode()
+            elif field == b'id':
+                if b'\0' not in value:
+                    self.last_event_id = value.decode()
+            elif field == b'retry':
+                if value.isdigit():
+                    self.retry = int(value)
+        if not data:
+            return None
+        return Event(b'\n'.join(data), name, self.last_event_id)
+
+
+class RecentIds:
+    """Последние id уведомлений, чтобы не отдавать повторы после переподключения и догрузки
+
+    Args:
+        max_size (int, optional): Сколько id помнить. Defaults to 1000.
+    """
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._ids: OrderedDict[str, None] = OrderedDict()
+
+    def add(self, id: str) -> bool:
+        """Запомнить id. Возвращает False, если он уже встречался"""
+        if id in self._ids:
+            return False
+        self._ids[id] = None
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -0,0 +1,42 @@
+import json
+import time
+from base64 import urlsafe_b64decode
+
+# пауза перед повтором неудавшегося фонового обновления токена
+REFRESH_RETRY = 5.0
+
+
+def token_expiry(token: str | None) -> float | None:
+    """Время истечения access token (поле `exp` из JWT)
+
+    Returns:
+        float | None: Unix timestamp или None, если токен не JWT или в нём нет `exp`
+    """
+    if not token:
+        return None
+    try:
+        payload = token.split('.')[1]
+        exp = json.loads(urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))['exp']
+        return float(exp)
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+def token_expired(token: str | None) -> bool:
+    expires = token_expiry(token)
+    return expires is not None and expires <= time.time()
+
+
+def refresh_delay(token: str | None, ahead: float) -> float | None:
+    """Через сколько секунд обновить токен: за `ahead` секунд до истечения, но не раньше половины оставшегося срока
+
+    Returns:
+        float | None: Задержка в секундах или None, если срок токена неизвестен или уже истёк
+    """
+    expires = token_expiry(token)
+    if expires is None:
+        return None
+    left = expires - time.time()
+    if left <= 0:
+        return None
+    return max(left - ahead, left / 2)
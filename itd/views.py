@@ -0,0 +1,200 @@
+from types import UnionType
+from typing import Annotated, Any, Generic, Literal, TypeVar, Union, get_args, get_origin, get_type_hints
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from pydantic_core import SchemaValidator, from_json
+from typing_extensions import is_typeddict  # TypedDict из typing_extensions не распознаётся typing.is_typeddict
+
+from itd.identity import IdentityMap, interning_validator
+from itd.response import Response
+
+T = TypeVar('T')
+
+# strict - полная валидация pydantic, fast - представления с приведением типа поля при первом обращении,
+# raw - представления над JSON без приведения типов (время и UUID остаются строками)
+Validation = Literal['strict', 'fast', 'raw']
+
+_PLAIN = (str, int, float, bool, Any)
+
+
+class _Field:
+    __slots__ = ('key', 'nested', 'many', 'default', 'adapter')
+
+    def __init__(self, key: str, nested: type | None, many: bool, default: Any, adapter: TypeAdapter | None):
+        self.key = key
+        self.nested = nested
+        self.many = many
+        self.default = default
+        self.adapter = adapter
+
+
+def _unwrap(hint: Any) -> tuple[type | None, bool]:
+    """Вложенная модель поля (list[Model], Model | None) и список ли это"""
+    if get_origin(hint) is Annotated:
+        hint = get_args(hint)[0]
+    if get_origin(hint) in (Union, UnionType):
+        args = [arg for arg in get_args(hint) if arg is not type(None)]
+        if len(args) != 1:
+            return None, False
+        hint = args[0]
+    many = get_origin(hint) is list
+    if many:
+        hint = get_args(hint)[0]
+    if isinstance(hint, type) and (issubclass(hint, BaseModel) or is_typeddict(hint)):
+        return hint, many
+    return None, False
+
+
+def _scalar(hint: Any) -> bool:
+    if get_origin(hint) in (Union, UnionType):
+        return all(arg is type(None) or arg in _PLAIN for arg in get_args(hint))
+    return hint in _PLAIN
+
+
+_fields: dict[type, dict[str, _Field]] = {}
+
+
+def fields(tp: type) -> dict[str, _Field]:
+    """Поля модели или TypedDict: имя -> ключ в JSON, вложенный тип и значение по умолчанию"""
+    spec = _fields.get(tp)
+    if spec is not None:
+        return spec
+
+    spec = {}
+    hints = get_type_hints(tp, include_extras=True)
+    model_fields = tp.model_fields if issubclass(tp, BaseModel) else {}
+    for name, hint in hints.items():
+        if name.startswith('_') or name == 'model_config':
+            continue
+        info = model_fields.get(name)
+        if issubclass(tp, BaseModel) and info is None:
+            continue
+        nested, many = _unwrap(hint)
+        default = info.get_default(call_default_factory=True) if info is not None and not info.is_required() else None
+        adapter = None if nested is not None or _scalar(hint) else TypeAdapter(hint)
+        spec[name] = _Field(info.alias or name if info is not None else name, nested, many, default, adapter)
+    _fields[tp] = spec
+    return spec
+
+
+class View:
+    """Представление JSON объекта только для чтения: доступ к полям модели по их именам (snake_case)
+
+    Вложенные объекты оборачиваются при обращении. В режиме `typed` значение поля
+    приводится к его типу (время, UUID, enum) при первом обращении и запоминается.
+
+    Args:
+        tp (type): Модель pydantic или TypedDict, по полям которой читается объект
+        data (dict): Декодированный JSON
+        typed (bool, optional): Приводить значения к типам полей. Defaults to True.
+    """
+    __slots__ = ('_type', '_data', '_typed', '_values')
+
+    def __init__(self, tp: type, data: dict, typed: bool = True):
+        object.__setattr__(self, '_type', tp)
+        object.__setattr__(self, '_data', data)
+        object.__setattr__(self, '_typed', typed)
+        object.__setattr__(self, '_values', {})
+
+    def __getattr__(self, name: str) -> Any:
+        values = self._values
+        if name in values:
+            return values[name]
+        field = fields(self._type).get(name)
+        if field is None:
+            raise AttributeError(f'{self._type.__name__!r} has no field {name!r}')
+
+        if field.key not in self._data:
+            value = field.default
+        else:
+            value = self._data[field.key]
+            if value is not None:
+                if field.nested is not None:
+                    value = [View(field.nested, item, self._typed) for item in value] if field.many else View(field.nested, value, self._typed)
+                elif self._typed and field.adapter is not None:
+                    value = field.adapter.validate_python(value)
+        values[name] = value
+        return value
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{self._type.__name__} view is read-only')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{self._type.__name__} view is read-only')
+
+    def __dir__(self) -> list[str]:
+        return list(fields(self._type))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, View) and self._type is other._type and self._data == other._data
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f'<{self._type.__name__} view {self._data!r}>'
+
+
+class Envelope(Generic[T]):
+    """Тип ответа (модель или TypedDict) и собранный для него TypeAdapter"""
+    __slots__ = ('type', 'adapter', '_interning')
+
+    def __init__(self, tp: type[T]):
+        self.type = tp
+        # у моделей и TypedDict свой `defer_build`, обобщённым типам (`list[...]`) его нужно передать
+        self.adapter: TypeAdapter[T] = TypeAdapter(tp) if isinstance(tp, type) else TypeAdapter(tp, config=ConfigDict(defer_build=True))
+        self._interning: SchemaValidator | None = None
+
+    @property
+    def interning(self) -> SchemaValidator:
+        """Валидатор с общими экземплярами пользователей и пинов из `IdentityMap` (собирается при первом обращении)"""
+        if self._interning is None:
+            self.adapter.rebuild()  # схема отложена (defer_build), а нужна уже сейчас
+            self._interning = interning_validator(self.adapter.core_schema)
+        return self._interning
+
+
+def load(envelope: Envelope[T], data: Any, validation: Validation = 'strict', identity: IdentityMap | None = None) -> T | View:
+    """Превратить декодированный JSON в модель (`strict`) или представление (`fast`, `raw`)"""
+    if validation == 'strict':
+        if identity is not None:
+            return envelope.interning.validate_python(data, context={'identity': identity})
+        return envelope.adapter.validate_python(data)
+    return View(envelope.type, data, typed=validation == 'fast')
+
+
+def load_json(envelope: Envelope[T], data: bytes, validation: Validation = 'strict', identity: IdentityMap | None = None) -> T | View:
+    """`load` для JSON в байтах: модель валидируется без промежуточных dict"""
+    if validation == 'strict':
+        if identity is not None:
+            return envelope.interning.validate_json(data, context={'identity': identity})
+        return envelope.adapter.validate_json(data)
+    return View(envelope.type, from_json(data), typed=validation == 'fast')
+
+
+def load_json_items(envelope: Envelope[list[T]], items: list[bytes], validation: Validation = 'strict', identity: IdentityMap | None = None) -> list[T] | list[View]:
+    """`load_json` для нескольких JSON объектов: валидируются одним вызовом как массив `envelope` (`list[...]`)"""
+    data = b'[' + b','.join(items) + b']'
+    if validation != 'strict':
+        item_type = get_args(envelope.type)[0]
+        return [View(item_type, item, typed=validation == 'fast') for item in from_json(data)]
+    return load_json(envelope, data, validation, identity)
+
+
+def parse(res: Response, envelope: Envelope[T], validation: Validation = 'strict', identity: IdentityMap | None = None) -> T | View:
+    """`load` для тела ответа: модель валидируется прямо из байтов, представление строится над `from_json`"""
+    if validation == 'strict':
+        if identity is not None:
+            return res.parse(envelope.interning, {'identity': identity})
+        return res.parse(envelope.adapter)
+    return View(envelope.type, res.json() if res.decoded else from_json(res.content), typed=validation == 'fast')
+
+
+def raw(view: View) -> dict:
+    """JSON объект под представлением"""
+    return view._data
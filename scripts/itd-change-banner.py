@@ -4,6 +4,7 @@ import argparse
 import os
 import sys
 from itd import ITDClient
+from itd.credentials import CredentialCache
 
 def main():
     parser = argparse.ArgumentParser(
@@ -42,7 +43,8 @@ def main():
     server_name = args.name or os.path.basename(file_path)
 
     try:
-        client = ITDClient(None, args.token)
+        # токен берётся из кеша, пока он действует, и обновляется только когда истечёт
+        client = ITDClient(None, args.token, credentials=CredentialCache())
 
         # Загружаем файл
         with open(file_path, 'rb') as f:
@@ -4,6 +4,7 @@ import argparse
 import os
 import sys
 from itd import ITDClient
+from itd.credentials import CredentialCache
 
 def main():
     parser = argparse.ArgumentParser(
@@ -39,7 +40,8 @@ def main():
         sys.exit(1)
 
     try:
-        client = ITDClient(None, args.token)
+        # токен берётся из кеша, пока он действует, и обновляется только когда истечёт
+        client = ITDClient(None, args.token, credentials=CredentialCache())
 
         file_id = None
         if args.file:
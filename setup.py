@@ -7,5 +7,8 @@ setup(
     install_requires=[
         'requests', 'pydantic'
     ],
+    extras_require={
+        'async': ['httpx']
+    },
     python_requires=">=3.9"
 )
@@ -0,0 +1,196 @@
+import asyncio
+import base64
+import inspect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+import pytest
+
+import itd.async_request
+import itd.request
+from itd.async_client import AsyncClient
+from itd.async_request import AsyncTransport
+from itd.client import Client
+from itd.request import Transport
+
+USER_ID = '9096a85b-c319-483e-8940-6921be427ad0'
+
+
+def make_token(expires_in: float = 3600) -> str:
+    """JWT без подписи: клиенту важен только `exp`"""
+    def part(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    return f"{part({'alg': 'HS256'})}.{part({'exp': int(time.time() + expires_in)})}.signature"
+
+
+def user(username: str = 'nowkie', **fields: Any) -> dict:
+    return {
+        'id': USER_ID, 'username': username, 'displayName': username.title(), 'avatar': '🐱', 'verified': False,
+        'followersCount': 1, 'followingCount': 2, 'postsCount': 3, 'createdAt': '2026-01-30T12:58:14.228Z', **fields
+    }
+
+
+def notification(id: str | None = None) -> dict:
+    """Уведомление из REST `notifications` (в потоке к нему добавляется `userId`)"""
+    return {
+        'id': id or str(uuid4()), 'type': 'follow', 'preview': None, 'readAt': None, 'read': False,
+        'createdAt': '2026-01-30T12:58:14.228Z', 'actor': {'id': str(uuid4()), 'username': 'actor', 'displayName': 'Actor', 'avatar': '🐶'}
+    }
+
+
+def sse(data: dict, id: str | None = None) -> bytes:
+    return (f'id: {id}\n' if id else '').encode() + b'data: ' + json.dumps(data).encode() + b'\n\n'
+
+
+class Request:
+    """Запрос к тестовому серверу"""
+    def __init__(self, method: str, path: str, query: dict[str, list[str]], headers: dict[str, str], body: bytes):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+# ответ обработчика: (статус, JSON) или (статус, куски тела в bytes) - тогда тело отдаётся потоком (chunked), как SSE у API;
+# третьим элементом можно передать заголовки ответа
+Reply = tuple[int, Any] | tuple[int, Any, dict[str, str]]
+Handler = Callable[[Request], Reply]
+
+
+def _streamed(body: Any) -> bool:
+    if isinstance(body, list):
+        return bool(body) and all(isinstance(chunk, bytes) for chunk in body)
+    return body is not None and not isinstance(body, dict)
+
+
+class ApiServer:
+    """Локальный HTTP сервер вместо API: ответы задаются по методу и пути (без `/api/`), запросы записываются"""
+    def __init__(self):
+        self.routes: dict[tuple[str, str], Handler] = {}
+        self.requests: list[Request] = []
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}/api/'
+
+    def on(self, method: str, path: str, handler: Handler | None = None, status: int = 200, json: Any = None) -> None:
+        self.routes[method.upper(), path] = handler or (lambda request: (status, json))
+
+    def count(self, method: str, path: str) -> int:
+        return sum(1 for request in self.requests if request.method == method.upper() and request.path == path)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def handle_one_request(self):
+                try:
+                    super().handle_one_request()
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+            def _reply(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                request = Request(self.command, url.path.removeprefix('/api/'), parse_qs(url.query), dict(self.headers), self.rfile.read(length))
+                server.requests.append(request)
+                handler = server.routes.get((request.method, request.path))
+                status, body, *extra = handler(request) if handler else (404, {'error': {'code': 'NOT_FOUND', 'message': 'Not found'}})
+                headers = extra[0] if extra else {}
+
+                if not _streamed(body):
+                    raw = b'' if body is None else json.dumps(body).encode()
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(raw)))
+                    self.end_headers()
+                    self.wfile.write(raw)
+                    return
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.flush()
+                for chunk in body:
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                    self.wfile.flush()
+                self.wfile.write(b'0\r\n\r\n')
+                self.close_connection = True
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _reply
+
+        return Handler
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def api(monkeypatch) -> Iterable[ApiServer]:
+    server = ApiServer()
+    server.start()
+    monkeypatch.setattr(itd.request, 'BASE_URL', server.url)
+    monkeypatch.setattr(itd.async_request, 'BASE_URL', server.url)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def token() -> str:
+    return make_token()
+
+
+@pytest.fixture
+def transport_options() -> dict:
+    """Аргументы транспорта клиентов из `run` (модуль тестов может переопределить)"""
+    return {}
+
+
+@pytest.fixture(params=['sync', 'async'])
+def run(request, token, transport_options):
+    """Вызвать метод клиента одинаково для `Client` и `AsyncClient`"""
+    if request.param == 'sync':
+        client = Client(token=token, transport=Transport(**transport_options))
+
+        def call(name, *args, **kwargs):
+            return getattr(client, name)(*args, **kwargs)
+        yield call
+        client.close()
+    else:
+        loop = asyncio.new_event_loop()
+        client = AsyncClient(token=token, transport=AsyncTransport(**transport_options))
+
+        def call(name, *args, **kwargs):
+            async def main():
+                result = getattr(client, name)(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    return await result
+                if hasattr(result, '__aiter__'):
+                    return [item async for item in result]
+                return result
+            return loop.run_until_complete(main())
+        yield call
+        loop.run_until_complete(client.aclose())
+        loop.close()
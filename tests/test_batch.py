@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+
+from conftest import user
+from itd.async_batch import arun_batch
+from itd.batch import already_done, run_batch
+from itd.exceptions import AlreadyFollowing, AlreadyLiked, NotFound
+
+
+def test_run_batch():
+    def call(key):
+        if key == 'bad':
+            raise ValueError(key)
+        return key.upper()
+
+    result = run_batch(['a', 'b', 'a', 'bad'], call, max_workers=2)
+    assert result.keys == ['a', 'b', 'bad']
+    assert result.results == {'a': 'A', 'b': 'B'}
+    assert isinstance(result.errors['bad'], ValueError)
+    assert not result.ok
+    assert result.status('a') == 'ok' and result.status('bad') == 'failed'
+    with pytest.raises(ValueError):
+        result['bad']
+
+
+def test_already_done():
+    def call(key):
+        raise AlreadyFollowing()
+
+    result = run_batch(['a'], call, already=already_done)
+    assert result.ok
+    assert result.results == {'a': None}
+    assert result.status('a') == 'already'
+
+
+def test_max_workers():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def call(key):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    run_batch(range(20), call, max_workers=4)
+    assert peak <= 4
+
+
+def test_arun_batch_max_concurrency():
+    active, peak = 0, 0
+
+    async def call(key):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return key
+
+    result = asyncio.run(arun_batch(range(20), call, max_concurrency=3))
+    assert peak == 3
+    assert result.results == {key: key for key in range(20)}
+
+
+def test_get_users(api, run):
+    api.on('GET', 'users/alice', json=user('alice'))
+    api.on('GET', 'users/bob', json=user('bob'))
+    api.on('GET', 'users/ghost', status=404, json={'error': {'code': 'NOT_FOUND', 'message': 'User not found'}})
+
+    result = run('get_users', ['alice', 'bob', 'ghost', 'alice'])
+    assert result.keys == ['alice', 'bob', 'ghost']
+    assert result['alice'].username == 'alice' and result['bob'].username == 'bob'
+    assert isinstance(result.errors['ghost'], NotFound)
+    assert api.count('GET', 'users/alice') == 1
+
+
+def test_follow_users_already_following(api, run):
+    api.on('POST', 'users/alice/follow', json={'following': True, 'followersCount': 5})
+    api.on('POST', 'users/bob/follow', status=409, json={'error': {'code': 'CONFLICT', 'message': 'Already following'}})
+
+    result = run('follow_users', ['alice', 'bob'])
+    assert result.ok
+    assert result['alice'] == 5
+    assert result.status('bob') == 'already'
+
+
+def conflict(message: str) -> dict:
+    return {'error': {'code': 'CONFLICT', 'message': message}}
+
+
+def test_like_posts_already_liked(api, run):
+    new, liked = uuid4(), uuid4()
+    api.on('POST', f'posts/{new}/like', json={'liked': True, 'likesCount': 3})
+    api.on('POST', f'posts/{liked}/like', status=409, json=conflict('Already liked'))
+
+    result = run('like_posts', [new, liked])
+    assert result.ok
+    assert result[new] == 3
+    assert result.status(liked) == 'already'
+
+
+def test_like_comment_conflict_raises(api, run):
+    id = uuid4()
+    api.on('POST', f'comments/{id}/like', status=409, json=conflict('Already liked'))
+    with pytest.raises(AlreadyLiked):
+        run('like_comment', id)
+
+
+@pytest.mark.parametrize('method, path, name', [
+    ('DELETE', 'posts/{}/like', 'unlike_posts'),
+    ('POST', 'posts/{}/view', 'view_posts'),
+])
+def test_undo_and_view_conflicts_are_errors(api, run, method, path, name):
+    id = uuid4()
+    api.on(method, path.format(id), status=409, json=conflict('Conflict'))
+
+    result = run(name, [id])
+    assert not result.ok
+    assert result.status(id) == 'failed'
+    assert not result.already
+
+
+def test_unfollow_users_conflict_is_error(api, run):
+    api.on('DELETE', 'users/bob/follow', status=409, json=conflict('Not following'))
+
+    result = run('unfollow_users', ['bob'])
+    assert result.status('bob') == 'failed'
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+import itd.cache
+from conftest import user
+from itd.cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(itd.cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def transport_options(request):
+    """Свой кеш для каждого клиента; аргументы `ResponseCache` можно передать через indirect параметр"""
+    return {'cache': ResponseCache(**getattr(request, 'param', {}))}
+
+
+def test_ttl_and_stale_while_revalidate(clock):
+    cache = ResponseCache(stale_while_revalidate=30)
+    key = cache.key('t', 'users/nowkie', {})
+    cache.store(key, 'users/nowkie', FakeResponse(), 60, cache.generation)
+
+    assert cache.lookup(key)[1:] == (True, False)
+    clock[0] += 61
+    assert cache.lookup(key)[1:] == (False, True)
+    clock[0] += 30
+    entry, fresh, stale = cache.lookup(key)
+    assert entry is not None and not fresh and not stale  # пригодится только для условного запроса
+
+
+def test_ttl_by_endpoint():
+    cache = ResponseCache()
+    assert cache.ttl_for('users/nowkie') == 60
+    assert cache.ttl_for('users/nowkie/followers') == 0
+
+
+def test_invalidate_nested_paths():
+    cache = ResponseCache()
+    for path in ('users/bob', 'users/bob/followers', 'users/bobby'):
+        cache.store(cache.key('t', path, {}), path, FakeResponse(), 60, cache.generation)
+    cache.invalidate('users/bob')
+    assert [entry.path for entry in cache._entries.values()] == ['users/bobby']
+
+
+def test_store_after_invalidation_is_dropped():
+    cache = ResponseCache()
+    generation = cache.generation
+    cache.invalidate('users/bob')
+    cache.store(cache.key('t', 'users/bob', {}), 'users/bob', FakeResponse(), 60, generation)
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    keys = [cache.key('t', f'users/{name}', {}) for name in 'abc']
+    cache.store(keys[0], 'users/a', FakeResponse(), 60, 0)
+    cache.store(keys[1], 'users/b', FakeResponse(), 60, 0)
+    cache.lookup(keys[0])
+    cache.store(keys[2], 'users/c', FakeResponse(), 60, 0)
+    assert keys[0] in cache._entries and keys[1] not in cache._entries
+
+
+def test_validators():
+    cache = ResponseCache()
+    key = cache.key('t', 'users/a', {})
+    cache.store(key, 'users/a', FakeResponse({'ETag': '"v1"', 'Last-Modified': 'Fri, 30 Jan 2026 12:58:14 GMT'}), 60, 0)
+    assert cache.lookup(key)[0].validators() == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Fri, 30 Jan 2026 12:58:14 GMT'}
+
+
+def test_cached_user(api, run):
+    api.on('GET', 'users/nowkie', json=user())
+    assert run('get_user', 'nowkie').username == 'nowkie'
+    assert run('get_user', 'nowkie').username == 'nowkie'
+    assert api.count('GET', 'users/nowkie') == 1
+
+
+def test_follow_invalidates_cached_user(api, run):
+    followers = [1]
+    api.on('GET', 'users/nowkie', lambda request: (200, user(followersCount=followers[0])))
+
+    def follow(request):
+        followers[0] += 1
+        return 200, {'following': True, 'followersCount': followers[0]}
+    api.on('POST', 'users/nowkie/follow', follow)
+
+    assert run('get_user', 'nowkie').followers_count == 1
+    assert run('follow', 'nowkie') == 2
+    assert run('get_user', 'nowkie').followers_count == 2
+    assert api.count('GET', 'users/nowkie') == 2
+
+
+@pytest.mark.parametrize('transport_options', [{'ttl': {'GET users/:id': 0.05}, 'stale_while_revalidate': 0}], indirect=True)
+def test_not_modified_extends_entry(api, run):
+    def handler(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return 304, None, {'ETag': '"v1"'}
+        return 200, user(), {'ETag': '"v1"'}
+    api.on('GET', 'users/nowkie', handler)
+
+    assert run('get_user', 'nowkie').username == 'nowkie'
+    time.sleep(0.1)
+    assert run('get_user', 'nowkie').username == 'nowkie'
+    assert [request.headers.get('If-None-Match') for request in api.requests] == [None, '"v1"']
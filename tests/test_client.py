@@ -0,0 +1,116 @@
+import asyncio
+import inspect
+import threading
+
+import pytest
+
+from conftest import USER_ID, notification, sse, user
+from itd.async_client import AsyncClient
+from itd.client import Client
+from itd.exceptions import NotFound
+from itd.models.event import StreamConnect, StreamNotification
+from itd.models.user import User
+
+
+def test_async_methods_are_coroutines():
+    assert inspect.iscoroutinefunction(AsyncClient.get_user)
+    assert inspect.iscoroutinefunction(AsyncClient.get_me)
+    assert not inspect.iscoroutinefunction(Client.get_user)
+    assert Client.get_user.__doc__ == AsyncClient.get_user.__doc__
+
+
+def test_get_user(api, run):
+    api.on('GET', 'users/nowkie', json=user())
+    result = run('get_user', 'nowkie')
+    assert isinstance(result, User)
+    assert result.username == 'nowkie'
+
+
+def test_nested_operation(api, run):
+    api.on('GET', 'users/me', json=user('me'))
+    assert run('get_me').username == 'me'
+
+
+def test_error_is_raised(api, run):
+    api.on('GET', 'users/ghost', status=404, json={'error': {'code': 'NOT_FOUND', 'message': 'User not found'}})
+    with pytest.raises(NotFound):
+        run('get_user', 'ghost')
+
+
+@pytest.mark.parametrize('mode', ['sync', 'async'])
+def test_backfill_before_reading_stream(api, token, mode):
+    """После переподключения пропущенное догружается сразу после ответа 200, до чтения тела потока"""
+    first, missed, fresh = notification(), notification(), notification()
+    backfilled = threading.Event()
+    connections = []
+
+    def stream(request):
+        connections.append(request.headers.get('Last-Event-ID'))
+        connect = sse({'userId': USER_ID, 'timestamp': 1})
+        if len(connections) == 1:
+            return 200, [b'retry: 10\n\n', connect, sse(first | {'userId': USER_ID}, '1')]
+
+        def body():
+            # сервер не шлёт событий, пока клиент не догрузит пропущенное
+            if backfilled.wait(5):
+                yield connect + sse(fresh | {'userId': USER_ID}, '3')
+        return 200, body()
+
+    def notifications(request):
+        backfilled.set()
+        return 200, {'notifications': [missed, first], 'hasMore': False}
+
+    api.on('GET', 'notifications/stream', stream)
+    api.on('GET', 'notifications', notifications)
+
+    ids = []
+    if mode == 'sync':
+        client = Client(token=token)
+        for event in client.stream_notifications():
+            if isinstance(event, StreamNotification):
+                ids.append(str(event.id))
+            if len(ids) == 3:
+                client.stop_stream()
+    else:
+        async def main():
+            client = AsyncClient(token=token)
+            async for event in client.stream_notifications():
+                if isinstance(event, StreamNotification):
+                    ids.append(str(event.id))
+                if len(ids) == 3:
+                    client.stop_stream()
+            await client.aclose()
+        asyncio.run(main())
+
+    assert ids == [first['id'], missed['id'], fresh['id']]
+    assert connections == [None, '1']
+
+
+def test_stream_connect_event(api, token):
+    api.on('GET', 'notifications/stream', lambda request: (200, [sse({'userId': USER_ID, 'timestamp': 1})]))
+    client = Client(token=token)
+    for event in client.stream_notifications():
+        assert isinstance(event, StreamConnect)
+        client.stop_stream()
+
+
+def test_stream_problems_are_logged(api, token, caplog):
+    connections = []
+
+    def stream(request):
+        connections.append(request)
+        if len(connections) == 1:
+            return 200, [b'retry: 10\n\n', b'data: {broken\n\n']
+        return 200, [sse({'userId': USER_ID, 'timestamp': 1})]
+
+    api.on('GET', 'notifications/stream', stream)
+    client = Client(token=token)
+    with caplog.at_level('INFO', logger='itd.client'):
+        for event in client.stream_notifications():
+            assert isinstance(event, StreamConnect)
+            client.stop_stream()
+
+    assert len(connections) == 2
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[0].startswith('Не удалось разобрать событие')
+    assert messages[1].startswith('Сервер закрыл поток, переподключение через')
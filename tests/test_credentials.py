@@ -0,0 +1,116 @@
+import asyncio
+import os
+
+import pytest
+
+fcntl = pytest.importorskip('fcntl')
+
+from conftest import make_token, user
+from itd.async_client import AsyncClient, _acquire
+from itd.client import Client
+from itd.credentials import CredentialCache, FileLock, account_key
+
+
+def test_account_key_uses_refresh_token():
+    assert account_key('a=1; refresh_token=abc') == account_key('refresh_token=abc; b=2')
+    assert account_key('refresh_token=abc') != account_key('refresh_token=abd')
+
+
+def test_cache_roundtrip(tmp_path, token):
+    cache = CredentialCache(tmp_path / 'credentials.json')
+    cache.put('refresh_token=abc', token)
+    assert cache.get('refresh_token=abc') == token
+    assert cache.get('refresh_token=other') is None
+    cache.remove('refresh_token=abc')
+    assert cache.get('refresh_token=abc') is None
+
+
+@pytest.mark.parametrize('mode', ['sync', 'async'])
+def test_clients_share_refreshed_token(api, tmp_path, mode):
+    """Второй клиент (другой процесс) берёт токен из кеша и не обновляет его сам"""
+    fresh = make_token()
+    api.on('POST', 'v1/auth/refresh', json={'accessToken': fresh})
+    api.on('GET', 'users/me', json=user('me'))
+    cache = CredentialCache(tmp_path / 'credentials.json')
+
+    for _ in range(2):
+        if mode == 'sync':
+            with Client(cookies='refresh_token=abc', credentials=cache) as client:
+                client.get_me()
+        else:
+            async def main():
+                async with AsyncClient(cookies='refresh_token=abc', credentials=cache) as client:
+                    await client.get_me()
+            asyncio.run(main())
+
+    assert api.count('POST', 'v1/auth/refresh') == 1
+    assert [r.headers['Authorization'] for r in api.requests if r.path == 'users/me'] == [f'Bearer {fresh}'] * 2
+    assert cache.get('refresh_token=abc') == fresh
+
+
+@pytest.mark.parametrize('mode', ['sync', 'async'])
+def test_logout_forgets_token(api, tmp_path, token, mode):
+    cache = CredentialCache(tmp_path / 'credentials.json')
+    cache.put('refresh_token=abc', token)
+    api.on('POST', 'v1/auth/logout', json={'success': True})
+    if mode == 'sync':
+        with Client(cookies='refresh_token=abc', credentials=cache) as client:
+            client.logout()
+    else:
+        async def main():
+            async with AsyncClient(cookies='refresh_token=abc', credentials=cache) as client:
+                await client.logout()
+        asyncio.run(main())
+    assert cache.get('refresh_token=abc') is None
+    assert api.count('POST', 'v1/auth/refresh') == 0
+
+
+def locked(path) -> bool:
+    """Занята ли блокировка (проверка из другого дескриптора)"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+def test_cancelled_acquire_releases_lock(tmp_path):
+    path = tmp_path / 'lock'
+    holder = FileLock(path)
+    holder.acquire()
+    lock = FileLock(path)
+
+    async def main():
+        waiter = asyncio.create_task(_acquire(lock))
+        await asyncio.sleep(0.1)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # поток всё ещё ждёт блокировку; когда она освободится, поток возьмёт её и сразу отпустит
+        holder.release()
+        await asyncio.sleep(0.3)
+
+    asyncio.run(main())
+    assert lock._fd is None
+    assert not locked(path)
+
+
+def test_acquire_waits_for_other_holder(tmp_path):
+    path = tmp_path / 'lock'
+    holder = FileLock(path)
+    holder.acquire()
+    lock = FileLock(path)
+
+    async def main():
+        waiter = asyncio.create_task(_acquire(lock))
+        await asyncio.sleep(0.1)
+        assert not waiter.done()
+        holder.release()
+        await asyncio.wait_for(waiter, 5)
+        assert locked(path)
+        lock.release()
+
+    asyncio.run(main())
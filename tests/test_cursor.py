@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+
+from conftest import user
+from itd.async_paginate import apaginate
+from itd.client import Client
+from itd.cursor import Cursor
+from itd.paginate import paginate
+
+PAGES = {1: ([1, 2, 3], 2), 2: ([4, 5, 6], 3), 3: ([7], None)}
+
+
+def fetch_page(page):
+    return PAGES[page]
+
+
+@pytest.mark.parametrize('value', [None, 7, 'abc', datetime(2026, 1, 30, 12, 58, 14, tzinfo=timezone.utc), UUID('9096a85b-c319-483e-8940-6921be427ad0')])
+@pytest.mark.parametrize('skip', [0, 2])
+def test_roundtrip(value, skip):
+    cursor = Cursor(value, skip)
+    assert Cursor.decode(str(cursor)) == cursor
+    assert Cursor.parse(str(cursor)) == cursor
+
+
+@pytest.mark.parametrize('token', ['', 'not a cursor', 'WyJ4IiwxXQ'])
+def test_invalid(token):
+    with pytest.raises(ValueError):
+        Cursor.decode(token)
+
+
+@pytest.mark.parametrize('prefetch', [0, 1])
+def test_resume_inside_page(prefetch):
+    items = paginate(fetch_page, 1, prefetch)
+    assert [next(items) for _ in range(4)] == [1, 2, 3, 4]
+    assert items.cursor == Cursor(2, 1)
+    saved = str(items.cursor)
+    items.close()
+
+    assert list(paginate(fetch_page, 1, prefetch, cursor=saved)) == [5, 6, 7]
+
+
+def test_cursor_after_page_and_end():
+    items = paginate(fetch_page, 1, prefetch=0)
+    assert [next(items) for _ in range(3)] == [1, 2, 3]
+    assert items.cursor == Cursor(2)
+    assert list(items) == [4, 5, 6, 7]
+    assert items.cursor is None
+
+
+def test_max_items():
+    items = paginate(fetch_page, 1, prefetch=0, max_items=5)
+    assert list(items) == [1, 2, 3, 4, 5]
+    assert list(paginate(fetch_page, 1, prefetch=0, cursor=items.cursor)) == [6, 7]
+
+
+def test_async_resume():
+    async def fetch(page):
+        return PAGES[page]
+
+    async def main():
+        items = apaginate(fetch, 1)
+        first = [await items.__anext__() for _ in range(4)]
+        saved = str(items.cursor)
+        await items.aclose()
+        return first, [item async for item in apaginate(fetch, 1, cursor=saved)]
+    assert asyncio.run(main()) == ([1, 2, 3, 4], [5, 6, 7])
+
+
+def test_iter_followers_from_cursor(api, token):
+    def page(request):
+        number = int(request.query['page'][0])
+        users = [user(f'f{number}_{i}') for i in range(2)]
+        return 200, {'data': {'users': users, 'pagination': {'page': number, 'limit': 2, 'total': 6, 'hasMore': number < 3}}}
+    api.on('GET', 'users/nowkie/followers', page)
+
+    with Client(token=token) as client:
+        followers = client.iter_followers('nowkie', limit=2, prefetch=0)
+        assert [next(followers).username for _ in range(3)] == ['f1_0', 'f1_1', 'f2_0']
+        resumed = client.iter_followers('nowkie', limit=2, cursor=str(followers.cursor))
+        assert [follower.username for follower in resumed] == ['f2_1', 'f3_0', 'f3_1']
+    assert [request.query['page'][0] for request in api.requests] == ['1', '2', '2', '3']
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from itd.models._datetime import parse_datetime
+from itd.models._text import TextObject
+
+
+UTC = timezone.utc
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2026-01-30 12:58:14.228+00', datetime(2026, 1, 30, 12, 58, 14, 228000, UTC)),
+    ('2026-01-30 12:58:14.228+00:00', datetime(2026, 1, 30, 12, 58, 14, 228000, UTC)),
+    ('2026-01-30 15:58:14.228+03', datetime(2026, 1, 30, 15, 58, 14, 228000, timezone(timedelta(hours=3)))),
+    ('2026-01-30 12:58:14.228123+00', datetime(2026, 1, 30, 12, 58, 14, 228123, UTC)),
+    ('2026-01-30 12:58:14.22+00:00', datetime(2026, 1, 30, 12, 58, 14, 220000, UTC)),
+    ('2026-01-30 12:58:14.2+00', datetime(2026, 1, 30, 12, 58, 14, 200000, UTC)),
+    ('2026-01-30 12:58:14.22812+00', datetime(2026, 1, 30, 12, 58, 14, 228120, UTC)),
+    ('2026-01-30 12:58:14+00', datetime(2026, 1, 30, 12, 58, 14, 0, UTC)),
+])
+def test_postgres_format(value, expected):
+    assert parse_datetime(value) == expected
+
+
+def test_other_values_are_left_to_pydantic():
+    value = datetime(2026, 1, 30, tzinfo=UTC)
+    assert parse_datetime(value) is value
+    assert parse_datetime('2026-01-30T12:58:14.228Z') == '2026-01-30T12:58:14.228Z'
+    assert parse_datetime(None) is None
+
+
+@pytest.mark.parametrize('value', ['2026-01-30T12:58:14.228Z', '2026-01-30 12:58:14.228+00'])
+def test_model_timestamps_are_aware(value):
+    text = TextObject.model_validate({'id': '00000000-0000-0000-0000-000000000001', 'content': '', 'createdAt': value})
+    assert text.created_at == datetime(2026, 1, 30, 12, 58, 14, 228000, UTC)
+    assert text.created_at.tzinfo is not None
+
+
+def test_invalid_timestamp_fails():
+    with pytest.raises(ValueError):
+        TextObject.model_validate({'id': '00000000-0000-0000-0000-000000000001', 'content': '', 'createdAt': '2026-01-30 nope'})
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import USER_ID, notification
+from itd.async_dispatch import AsyncDispatcher
+from itd.dispatch import Dispatcher, Spill
+from itd.models.envelope import STREAM_NOTIFICATION
+from itd.views import load
+
+COUNT = 10
+
+
+def notifications() -> list:
+    return [load(STREAM_NOTIFICATION, notification() | {'userId': USER_ID}, 'strict') for _ in range(COUNT)]
+
+
+class StreamClient:
+    """Клиент с готовым потоком: после первого уведомления ждёт, пока обработчик его возьмёт, в конце отпускает обработчик"""
+    validation = 'strict'
+    identity_map = None
+
+    def __init__(self, items: list, hold: bool):
+        self.items = items
+        self.hold = hold
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def stream_notifications(self):
+        yield self.items[0]
+        if self.hold:
+            assert self.started.wait(5)
+        yield from self.items[1:]
+        self.release.set()
+
+    def stop_stream(self):
+        pass
+
+
+class AsyncStreamClient(StreamClient):
+    def __init__(self, items: list, hold: bool):
+        super().__init__(items, hold)
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def stream_notifications(self):
+        yield self.items[0]
+        if self.hold:
+            await asyncio.wait_for(self.started.wait(), 5)
+        for item in self.items[1:]:
+            yield item
+        self.release.set()
+
+
+def dispatch(mode: str, overflow: str, hold: bool, **options):
+    """Обработать уведомления одним обработчиком; с `hold` первый вызов ждёт конца потока"""
+    items = notifications()
+    handled = []
+    if mode == 'sync':
+        client = StreamClient(items, hold)
+        dispatcher = Dispatcher(client, workers=1, max_queue=2, overflow=overflow, **options)
+
+        @dispatcher.on()
+        def handler(item):
+            handled.append(item)
+            if hold and not client.started.is_set():
+                client.started.set()
+                assert client.release.wait(5)
+        dispatcher.run()
+    else:
+        client = AsyncStreamClient(items, hold)
+        dispatcher = AsyncDispatcher(client, workers=1, max_queue=2, overflow=overflow, **options)
+
+        @dispatcher.on()
+        async def handler(item):
+            handled.append(item)
+            if hold and not client.started.is_set():
+                client.started.set()
+                await asyncio.wait_for(client.release.wait(), 5)
+        asyncio.run(dispatcher.run())
+    return items, [str(item.id) for item in handled], dispatcher.metrics
+
+
+def ids(items: list) -> list[str]:
+    return [str(item.id) for item in items]
+
+
+@pytest.fixture(params=['sync', 'async'])
+def mode(request):
+    return request.param
+
+
+def test_block(mode):
+    items, handled, metrics = dispatch(mode, 'block', hold=False)
+    assert handled == ids(items)
+    assert metrics.received == metrics.handled == COUNT
+    assert metrics.max_depth <= 2
+
+
+def test_drop_oldest(mode):
+    items, handled, metrics = dispatch(mode, 'drop_oldest', hold=True)
+    # пока первое уведомление обрабатывается, в очереди остаются два последних
+    assert handled == ids([items[0], *items[-2:]])
+    assert metrics.dropped == COUNT - 3
+    assert metrics.handled == 3
+
+
+def test_spill(mode, tmp_path):
+    items, handled, metrics = dispatch(mode, 'spill', hold=True, spill_path=tmp_path / 'spill')
+    assert handled == ids(items)
+    assert metrics.spilled == COUNT - 3
+    assert metrics.max_depth == COUNT - 1
+
+
+def test_handler_error_is_counted(caplog):
+    client = StreamClient(notifications(), hold=False)
+    dispatcher = Dispatcher(client, workers=2)
+
+    @dispatcher.on('follow')
+    def fails(item):
+        raise RuntimeError('db is down')
+
+    @dispatcher.on('like')
+    def never(item):
+        raise AssertionError('wrong type')
+
+    with caplog.at_level('ERROR', logger='itd.dispatch'):
+        dispatcher.run()
+    assert dispatcher.metrics.failed == COUNT
+    assert dispatcher.metrics.latency['test_handler_error_is_counted.<locals>.fails'].count == COUNT
+    assert len(caplog.records) == COUNT
+    assert caplog.records[0].exc_info[1].args == ('db is down',)
+
+
+class FailingStreamClient(StreamClient):
+    """Поток обрывается ошибкой, пока обработчик держит очередь полной"""
+    def stream_notifications(self):
+        yield from self.items
+        raise ConnectionError('stream is gone')
+
+
+@pytest.mark.parametrize('overflow', ['block', 'spill'])
+def test_stream_error_with_full_queue(overflow, tmp_path):
+    client = FailingStreamClient(notifications(), hold=False)
+    dispatcher = Dispatcher(client, workers=1, max_queue=2, overflow=overflow, spill_path=tmp_path / 'spill')
+    handled, errors = [], []
+    release = threading.Event()
+
+    @dispatcher.on()
+    def handler(item):
+        assert release.wait(5)
+        handled.append(item)
+
+    def run():
+        try:
+            dispatcher.run()
+        except ConnectionError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    # поток упёрся в полную очередь ('block') или отдал всё остальное на диск ('spill')
+    while not (dispatcher._queue.full() if overflow == 'block' else dispatcher.metrics.received == COUNT):
+        thread.join(0.01)
+    release.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert len(errors) == 1
+    assert len(handled) == COUNT
+
+
+def test_spill_file(tmp_path):
+    spill = Spill(tmp_path / 'spill')
+    for i in range(3):
+        spill.push(b'%d' % i)
+    assert [spill.pop() for _ in range(2)] == [b'0', b'1']
+    spill.push(b'3')
+    assert [spill.pop(), spill.pop()] == [b'2', b'3']
+    assert len(spill) == 0
+    spill.close()
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        Dispatcher(StreamClient([], hold=False), overflow='ignore')
+    with pytest.raises(ValueError):
+        Dispatcher(StreamClient([], hold=False), workers=0)
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from conftest import user
+from itd.exceptions import NotFound, RateLimitExceeded
+from itd.models.envelope import FOLLOWERS, NOTIFICATIONS, POSTS
+from itd.models.pagination import Pagination
+from itd.models.user import UserFollower
+from itd.response import Response, _NOT_DECODED
+
+
+class Raw:
+    def __init__(self, status_code: int, body: dict):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = json.dumps(body).encode()
+        self.text = self.content.decode()
+
+
+def followers(count: int) -> dict:
+    return {'data': {'users': [user(f'u{i}') for i in range(count)], 'pagination': {'page': 1, 'limit': 30, 'total': count, 'hasMore': False}}}
+
+
+def test_validate_json_from_bytes():
+    res = Response(Raw(200, followers(3)))
+    res.raise_for_error()
+    data = res.parse(FOLLOWERS.adapter)['data']
+    assert res._json is _NOT_DECODED  # тело не декодировалось в dict
+    assert [follower.username for follower in data['users']] == ['u0', 'u1', 'u2']
+    assert all(isinstance(follower, UserFollower) for follower in data['users'])
+    assert isinstance(data['pagination'], Pagination)
+
+
+def test_decoded_body_is_validated_as_python():
+    res = Response(Raw(200, followers(1)))
+    res.json()
+    assert res.parse(FOLLOWERS.adapter)['data']['users'][0].username == 'u0'
+
+
+@pytest.mark.parametrize('adapter, body', [
+    (NOTIFICATIONS.adapter, {'notifications': [], 'hasMore': False}),
+    (POSTS.adapter, {'data': {'posts': [], 'pagination': {'limit': 20, 'nextCursor': None, 'hasMore': False}}}),
+])
+def test_prebuilt_adapters(adapter, body):
+    assert adapter.validate_json(json.dumps(body)) == adapter.validate_python(body)
+
+
+def test_invalid_body_raises_validation_error():
+    body = followers(1)
+    body['data']['pagination']['hasMore'] = 'maybe'
+    with pytest.raises(ValueError):
+        Response(Raw(200, body)).parse(FOLLOWERS.adapter)
+
+
+@pytest.mark.parametrize('status, body, expected', [
+    (200, {'error': {'code': 'RATE_LIMIT_EXCEEDED', 'retryAfter': 1}}, RateLimitExceeded),  # ошибка в ответе 200
+    (404, {'error': {'code': 'NOT_FOUND', 'message': 'User not found'}}, NotFound),
+])
+def test_errors_from_raw_bytes(status, body, expected):
+    with pytest.raises(expected):
+        Response(Raw(status, body)).raise_for_error({'NOT_FOUND': NotFound('User')})
+
+
+def test_get_followers(api, run):
+    api.on('GET', 'users/nowkie/followers', json=followers(2))
+    users, pagination = run('get_followers', 'nowkie')
+    assert [follower.username for follower in users] == ['u0', 'u1']
+    assert not pagination.has_more
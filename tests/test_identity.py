@@ -0,0 +1,62 @@
+from uuid import uuid4
+
+from conftest import USER_ID
+from itd.client import Client
+from itd.identity import IdentityMap
+from itd.models.envelope import POSTS
+from itd.views import load
+
+PIN = {'slug': 'cat', 'name': 'Cat', 'description': ''}
+
+
+def author(**fields) -> dict:
+    return {'id': USER_ID, 'username': 'nowkie', 'displayName': 'Nowkie', 'avatar': '🐱', 'pin': PIN, **fields}
+
+
+def posts(*authors: dict) -> dict:
+    return {'data': {
+        'posts': [{'id': str(uuid4()), 'content': '', 'createdAt': '2026-01-30T12:58:14.228Z', 'author': a} for a in authors],
+        'pagination': {'limit': 20, 'nextCursor': None, 'hasMore': False}
+    }}
+
+
+def test_repeated_author_is_one_instance():
+    identity = IdentityMap()
+    page = load(POSTS, posts(author(), author(), author()), identity=identity)['data']['posts']
+    assert page[0].author is page[1].author is page[2].author
+    assert page[0].author.pin is page[2].author.pin
+    assert identity.misses == 2 and identity.hits == 2  # автор и пин разобраны один раз, повторы автора берутся целиком
+
+    again = load(POSTS, posts(author()), identity=identity)['data']['posts']
+    assert again[0].author is page[0].author  # между ответами тоже
+
+
+def test_changed_data_replaces_instance():
+    identity = IdentityMap()
+    first = load(POSTS, posts(author()), identity=identity)['data']['posts'][0].author
+    second = load(POSTS, posts(author(displayName='Renamed')), identity=identity)['data']['posts'][0].author
+    assert second is not first
+    assert second.display_name == 'Renamed'
+    assert load(POSTS, posts(author(displayName='Renamed')), identity=identity)['data']['posts'][0].author is second
+
+
+def test_without_map_instances_differ():
+    page = load(POSTS, posts(author(), author()))['data']['posts']
+    assert page[0].author is not page[1].author
+    assert page[0].author == page[1].author
+
+
+def test_lru_eviction():
+    identity = IdentityMap(max_entries=2)
+    for i in range(3):
+        load(POSTS, posts(author(id=str(uuid4()), pin=None)), identity=identity)
+    assert len(identity) == 2
+
+
+def test_client_uses_map(api, token):
+    identity = IdentityMap()
+    api.on('GET', 'posts', json=posts(author(), author()))
+    with Client(token=token, identity_map=identity) as client:
+        first = client.get_posts()[0]
+        second = client.get_posts()[0]
+    assert first[0].author is first[1].author is second[0].author
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+
+def imported(code: str) -> set[str]:
+    """Модули, загруженные в чистом интерпретаторе после `code`"""
+    out = subprocess.run([sys.executable, '-c', code + '\nimport sys\nprint(*sys.modules)'], capture_output=True, text=True, check=True).stdout
+    return set(out.split())
+
+
+def test_import_itd_is_lazy():
+    modules = imported('import itd')
+    assert not modules & {'requests', 'httpx', 'pydantic', 'itd.client', 'itd.request', 'itd.routes.users'}
+
+
+def test_sync_client_does_not_import_asyncio_or_sse():
+    modules = imported('from itd import ITDClient')
+    assert 'itd.client' in modules
+    assert not modules & {'asyncio', 'httpx', 'sseclient', 'itd.async_client'}
+
+
+def test_lazy_names_resolve():
+    import itd
+    import itd.models
+    from itd.async_client import AsyncClient
+    from itd.client import Client
+    from itd.models.event import StreamConnect
+
+    assert itd.ITDClient is Client
+    assert itd.AsyncITDClient is AsyncClient
+    assert itd.models.StreamConnect is StreamConnect
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from conftest import user
+from itd.async_client import AsyncClient
+from itd.client import Client
+from itd.exceptions import NotFound
+from itd.jsonstream import ItemScanner, ItemStream
+from itd.models.user import UserFollower
+
+TRICKY = [
+    {'id': 1, 'bio': 'скобки } ] { [ и запятые, , в строке'},
+    {'id': 2, 'bio': 'кавычка \" и слэш \\', 'tags': [[1, 2], {'a': []}]},
+    {'id': 3, 'nested': {'users': [{'id': 'not the array'}]}, 'empty': {}},
+    {'id': 4, 'emoji': '🐱', 'escaped': '\\"}]'},
+]
+
+
+def body(items: list, **extra) -> bytes:
+    return json.dumps({'meta': {'users': ['decoy']}, 'data': {'before': '[', 'users': items, 'pagination': {'hasMore': True}}, **extra}).encode()
+
+
+def chunks(data: bytes, rng: random.Random) -> list[bytes]:
+    cuts = sorted(rng.sample(range(1, len(data)), rng.randint(1, min(40, len(data) - 1))))
+    return [data[i:j] for i, j in zip([0, *cuts], [*cuts, len(data)])]
+
+
+def scan(parts: list[bytes], path: tuple[str, ...] = ('data', 'users')) -> tuple[list, ItemScanner]:
+    scanner = ItemScanner(path)
+    items = [json.loads(item) for part in parts for item in scanner.feed(part)]
+    scanner.close()
+    return items, scanner
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_scanner_matches_json_loads(seed):
+    rng = random.Random(seed)
+    data = body(TRICKY * rng.randint(0, 3), tail='x' * rng.randint(0, 10))
+    items, scanner = scan(chunks(data, rng))
+    expected = json.loads(data)
+    assert items == expected['data']['users']
+    expected['data']['users'] = []
+    assert scanner.rest == expected
+
+
+def test_byte_by_byte():
+    data = body(TRICKY)
+    items, _ = scan([data[i:i + 1] for i in range(len(data))])
+    assert items == TRICKY
+
+
+@pytest.mark.parametrize('data, error', [
+    (b'{"data": {"other": []}}', 'not found'),
+    (b'{"data": {"users": [{"id": 1}', 'ended inside'),
+])
+def test_scanner_errors(data, error):
+    with pytest.raises(ValueError, match=error):
+        scan([data])
+
+
+def test_stream_closes_response():
+    closed = []
+    stream = ItemStream(iter([body(TRICKY)]), ('data', 'users'), lambda items: [json.loads(item) for item in items], lambda: closed.append(True))
+    assert list(stream) == TRICKY
+    assert closed == [True]
+    assert stream.rest['data']['pagination'] == {'hasMore': True}
+
+
+def followers(count: int) -> list[bytes]:
+    data = json.dumps({'data': {'users': [user(f'u{i}') for i in range(count)], 'pagination': {'page': 1, 'limit': 30, 'total': count, 'hasMore': False}}}).encode()
+    return [data[i:i + 100] for i in range(0, len(data), 100)]
+
+
+@pytest.mark.parametrize('method, path, args, items_path', [
+    ('get_followers_stream', 'users/nowkie/followers', ('nowkie',), ('data', 'users')),
+    ('get_following_stream', 'users/nowkie/following', ('nowkie',), ('data', 'users')),
+])
+def test_client_streams(api, token, method, path, args, items_path):
+    api.on('GET', path, lambda request: (200, followers(50)))
+    with Client(token=token) as client:
+        stream = getattr(client, method)(*args)
+        sync = [follower.username for follower in stream]
+        assert stream.rest['data']['pagination']['total'] == 50
+
+    async def main():
+        async with AsyncClient(token=token) as client:
+            stream = await getattr(client, method)(*args)
+            return [follower.username async for follower in stream]
+
+    assert sync == asyncio.run(main()) == [f'u{i}' for i in range(50)]
+
+
+def test_notifications_stream(api, token):
+    notifications = [{
+        'id': f'00000000-0000-0000-0000-00000000000{i}', 'type': 'follow', 'preview': None, 'readAt': None, 'read': False,
+        'createdAt': '2026-01-30T12:58:14.228Z', 'actor': {'id': f'00000000-0000-0000-0000-00000000001{i}', 'username': 'actor', 'displayName': 'Actor', 'avatar': '🐶'}
+    } for i in range(3)]
+    data = json.dumps({'notifications': notifications, 'hasMore': False}).encode()
+    api.on('GET', 'notifications', lambda request: (200, [data[:50], data[50:]]))
+    with Client(token=token) as client:
+        stream = client.get_notifications_stream()
+        assert [str(item.id) for item in stream] == [item['id'] for item in notifications]
+        assert stream.rest == {'notifications': [], 'hasMore': False}
+
+
+@pytest.mark.parametrize('validation', ['strict', 'fast'])
+def test_stream_validation_modes(api, token, validation):
+    api.on('GET', 'users/nowkie/followers', lambda request: (200, followers(3)))
+    with Client(token=token, validation=validation) as client:
+        items = list(client.get_followers_stream('nowkie'))
+    assert [item.username for item in items] == ['u0', 'u1', 'u2']
+    assert isinstance(items[0], UserFollower) == (validation == 'strict')
+
+
+def test_stream_error_status(api, run):
+    api.on('GET', 'users/ghost/followers', status=404, json={'error': {'code': 'NOT_FOUND', 'message': ''}})
+    with pytest.raises(NotFound):
+        run('get_followers_stream', 'ghost')
@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+
+from itd.multiplex import NotificationMultiplexer
+
+
+class FakeClient:
+    """Клиент с заданным потоком: события отдаются по очереди, потом поток ждёт, пока его не отменят"""
+    def __init__(self, events: list, error: Exception | None = None):
+        self.events = events
+        self.error = error
+        self.options: dict = {}
+
+    async def stream_notifications(self, **options):
+        self.options = options
+        for event in self.events:
+            yield event
+            await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        await asyncio.Event().wait()
+
+
+def event(id: str | None) -> SimpleNamespace:
+    return SimpleNamespace(id=id)  # у события подключения id нет
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+def test_fan_in_from_two_clients():
+    alice = FakeClient([event(None), event('a1'), event('a2')])
+    bob = FakeClient([event(None), event('b1')])
+
+    async def main():
+        received = []
+        mux = NotificationMultiplexer({'alice': alice, 'bob': bob}, backfill=0)
+        async for account, notification in mux:
+            received.append((account, notification.id))
+            if len(received) == 3:
+                mux.stop()
+        return received, mux
+
+    received, mux = run(main())
+    assert sorted(received) == [('alice', 'a1'), ('alice', 'a2'), ('bob', 'b1')]
+    assert [id for account, id in received if account == 'alice'] == ['a1', 'a2']  # порядок внутри аккаунта сохраняется
+    assert alice.options == bob.options == {'backfill': 0}
+    assert mux._tasks == {}
+
+
+def test_failed_account_does_not_stop_others(caplog):
+    broken = FakeClient([], error=ValueError('boom'))
+    alive = FakeClient([event('x1')])
+
+    async def main():
+        mux = NotificationMultiplexer({'broken': broken, 'alive': alive})
+        async for account, notification in mux:
+            mux.stop()
+            return account, notification.id, mux
+
+    with caplog.at_level('ERROR', logger='itd.multiplex'):
+        account, id, mux = run(main())
+    assert (account, id) == ('alive', 'x1')
+    assert isinstance(mux.errors['broken'], ValueError)
+    assert caplog.records[0].getMessage() == "Поток уведомлений 'broken' остановлен"
+    assert caplog.records[0].exc_info[1] is mux.errors['broken']
+
+
+def test_add_while_iterating():
+    late = FakeClient([event('l1')])
+
+    async def main():
+        mux = NotificationMultiplexer({'first': FakeClient([event('f1')])})
+        received = []
+        async for account, notification in mux:
+            received.append(account)
+            if account == 'first':
+                mux.add('late', late)
+            else:
+                mux.stop()
+        return received
+
+    assert run(main()) == ['first', 'late']
+
+
+def test_stop_with_full_queue():
+    client = FakeClient([event(str(i)) for i in range(10)])
+
+    async def main():
+        mux = NotificationMultiplexer({'alice': client}, max_queue=2)
+        received = []
+        async for account, notification in mux:
+            received.append(notification.id)
+            while not mux._queue.full():
+                await asyncio.sleep(0)
+            mux.stop()  # места для _STOP нет, перебор заканчивается по флагу
+        return received, mux
+
+    received, mux = run(main())
+    assert received == ['0']
+    assert mux._tasks == {}
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import user
+from itd.async_paginate import apaginate
+from itd.paginate import paginate
+
+PAGES = {1: ([1, 2, 3], 2), 2: ([4, 5, 6], 3), 3: ([7], None)}
+
+
+def fetch_page(page):
+    return PAGES[page]
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 3])
+def test_all_pages(prefetch):
+    assert list(paginate(fetch_page, 1, prefetch)) == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_max_items_stops_fetching():
+    fetched = []
+
+    def fetch(page):
+        fetched.append(page)
+        return PAGES[page]
+    assert list(paginate(fetch, 1, prefetch=0, max_items=2)) == [1, 2]
+    assert fetched == [1]
+
+
+def test_empty_page_ends_stream():
+    assert list(paginate(lambda page: ([], page + 1), 1, prefetch=0)) == []
+
+
+def test_error_is_raised_in_consumer():
+    def fetch(page):
+        if page == 2:
+            raise RuntimeError('boom')
+        return PAGES[page]
+    items = paginate(fetch, 1, prefetch=1)
+    assert [next(items) for _ in range(3)] == [1, 2, 3]
+    with pytest.raises(RuntimeError):
+        next(items)
+
+
+def test_close_stops_background_fetcher():
+    fetched = []
+
+    def fetch(page):
+        fetched.append(page)
+        return [page], page + 1  # бесконечная лента
+    items = paginate(fetch, 1, prefetch=2)
+    assert next(items) == 1
+    items.close()
+    time.sleep(0.3)
+    count = len(fetched)
+    time.sleep(0.3)
+    assert len(fetched) == count <= 4
+
+
+def test_async_pages():
+    async def fetch(page):
+        return PAGES[page]
+
+    async def main():
+        return [item async for item in apaginate(fetch, 1, prefetch=2, max_items=5)]
+    assert asyncio.run(main()) == [1, 2, 3, 4, 5]
+
+
+def test_iter_followers(api, run):
+    def page(request):
+        number = int(request.query['page'][0])
+        users = [user(f'f{number}_{i}') for i in range(2)]
+        return 200, {'data': {'users': users, 'pagination': {'page': number, 'limit': 2, 'total': 6, 'hasMore': number < 3}}}
+    api.on('GET', 'users/nowkie/followers', page)
+
+    names = [follower.username for follower in run('iter_followers', 'nowkie', limit=2)]
+    assert names == ['f1_0', 'f1_1', 'f2_0', 'f2_1', 'f3_0', 'f3_1']
@@ -0,0 +1,102 @@
+import pytest
+
+from itd import ratelimit
+from itd.ratelimit import RateLimiter, endpoint_key
+
+KEY = 'GET users/:id'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, 'monotonic', clock)
+    return clock
+
+
+def send(limiter: RateLimiter, clock: Clock, seconds: float, interval: float = 0) -> list[float]:
+    """Отправлять запросы так часто, как позволяет лимитер (и не чаще `interval`), вернуть время отправки"""
+    sent = []
+    end = clock.now + seconds
+    while clock.now < end:
+        clock.now += limiter.acquire(KEY)
+        sent.append(clock.now)
+        clock.now += interval
+    return sent
+
+
+def rate(sent: list[float], start: float, end: float) -> int:
+    return sum(1 for at in sent if start <= at < end)
+
+
+def test_endpoint_key():
+    assert endpoint_key('get', 'users/nowkie/followers?page=2') == 'GET users/:id/followers'
+    assert endpoint_key('POST', '/posts/0b7a/like') == 'POST posts/:id/like'
+
+
+def test_unlimited_until_first_429(clock):
+    limiter = RateLimiter()
+    assert all(limiter.acquire(KEY) == 0 for _ in range(1000))
+    assert limiter.budget() == {}
+
+
+def test_429_honors_retry_after(clock):
+    limiter = RateLimiter()
+    send(limiter, clock, 5, interval=0.1)
+    assert limiter.limited(KEY, retry_after=3) == pytest.approx(3)
+    assert limiter.acquire(KEY) == pytest.approx(3)
+    assert limiter.budget()[KEY]['blocked_for'] == pytest.approx(3)
+
+
+def test_429_without_retry_after_uses_min_backoff(clock):
+    limiter = RateLimiter(min_backoff=2)
+    assert limiter.limited(KEY) == pytest.approx(2)
+
+
+def test_429_halves_observed_rate(clock):
+    limiter = RateLimiter()
+    send(limiter, clock, 5, interval=0.1)  # ~10 запросов в секунду
+    limiter.limited(KEY, retry_after=1)
+    assert limiter.budget()[KEY]['rate'] == pytest.approx(5, rel=0.1)
+
+
+def test_throughput_recovers_after_transient_429(clock):
+    limiter = RateLimiter()
+    before = send(limiter, clock, 10, interval=0.1)
+    previous = rate(before, clock.now - 5, clock.now) / 5
+
+    blocked = clock.now
+    limiter.limited(KEY, retry_after=1)
+    after = send(limiter, clock, 20)
+
+    assert min(after) == pytest.approx(blocked + 1)
+    # сразу после блокировки темп ниже прежнего, через ~10 секунд - снова не меньше
+    assert rate(after, blocked + 1, blocked + 2) < previous
+    assert rate(after, blocked + 12, blocked + 13) >= previous
+
+
+def test_repeated_429_keeps_cutting(clock):
+    limiter = RateLimiter()
+    send(limiter, clock, 5, interval=0.1)
+    limiter.limited(KEY, retry_after=1)
+    first = limiter.budget()[KEY]['rate']
+    send(limiter, clock, 1)
+    limiter.limited(KEY, retry_after=1)
+    assert limiter.budget()[KEY]['rate'] < first
+
+
+def test_queue_spreads_burst(clock):
+    limiter = RateLimiter()
+    send(limiter, clock, 5, interval=0.5)  # 2 запроса в секунду
+    limiter.limited(KEY, retry_after=1)
+    waits = [limiter.acquire(KEY) for _ in range(3)]
+    assert waits == sorted(waits)
+    assert waits[0] == pytest.approx(1)
+    assert waits[-1] > waits[0]
@@ -0,0 +1,42 @@
+from conftest import USER_ID, user
+from itd.models.post import PostShort
+from itd.models.user import UserFollower
+from itd.records import FollowerRecord, PostRecord, PostTable, UserRecord
+
+
+def post(**fields) -> PostShort:
+    return PostShort.model_validate({
+        'id': 'a0f4c3e2-1b5d-4e6f-8a9b-0c1d2e3f4a5b', 'content': 'привет', 'createdAt': '2026-01-30T12:58:14.228Z',
+        'author': user(), 'likesCount': 4, 'commentsCount': 3, 'repostsCount': 2, 'viewsCount': 1, **fields
+    })
+
+
+def test_post_record_author_is_slotted():
+    record = PostRecord.from_model(post())
+    assert isinstance(record.author, UserRecord)
+    assert not hasattr(record.author, '__dict__')
+    assert str(record.author.id) == USER_ID
+    assert record.author.username == 'nowkie'
+
+
+def test_post_record_roundtrip():
+    original = post()
+    restored = PostRecord.from_model(original).to_model()
+    assert isinstance(restored, PostShort)
+    assert restored == original
+    assert restored.author == original.author
+    assert PostRecord.from_model(restored) == PostRecord.from_model(original)
+
+
+def test_follower_record_roundtrip():
+    original = UserFollower.model_validate(user(isFollowing=True))
+    record = FollowerRecord.from_model(original)
+    assert record.to_model() == original
+    assert record.is_following
+
+
+def test_post_table_roundtrip():
+    posts = [post(), post(id='b0f4c3e2-1b5d-4e6f-8a9b-0c1d2e3f4a5b', content='пока', likesCount=0)]
+    table = PostTable(posts)
+    assert len(table) == 2
+    assert list(table) == posts
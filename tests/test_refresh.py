@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import itd.async_client
+import itd.client
+from conftest import make_token, user
+from itd.async_client import AsyncClient
+from itd.client import Client
+from itd.token import refresh_delay, token_expired, token_expiry
+
+
+@pytest.fixture
+def soon(monkeypatch):
+    """Фоновое обновление исходного токена - сразу, повтор после ошибки - через 0.05 с; новые токены не обновляются"""
+    old = make_token()
+
+    def delay(token, ahead):
+        return 0.01 if token == old else None
+    for module in (itd.client, itd.async_client):
+        monkeypatch.setattr(module, 'refresh_delay', delay)
+        monkeypatch.setattr(module, 'REFRESH_RETRY', 0.05)
+    return old
+
+
+@pytest.fixture(params=['sync', 'async'])
+def run_with_cookies(request):
+    """Вызвать метод клиента с cookies и заданным токеном"""
+    def call(token, name, *args):
+        if request.param == 'sync':
+            with Client(token=token, cookies='refresh_token=x') as client:
+                return getattr(client, name)(*args)
+
+        async def main():
+            async with AsyncClient(token=token, cookies='refresh_token=x') as client:
+                return await getattr(client, name)(*args)
+        return asyncio.run(main())
+    return call
+
+
+def failing_once(api):
+    def refresh(request):
+        if api.count('POST', 'v1/auth/refresh') == 1:
+            return 503, {'error': {'code': 'UNAVAILABLE', 'message': 'Try later'}}
+        return 200, {'accessToken': 'fresh'}
+    api.on('POST', 'v1/auth/refresh', refresh)
+
+
+def wait(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_token_expiry():
+    token = make_token(100)
+    assert token_expiry(token) == pytest.approx(time.time() + 100, abs=2)
+    assert not token_expired(token)
+    assert token_expired(make_token(-1))
+    assert token_expiry('not a jwt') is None and not token_expired('not a jwt')
+    assert refresh_delay(make_token(1000), 60) == pytest.approx(940, abs=2)
+    assert refresh_delay(token, 60) == pytest.approx(50, abs=2)  # не раньше половины оставшегося срока
+    assert refresh_delay(make_token(-1), 60) is None
+    assert refresh_delay('not a jwt', 60) is None
+
+
+def test_expired_token_is_refreshed_before_request(api, run_with_cookies):
+    fresh = make_token()
+    api.on('POST', 'v1/auth/refresh', json={'accessToken': fresh})
+    api.on('GET', 'users/me', json=user('me'))
+    run_with_cookies(make_token(-1), 'get_me')
+    assert api.count('POST', 'v1/auth/refresh') == 1
+    assert api.requests[-1].headers['Authorization'] == f'Bearer {fresh}'
+
+
+def test_concurrent_unauthorized_refresh_once(api):
+    fresh = make_token()
+    api.on('POST', 'v1/auth/refresh', lambda request: (time.sleep(0.1), (200, {'accessToken': fresh}))[1])
+    api.on('GET', 'users/me', lambda request: (
+        (200, user('me')) if request.headers['Authorization'] == f'Bearer {fresh}' else (401, {'error': {'code': 'UNAUTHORIZED'}})
+    ))
+    with Client(token=make_token(1000), cookies='refresh_token=x', refresh_ahead=None) as client:
+        with ThreadPoolExecutor(8) as pool:
+            names = list(pool.map(lambda _: client.get_me().username, range(8)))
+    assert names == ['me'] * 8
+    assert api.count('POST', 'v1/auth/refresh') == 1
+
+
+def test_async_concurrent_unauthorized_refresh_once(api):
+    fresh = make_token()
+    api.on('POST', 'v1/auth/refresh', lambda request: (time.sleep(0.1), (200, {'accessToken': fresh}))[1])
+    api.on('GET', 'users/me', lambda request: (
+        (200, user('me')) if request.headers['Authorization'] == f'Bearer {fresh}' else (401, {'error': {'code': 'UNAUTHORIZED'}})
+    ))
+
+    async def main():
+        async with AsyncClient(token=make_token(1000), cookies='refresh_token=x', refresh_ahead=None) as client:
+            return await asyncio.gather(*(client.get_me() for _ in range(8)))
+
+    assert [me.username for me in asyncio.run(main())] == ['me'] * 8
+    assert api.count('POST', 'v1/auth/refresh') == 1
+
+
+def test_background_refresh_retries_after_error(api, soon, caplog):
+    failing_once(api)
+    with caplog.at_level(logging.WARNING, 'itd.client'):
+        client = Client(token=soon, cookies='refresh_token=x')
+        wait(lambda: client.token == 'fresh')
+        client.close()
+
+    assert client.token == 'fresh'
+    assert api.count('POST', 'v1/auth/refresh') == 2
+    assert 'Не удалось заранее обновить токен' in caplog.text
+
+
+def test_async_background_refresh_retries_after_error(api, soon, caplog):
+    failing_once(api)
+
+    async def main():
+        client = AsyncClient(token=soon, cookies='refresh_token=x')
+        client._schedule_refresh()
+        for _ in range(500):
+            if client.token == 'fresh':
+                break
+            await asyncio.sleep(0.01)
+        await client.aclose()
+        return client.token
+
+    with caplog.at_level(logging.WARNING, 'itd.async_client'):
+        assert asyncio.run(main()) == 'fresh'
+    assert api.count('POST', 'v1/auth/refresh') == 2
+    assert 'Не удалось заранее обновить токен' in caplog.text
@@ -0,0 +1,59 @@
+import pytest
+
+from conftest import user
+from itd import request
+from itd.client import Client
+from itd.request import Transport
+
+
+def test_clients_do_not_share_credentials(api, token):
+    api.on('GET', 'users/me', json=user('me'))
+    with Client(token='first') as first, Client(token=token, cookies='refresh_token=abc') as second:
+        first.get_me()
+        second.get_me()
+    assert first._transport is not second._transport
+    assert [r.headers['Authorization'] for r in api.requests] == ['Bearer first', f'Bearer {token}']
+    assert first._transport.cookies is None
+
+
+def test_keep_alive_can_be_disabled(api, token):
+    api.on('GET', 'users/me', json=user('me'))
+    with Client(token=token, transport=Transport(keep_alive=False)) as client:
+        client.get_me()
+    assert api.requests[0].headers['Connection'] == 'close'
+
+
+def test_pool_settings():
+    transport = Transport(pool_size=2, max_connections_per_host=4, pool_block=True)
+    adapter = transport.session.get_adapter(request.BASE_URL)
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 4
+    assert adapter._pool_block
+    transport.close()
+
+
+def test_set_cookies_is_deprecated():
+    with pytest.warns(DeprecationWarning):
+        request.set_cookies('refresh_token=abc')
+    assert not request._default_transport().session.cookies
+
+
+def test_module_session_is_deprecated():
+    with pytest.warns(DeprecationWarning):
+        session = request.s
+    assert session is request._default_transport().session
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        request.missing
+
+
+def test_default_transport_is_lazy(monkeypatch):
+    monkeypatch.setattr(request, '_default', None)
+    created = []
+    monkeypatch.setattr(request, 'Transport', lambda **kwargs: created.append(kwargs) or object())
+    first = request._default_transport()
+    assert request._default_transport() is first
+    assert len(created) == 1
+    assert created[0]['rate_limit'] is False
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from itd.exceptions import AlreadyFollowing, NotFound, RateLimitExceeded, Unauthorized, UserBanned, ValidationError
+from itd.response import Response
+
+
+class Raw:
+    """Ответ requests/httpx: считает обращения к телу"""
+    def __init__(self, status_code: int, body: object):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = body if isinstance(body, str) else json.dumps(body)
+        self.reads = 0
+
+    @property
+    def content(self) -> bytes:
+        self.reads += 1
+        return self.text.encode()
+
+
+def error(code: str, message: str = '') -> dict:
+    return {'error': {'code': code, 'message': message}}
+
+
+def test_json_is_decoded_once():
+    raw = Raw(200, {'data': {'users': []}})
+    res = Response(raw)
+    assert res.json() is res.json()
+    assert res.data == {'data': {'users': []}}
+    assert raw.reads == 1
+
+
+def test_invalid_json_is_remembered():
+    raw = Raw(502, 'Bad Gateway')
+    res = Response(raw)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            res.json()
+    assert res.data == {}
+    assert raw.reads == 1
+
+
+def test_common_errors_come_first():
+    with pytest.raises(RateLimitExceeded):
+        Response(Raw(429, {'error': {'code': 'RATE_LIMIT_EXCEEDED', 'retryAfter': 3}})).raise_for_error({429: NotFound})
+    with pytest.raises(Unauthorized):
+        Response(Raw(401, error('UNAUTHORIZED'))).raise_for_error()
+
+
+@pytest.mark.parametrize('errors, res, expected', [
+    ({'NOT_FOUND': NotFound('User')}, Response(Raw(404, error('NOT_FOUND'))), NotFound),
+    ({404: NotFound('Post')}, Response(Raw(404, {'message': 'gone'})), NotFound),
+    ({(400, 'уже подписаны'): AlreadyFollowing}, Response(Raw(400, error('BAD_REQUEST', 'Вы уже подписаны'))), AlreadyFollowing),
+])
+def test_route_table(errors, res, expected):
+    with pytest.raises(expected):
+        res.raise_for_error(errors)
+
+
+def test_no_match_does_not_raise():
+    Response(Raw(400, error('SOMETHING_ELSE'))).raise_for_error({'NOT_FOUND': NotFound('User'), 404: NotFound('User')})
+
+
+def test_validation_error_uses_property():
+    res = Response(Raw(422, {'property': '/content', 'found': {'postId': '1', 'content': ''}}))
+    with pytest.raises(ValidationError) as e:
+        res.raise_for_error()
+    assert e.value.name == 'content'
+
+
+def test_client_maps_route_errors(api, run):
+    api.on('GET', 'users/banned', status=403, json=error('USER_BLOCKED'))
+    with pytest.raises(UserBanned):
+        run('get_user', 'banned')
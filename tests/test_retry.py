@@ -0,0 +1,86 @@
+import httpx
+import pytest
+import requests
+
+from conftest import user
+from itd.retry import RetryPolicy
+from itd.response import Response
+
+
+@pytest.fixture
+def transport_options():
+    return {'retry': RetryPolicy(backoff=0.01, max_backoff=0.01)}
+
+
+def unavailable_once(api, method, path, json):
+    def handler(request):
+        if api.count(method, path) == 1:
+            return 503, {'error': {'code': 'SERVICE_UNAVAILABLE', 'message': 'Try later'}}
+        return 200, json
+    api.on(method, path, handler)
+
+
+def test_allows():
+    policy = RetryPolicy()
+    assert policy.allows('get') and policy.allows('PUT') and policy.allows('delete')
+    assert not policy.allows('post')
+    assert policy.allows('post', idempotent=True)
+    assert not policy.allows('get', idempotent=False)
+    assert RetryPolicy(retry_all_methods=True).allows('post')
+
+
+def test_delay_bounds():
+    policy = RetryPolicy(backoff=1, max_backoff=4)
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= 4
+    assert policy.delay(0, retry_after=10) == 10
+
+
+def test_retries_limit():
+    policy = RetryPolicy(retries=2)
+    raw = requests.Response()
+    raw.status_code = 503
+    response = Response(raw)
+    assert policy.next_delay(0, 'get', response=response) is not None
+    assert policy.next_delay(1, 'get', response=response) is not None
+    assert policy.next_delay(2, 'get', response=response) is None
+
+
+def test_get_503_is_retried(api, run):
+    unavailable_once(api, 'GET', 'users/nowkie', user())
+    assert run('get_user', 'nowkie').username == 'nowkie'
+    assert api.count('GET', 'users/nowkie') == 2
+
+
+def test_post_503_is_not_retried(api, run):
+    unavailable_once(api, 'POST', 'users/nowkie/follow', {'following': True, 'followersCount': 2})
+    with pytest.raises((requests.HTTPError, httpx.HTTPStatusError)):
+        run('follow', 'nowkie')
+    assert api.count('POST', 'users/nowkie/follow') == 1
+
+
+def test_rate_limit_is_retried(api, run):
+    def handler(request):
+        if api.count('POST', 'users/nowkie/follow') == 1:
+            return 429, {'error': {'code': 'RATE_LIMIT_EXCEEDED', 'message': 'Too many requests', 'retryAfter': 0}}
+        return 200, {'following': True, 'followersCount': 2}
+    api.on('POST', 'users/nowkie/follow', handler)
+    assert run('follow', 'nowkie') == 2
+    assert api.count('POST', 'users/nowkie/follow') == 2
+
+
+def test_retried_stream_is_closed(api, run, monkeypatch):
+    closed = []
+
+    def close(self):
+        closed.append(self.status_code)
+
+    async def aclose(self):
+        closed.append(self.status_code)
+    monkeypatch.setattr(Response, 'close', close)
+    monkeypatch.setattr(Response, 'aclose', aclose)
+
+    unavailable_once(api, 'GET', 'users/nowkie/followers', {'data': {'users': [], 'pagination': {'page': 1, 'limit': 30, 'total': 0, 'hasMore': False}}})
+    run('get_followers_stream', 'nowkie')
+    assert closed == [503]  # ответ успешного повтора остаётся открытым для чтения
+    assert api.count('GET', 'users/nowkie/followers') == 2
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import user
+from itd.async_client import AsyncClient
+from itd.async_request import AsyncSingleFlight
+from itd.client import Client
+from itd.singleflight import SingleFlight, request_key
+
+
+def slow_user(request):
+    time.sleep(0.3)  # все запросы клиента успевают начаться, пока идёт первый
+    return 200, user()
+
+
+def test_request_key():
+    assert request_key('get', 't', 'users', {'a': 1, 'b': None}) == request_key('GET', 't', 'users', {'a': '1'})
+    assert request_key('get', 't', 'users', {}) != request_key('get', 'other', 'users', {})
+
+
+def test_concurrent_calls_share_result():
+    flight = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(10)
+
+    def call():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    def do(_):
+        barrier.wait()
+        return flight.do('key', call)
+
+    with ThreadPoolExecutor(10) as pool:
+        results = list(pool.map(do, range(10)))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert len(flight) == 0
+
+
+def test_error_is_shared():
+    flight = SingleFlight()
+    barrier = threading.Barrier(3)
+
+    def call():
+        time.sleep(0.2)
+        raise ValueError('boom')
+
+    def do(_):
+        barrier.wait()
+        with pytest.raises(ValueError):
+            flight.do('key', call)
+
+    with ThreadPoolExecutor(3) as pool:
+        list(pool.map(do, range(3)))
+    assert len(flight) == 0
+
+
+def test_async_cancelled_waiter_does_not_cancel_leader():
+    async def main():
+        flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.1)
+            return 'user'
+        leader = asyncio.create_task(flight.do('key', call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do('key', call))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        return await leader
+    assert asyncio.run(main()) == 'user'
+
+
+def test_concurrent_get_user_coalesced(api, token):
+    api.on('GET', 'users/nowkie', slow_user)
+    client = Client(token=token)
+    barrier = threading.Barrier(10)
+
+    def get(_):
+        barrier.wait()
+        return client.get_user('nowkie')
+
+    with ThreadPoolExecutor(10) as pool:
+        users = list(pool.map(get, range(10)))
+    client.close()
+    assert {user.username for user in users} == {'nowkie'}
+    assert api.count('GET', 'users/nowkie') == 1
+
+
+def test_async_concurrent_get_user_coalesced(api, token):
+    api.on('GET', 'users/nowkie', slow_user)
+
+    async def main():
+        async with AsyncClient(token=token) as client:
+            return await asyncio.gather(*(client.get_user('nowkie') for _ in range(10)))
+    users = asyncio.run(main())
+    assert {user.username for user in users} == {'nowkie'}
+    assert api.count('GET', 'users/nowkie') == 1
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from conftest import USER_ID, notification, sse
+from itd.async_client import AsyncClient
+from itd.client import Client
+from itd.models.event import StreamConnect, StreamNotification
+from itd.sse import RecentIds, SSEParser
+
+STREAM = (
+    b': heartbeat\n\n'
+    b'data: {"userId": "u", "timestamp": 1}\n\n'
+    b'id: 1\nevent: notification\ndata: {"a": 1}\n\n'
+    b'retry: 5000\n\n'
+    b'data:first\ndata: second\n\n'
+    b'id: 2\ndata: {"b": 2}\n\n'
+)
+
+
+def parse(chunks) -> list[tuple[bytes, str, str | None]]:
+    parser = SSEParser()
+    return [(event.data, event.event, event.id) for chunk in chunks for event in parser.feed(chunk)]
+
+
+EXPECTED = [
+    (b'{"userId": "u", "timestamp": 1}', 'message', None),
+    (b'{"a": 1}', 'notification', '1'),
+    (b'first\nsecond', 'message', '1'),
+    (b'{"b": 2}', 'message', '2'),
+]
+
+
+def test_whole_stream():
+    assert parse([STREAM]) == EXPECTED
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64])
+def test_any_chunking(size):
+    assert parse([STREAM[i:i + size] for i in range(0, len(STREAM), size)]) == EXPECTED
+
+
+@pytest.mark.parametrize('newline', [b'\r\n', b'\r'])
+def test_other_line_endings(newline):
+    stream = STREAM.replace(b'\n', newline)
+    assert parse([stream]) == EXPECTED
+    assert parse([stream[i:i + 1] for i in range(len(stream))]) == EXPECTED
+
+
+def test_last_event_id_and_retry():
+    parser = SSEParser()
+    parser.feed(STREAM)
+    assert parser.last_event_id == '2'
+    assert parser.retry == 5000
+
+
+def test_incomplete_event_waits_for_terminator():
+    parser = SSEParser()
+    assert parser.feed(b'data: {"a"') == []
+    assert parser.feed(b': 1}\n') == []
+    assert [event.data for event in parser.feed(b'\n')] == [b'{"a": 1}']
+
+
+def test_buffer_is_trimmed():
+    parser = SSEParser()
+    for _ in range(1000):
+        parser.feed(b'data: x\n\ndata: y')
+        parser.feed(b'\n\n')
+    assert len(parser._buffer) == 0
+
+
+
+def test_reset_drops_partial_event():
+    parser = SSEParser()
+    parser.feed(b'id: 7\n\ndata: partial')
+    parser.reset()
+    assert [event.data for event in parser.feed(b'data: new\n\n')] == [b'new']
+    assert parser.last_event_id == '7'
+
+
+def test_recent_ids():
+    ids = RecentIds(max_size=2)
+    assert ids.add('a') and ids.add('b')
+    assert not ids.add('a')
+    assert ids.add('c')  # 'a' вытеснен
+    assert ids.add('a')
+    assert len(ids) == 2
+
+
+def test_large_event_in_small_chunks():
+    data = b'x' * (1 << 20)
+    stream = b'data: ' + data + b'\n\n'
+    parser = SSEParser()
+    events = [event for i in range(0, len(stream), 1024) for event in parser.feed(stream[i:i + 1024])]
+    assert [event.data for event in events] == [data]
+
+
+def test_clients_read_notifications(api, token):
+    fresh = notification()
+    body = [sse({'userId': USER_ID, 'timestamp': 1})[:10], sse({'userId': USER_ID, 'timestamp': 1})[10:], b': heartbeat\n\n', sse(fresh | {'userId': USER_ID}, '1')]
+    api.on('GET', 'notifications/stream', lambda request: (200, list(body)))
+
+    def check(events):
+        assert isinstance(events[0], StreamConnect) and str(events[0].user_id) == USER_ID
+        assert isinstance(events[1], StreamNotification) and str(events[1].id) == fresh['id']
+
+    client = Client(token=token)
+    events = []
+    for event in client.stream_notifications():
+        events.append(event)
+        if len(events) == 2:
+            client.stop_stream()
+    client.close()
+    check(events)
+
+    async def main():
+        async with AsyncClient(token=token) as client:
+            events = []
+            async for event in client.stream_notifications():
+                events.append(event)
+                if len(events) == 2:
+                    client.stop_stream()
+            return events
+    check(asyncio.run(main()))
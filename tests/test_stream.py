@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from conftest import USER_ID, notification, sse
+from itd.async_client import AsyncClient
+from itd.client import Client
+from itd.models.event import StreamConnect, StreamNotification
+from itd.retry import RetryPolicy
+
+FAST = RetryPolicy(backoff=0.01, max_backoff=0.01)
+
+
+@pytest.fixture
+def silent(api):
+    """Поток, который после события подключения молчит (без heartbeat), пока тест не закончится"""
+    done = threading.Event()
+    fresh = notification()
+    connections = []
+
+    def stream(request):
+        connections.append(time.monotonic())
+
+        def body():
+            yield sse({'userId': USER_ID, 'timestamp': 1})
+            if len(connections) > 1:
+                yield sse(fresh | {'userId': USER_ID}, '1')
+            done.wait(10)
+        return 200, body()
+    api.on('GET', 'notifications/stream', stream)
+    yield fresh, connections
+    done.set()
+
+
+def listen(mode, token, on_event, **options):
+    """Читать поток `Client` или `AsyncClient`; `on_event(client, event)` вызывается для каждого события"""
+    if mode == 'sync':
+        client = Client(token=token)
+        for event in client.stream_notifications(reconnect=FAST, **options):
+            on_event(client, event)
+        client.close()
+        return
+
+    async def main():
+        async with AsyncClient(token=token) as client:
+            async for event in client.stream_notifications(reconnect=FAST, **options):
+                on_event(client, event)
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('mode', ['sync', 'async'])
+def test_stalled_stream_reconnects(silent, token, mode):
+    fresh, connections = silent
+    events = []
+
+    def on_event(client, event):
+        events.append(event)
+        if isinstance(event, StreamNotification):
+            client.stop_stream()
+
+    listen(mode, token, on_event, stall_timeout=0.3)
+    assert [type(event) for event in events] == [StreamConnect, StreamConnect, StreamNotification]
+    assert str(events[-1].id) == fresh['id']
+    assert len(connections) == 2
+    assert connections[1] - connections[0] >= 0.3
+
+
+@pytest.mark.parametrize('mode', ['sync', 'async'])
+def test_stop_stream_returns_promptly(silent, token, mode):
+    stopped = []
+
+    def stop(client):
+        stopped.append(time.monotonic())
+        client.stop_stream()
+
+    def on_event(client, event):
+        # остановка приходит извне, пока чтение ждёт данных в сокете
+        if mode == 'sync':
+            threading.Timer(0.2, stop, (client,)).start()
+        else:
+            asyncio.get_running_loop().call_later(0.2, stop, client)
+
+    listen(mode, token, on_event, stall_timeout=None)
+    assert len(stopped) == 1
+    assert time.monotonic() - stopped[0] < 1
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+
+from conftest import USER_ID, user
+from itd.async_client import AsyncClient
+from itd.client import Client
+from itd.models.envelope import FOLLOWERS, USER
+from itd.models.user import User
+from itd.views import View, load, raw
+
+
+def followers() -> dict:
+    return {'data': {'users': [user('a'), user('b')], 'pagination': {'page': 1, 'limit': 30, 'total': 2, 'hasMore': False}}}
+
+
+def test_fast_view_matches_strict_model():
+    data = user(bio='hi')
+    model = load(USER, data)
+    view = load(USER, data, 'fast')
+    assert isinstance(view, View)
+    for name in User.model_fields:
+        assert getattr(view, name) == getattr(model, name), name
+    assert view.id == UUID(USER_ID)
+    assert view.created_at == datetime(2026, 1, 30, 12, 58, 14, 228000, timezone.utc)
+
+
+def test_raw_view_keeps_json_values():
+    data = user()
+    view = load(USER, data, 'raw')
+    assert view.id == USER_ID
+    assert view.created_at == '2026-01-30T12:58:14.228Z'
+    assert view['username'] == 'nowkie'
+    assert raw(view) is data
+
+
+def test_nested_views_and_defaults():
+    page = load(FOLLOWERS, followers(), 'fast')
+    assert [follower.username for follower in page['data'].users] == ['a', 'b']
+    assert page['data'].pagination.has_more is False
+    assert load(USER, user(), 'fast').bio is None  # поля нет в JSON - значение по умолчанию
+
+
+def test_view_is_read_only():
+    view = load(USER, user(), 'fast')
+    with pytest.raises(AttributeError):
+        view.username = 'other'
+    with pytest.raises(AttributeError):
+        view.missing
+    with pytest.raises(KeyError):
+        view['missing']
+
+
+@pytest.mark.parametrize('validation', ['fast', 'raw'])
+def test_clients_return_views(api, token, validation):
+    api.on('GET', 'users/nowkie', json=user())
+    with Client(token=token, validation=validation) as client:
+        sync = client.get_user('nowkie')
+
+    async def main():
+        async with AsyncClient(token=token, validation=validation) as client:
+            return await client.get_user('nowkie')
+
+    for view in sync, asyncio.run(main()):
+        assert isinstance(view, View)
+        assert view.username == 'nowkie'
+        assert view.id == (UUID(USER_ID) if validation == 'fast' else USER_ID)
+
+
+def test_unknown_validation_mode(token):
+    with pytest.raises(ValueError):
+        Client(token=token, validation='lazy')